@@ -0,0 +1,607 @@
+"""Medições de desempenho da Calculadora de Redes
+
+Uso:
+    python bench.py batch --rows 200000 --workers 1 2 4 8
+    python bench.py suite --sizes 1000 100000 --routers 4 32 -o resultados.json
+    python bench.py suite -o novo.json --baseline resultados.json
+    python bench.py imports --budget-scale 3
+    python bench.py service --requests 5000 --batch-size 1000
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from exe import NetworkCalculator, int_to_ipv4, load_numpy, normalize_mask, prefix_to_mask, run_batch
+from masks import PREFIX_TABLE
+from network_table import TABLE_FIELDS, NetworkTable, parse_record
+from project_io import iter_project_lines, parse_project_line, read_project_header, write_project
+from routing import RoutingTables
+from table_writer import open_output, write_csv, write_fixed_width
+
+def generate_inventory_csv(path, rows, routers=10, seed=0):
+    """Gera um inventário CSV sintético com o número de linhas pedido"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write("Roteador,Nome Host,IP,Máscara,IP Rede\n")
+        for i in range(rows):
+            prefix = rng.randint(16, 30)
+            ip = int_to_ipv4(rng.getrandbits(32) & 0xDFFFFFFF)
+            mask = int_to_ipv4(prefix_to_mask(prefix)) if i % 2 else f"/{prefix}"
+            f.write(f"Roteador-{i % routers},Host-{i},{ip},{mask},\n")
+
+def bench_batch(rows, workers_list, chunk_size):
+    """Compara o modo em lote serial com o modo paralelo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "inventario.csv")
+        generate_inventory_csv(path, rows)
+        
+        print(f"Modo em lote: {rows} linhas, blocos de {chunk_size}")
+        baseline = None
+        for workers in workers_list:
+            with open(path, 'r', newline='', encoding='utf-8') as input_stream, \
+                 open(os.devnull, 'w', newline='', encoding='utf-8') as output_stream:
+                start = time.perf_counter()
+                run_batch(input_stream, output_stream, output_stream,
+                          workers=workers, chunk_size=chunk_size)
+                elapsed = time.perf_counter() - start
+            
+            if baseline is None:
+                baseline = elapsed
+            print(f"  {workers:>3} processo(s): {elapsed:8.3f} s  "
+                  f"{rows / elapsed:12,.0f} linhas/s  speedup {baseline / elapsed:5.2f}x")
+
+def format_latencies(label, latencies, items=1):
+    """Linha com a média e os percentis de uma lista de latências (s),
+    divididas por items quando cada chamada processa vários itens"""
+    from profiling import percentile
+    
+    ordered = sorted(latency / items for latency in latencies)
+    mean = sum(ordered) / len(ordered)
+    return (f"  {label:<34} média {mean * 1e3:8.3f} ms  p50 {percentile(ordered, 50) * 1e3:8.3f} ms  "
+            f"p99 {percentile(ordered, 99) * 1e3:8.3f} ms")
+
+def bench_service(requests, batch_size):
+    """Latência do serviço HTTP (exe.py serve) com a conexão mantida aberta,
+    comparada com um processo novo por cálculo
+    
+    O serviço roda em outro processo, como no uso real, para que o cliente
+    não divida o interpretador com ele.
+    """
+    import http.client
+    
+    root = os.path.dirname(os.path.abspath(__file__))
+    exe = os.path.join(root, "exe.py")
+    record = {"host": "Vendas", "ip": "192.168.10.10", "mask": "/24", "router": "R1"}
+    
+    # Referência: um processo do modo em lote por cálculo
+    cold = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, exe, "batch", "--input-format", "jsonl"], input=json.dumps(record),
+                       capture_output=True, text=True, check=True)
+        cold.append(time.perf_counter() - start)
+    
+    rng = random.Random(0)
+    networks = [{"host": f"Host-{i}", "ip": int_to_ipv4(rng.getrandbits(32) & 0xDFFFFFFF),
+                 "mask": f"/{rng.randint(16, 30)}", "router": f"Roteador-{i % 10}"} for i in range(batch_size)]
+    addresses = [int_to_ipv4(rng.getrandbits(32) & 0xDFFFFFFF) for _ in range(batch_size)]
+    
+    server = subprocess.Popen([sys.executable, exe, "serve", "--port", "0"], stderr=subprocess.PIPE, text=True)
+    try:
+        # A primeira linha informa o endereço de escuta
+        port = int(server.stderr.readline().split("http://", 1)[1].split()[0].rsplit(":", 1)[1])
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        
+        def call(method, path, payload):
+            body = json.dumps(payload).encode("utf-8")
+            start = time.perf_counter()
+            connection.request(method, path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            data = response.read()
+            elapsed = time.perf_counter() - start
+            if response.status != 200:
+                raise RuntimeError(f"{path}: {response.status} {data[:200]!r}")
+            return elapsed
+        
+        call("PUT", "/inventory", {"networks": networks})
+        single = [call("POST", "/network", record) for _ in range(requests)]
+        few_fields = [call("POST", "/network", dict(record, fields=["IP Rede", "Broadcast"])) for _ in range(requests)]
+        rounds = max(3, requests // batch_size)
+        batch = [call("POST", "/batch", {"networks": networks}) for _ in range(rounds)]
+        lookup = [call("POST", "/lookup", {"addresses": addresses}) for _ in range(rounds)]
+        connection.close()
+    finally:
+        server.terminate()
+        server.wait()
+    
+    print(f"Serviço HTTP: {requests} requisições isoladas, lotes de {batch_size} (por item)")
+    print(format_latencies("processo novo por cálculo", cold))
+    print(format_latencies("/network (conexão aberta)", single))
+    print(format_latencies("/network, 2 campos", few_fields))
+    print(format_latencies(f"/batch ({batch_size} redes)", batch, batch_size))
+    print(format_latencies(f"/lookup ({batch_size} endereços)", lookup, batch_size))
+
+# --- Suíte de medições ---
+
+# Tabelas de roteamento maiores que isto não são geradas: a tabela completa
+# cresce com N² e a sumarizada com N vezes o número de super-redes externas
+ROUTE_LIMIT = 2000000
+
+def generate_inventory(size, routers, seed=0):
+    """Gera redes sintéticas (roteador, host, IP, máscara em texto)
+
+    Cada roteador recebe uma região própria do espaço de endereços e suas
+    redes (/24 a /30) são alocadas em sequência nela, como num plano de
+    endereçamento real, o que permite sumarizar as rotas. As máscaras vêm
+    nos três formatos aceitos ("255.255.255.0", "/24" e "24").
+    """
+    rng = random.Random(seed)
+    region = (1 << 31) >> (routers - 1).bit_length()
+    prefixes = [rng.randint(24, 30) for _ in range(size)]
+    
+    # Alocando das maiores para as menores redes, cada bloco já começa
+    # alinhado logo após o anterior, sem buracos entre as redes
+    starts = [0] * size
+    for router in range(routers):
+        cursor = (1 << 29) + router * region
+        for i in sorted(range(router, size, routers), key=prefixes.__getitem__):
+            starts[i] = cursor
+            cursor += PREFIX_TABLE[prefixes[i]].total_ips
+    
+    records = []
+    for i, (start, prefix) in enumerate(zip(starts, prefixes)):
+        ip = int_to_ipv4(start + rng.randrange(1, PREFIX_TABLE[prefix].total_ips - 1))
+        mask = (PREFIX_TABLE[prefix].mask, f"/{prefix}", str(prefix))[i % 3]
+        records.append((f"Roteador-{i % routers}", f"Host-{i}", ip, mask))
+    return records
+
+class Inventory:
+    """Inventário de uma medição, com os arquivos e a tabela montados sob
+    demanda (fora do tempo medido)"""
+    
+    def __init__(self, size, routers, directory, route_limit=ROUTE_LIMIT):
+        self.size = size
+        self.routers = routers
+        self.directory = directory
+        self.route_limit = route_limit
+        self.records = generate_inventory(size, routers)
+        self._table = None
+        self._files = {}
+    
+    def table(self):
+        """NetworkTable com todas as redes do inventário"""
+        if self._table is None:
+            self._table = NetworkTable()
+            for router, host, ip, mask in self.records:
+                self._table.append({'Roteador': router, 'Nome Host': host, 'IP': ip, 'Máscara': mask})
+        return self._table
+    
+    def path(self, name):
+        return os.path.join(self.directory, f"{self.size}-{self.routers}-{name}")
+    
+    def csv_path(self):
+        """Inventário gravado em CSV, no formato de importação da interface"""
+        if 'csv' not in self._files:
+            path = self._files['csv'] = self.path("inventario.csv")
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                write_csv(f, ('Roteador', 'Nome Host', 'IP', 'Máscara'), self.records)
+        return self._files['csv']
+    
+    def project_path(self):
+        """Inventário gravado como projeto"""
+        if 'project' not in self._files:
+            path = self._files['project'] = self.path("projeto.jsonl")
+            with open(path, 'w', encoding='utf-8') as f:
+                write_project(f, self.table().records())
+        return self._files['project']
+
+# Cada medição recebe o inventário, prepara o que precisar e devolve uma
+# função sem argumentos que faz o trabalho medido e retorna quantos itens
+# processou (ou None quando o caso não se aplica ao inventário)
+
+def bench_calculator(inventory):
+    # Linha completa, como na exportação e no modo em lote: todos os campos
+    # são montados, então o resultado é comparável com o cálculo antigo
+    calculator = NetworkCalculator()
+    entries = [(host, ip, normalize_mask(mask)) for _, host, ip, mask in inventory.records]
+    
+    def run():
+        for host, ip, mask in entries:
+            dict(calculator.process_network_entry(host, ip, mask))
+        return len(entries)
+    return run
+
+def bench_calculator_lazy(inventory):
+    # Só os campos lidos pela tabela de roteamento; os binários e o
+    # intervalo nunca são montados
+    calculator = NetworkCalculator()
+    entries = [(host, ip, normalize_mask(mask)) for _, host, ip, mask in inventory.records]
+    
+    def run():
+        for host, ip, mask in entries:
+            result = calculator.process_network_entry(host, ip, mask)
+            result['IP Rede'], result['Gateway'], result['Broadcast']
+        return len(entries)
+    return run
+
+def bench_masks(inventory):
+    masks = [mask for _, _, _, mask in inventory.records]
+    
+    def run():
+        for mask in masks:
+            normalize_mask(mask)
+        return len(masks)
+    return run
+
+def bench_csv_import(inventory):
+    path = inventory.csv_path()
+    
+    def run():
+        table = NetworkTable()
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                table.add(*parse_record(record))
+        return len(table)
+    return run
+
+def bench_csv_export(inventory):
+    table, path = inventory.table(), inventory.path("exportacao.csv")
+    
+    def run():
+        with open_output(path, newline='') as f:
+            write_csv(f, TABLE_FIELDS, table.values())
+        return len(table)
+    return run
+
+def bench_txt_export(inventory):
+    table, path = inventory.table(), inventory.path("exportacao.txt")
+    
+    def run():
+        with open_output(path) as f:
+            write_fixed_width(f, TABLE_FIELDS, table.values(), prefixes=set(table.prefixes),
+                              text_widths=table.text_widths())
+        return len(table)
+    return run
+
+def bench_project_save(inventory):
+    table, path = inventory.table(), inventory.path("salvo.jsonl")
+    
+    def run():
+        with open(path, 'w', encoding='utf-8') as f:
+            return write_project(f, table.records())
+    return run
+
+def bench_project_load(inventory):
+    path = inventory.project_path()
+    
+    def run():
+        table = NetworkTable()
+        with open(path, 'r', encoding='utf-8') as f:
+            read_project_header(f.readline())
+            for line in iter_project_lines(f):
+                table.add(*parse_project_line(line))
+        return len(table)
+    return run
+
+def bench_sort(inventory):
+    table = inventory.table()
+    
+    def run():
+        # Chaves montadas do zero, como na primeira ordenação após uma carga
+        table._sort_keys.clear()
+        table.sorted_ids([('Roteador', False), ('Hosts Utilizaveis', True), ('IP Rede', False)])
+        return len(table)
+    return run
+
+def _routing_bench(summarize):
+    def bench(inventory):
+        table = inventory.table()
+        networks = [(row_id, table.router_names[table.routers[row_id]], table.host_names[row_id], start, prefix)
+                    for row_id, start, prefix in table.network_keys()]
+        if RoutingTables(networks, True, True, summarize).count_routes() > inventory.route_limit:
+            return None
+        
+        def run():
+            # Carga das redes e geração de todas as rotas, sem guardá-las
+            tables = RoutingTables(networks, True, True, summarize)
+            return sum(1 for _ in tables.routes())
+        return run
+    return bench
+
+BENCHMARKS = {
+    'calculator': bench_calculator,
+    'calculator_lazy': bench_calculator_lazy,
+    'masks': bench_masks,
+    'csv_import': bench_csv_import,
+    'csv_export': bench_csv_export,
+    'txt_export': bench_txt_export,
+    'project_save': bench_project_save,
+    'project_load': bench_project_load,
+    'sort': bench_sort,
+    'routing_summarized': _routing_bench(True),
+    'routing_full': _routing_bench(False),
+}
+
+def measure(run, repeat, memory):
+    """Executa run repeat vezes; retorna (itens, melhor tempo, pico de memória)
+    
+    O pico de memória é medido numa execução extra com tracemalloc, que
+    deixa o código bem mais lento e por isso fica fora da medição de tempo.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return items, best, peak
+
+# --- Tempo de importação ---
+
+# Pontos de entrada cuja importação é medida e o tempo máximo aceito para
+# cada um, em segundos. A interface gráfica inclui o próprio tkinter.
+IMPORT_BUDGETS = {
+    'exe': 0.03,
+    'exe_gui': 0.08,
+}
+# Diferenças menores que isto (s) são ruído, mesmo acima da tolerância
+IMPORT_NOISE = 0.005
+
+def parse_importtime(output, module):
+    """Extrai de uma saída de -X importtime o tempo acumulado do módulo
+    (segundos) e os módulos importados diretamente por ele, do mais lento
+    para o mais rápido"""
+    children = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 1:
+            children.append((name, int(cumulative) / 1e6))
+        elif depth == 0:
+            if name == module:
+                children.sort(key=lambda child: child[1], reverse=True)
+                return int(cumulative) / 1e6, children
+            children = []
+    raise ValueError(f"{module} não aparece na saída de -X importtime")
+
+def measure_import(module, repeat=5):
+    """Importa o módulo em interpretadores novos com -X importtime;
+    retorna o melhor (tempo, módulos importados diretamente)"""
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+    directory = os.path.dirname(os.path.abspath(__file__))
+    # Com o bytecode em cache, como numa instalação normal: a primeira
+    # importação grava os .pyc e fica fora da medição
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    subprocess.run(command, cwd=directory, env=env, capture_output=True, check=True)
+    
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run(command, cwd=directory, env=env, capture_output=True, text=True, check=True)
+        measured = parse_importtime(completed.stderr, module)
+        if best is None or measured[0] < best[0]:
+            best = measured
+    return best
+
+def format_import(result):
+    line = f"  {result['module']:<20} {result['seconds'] * 1000:8.1f} ms"
+    if result.get('budget') is not None:
+        line += f" (limite {result['budget'] * 1000:.0f} ms)"
+    if 'change' in result:
+        line += f" {result['change']:+7.1%}"
+    heaviest = ', '.join(f"{name} {seconds * 1000:.1f}" for name, seconds in result['children'][:4])
+    return line + f"  [{heaviest}]"
+
+def run_imports(repeat=5, budget_scale=1.0, modules=IMPORT_BUDGETS):
+    """Mede a importação dos pontos de entrada; retorna (resultados,
+    resultados acima do limite)"""
+    results, over_budget = [], []
+    print(f"Importação (melhor de {repeat}, -X importtime):")
+    for module, budget in modules.items():
+        try:
+            seconds, children = measure_import(module, repeat)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            print(f"  {module:<20} ignorado (falha ao importar: {e})")
+            continue
+        result = {
+            'module': module,
+            'seconds': seconds,
+            'budget': budget * budget_scale,
+            'children': children[:10],
+        }
+        results.append(result)
+        print(format_import(result))
+        if seconds > result['budget']:
+            over_budget.append(result)
+    if over_budget:
+        print(f"{len(over_budget)} importações acima do limite:")
+        for result in over_budget:
+            print(format_import(result))
+    return results, over_budget
+
+def compare_imports_with_baseline(results, baseline, tolerance):
+    """Marca a variação do tempo de importação em relação ao baseline;
+    retorna as importações mais lentas que a tolerância permite"""
+    previous = {result['module']: result for result in baseline.get('imports', [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result['module'])
+        if old is None or not old.get('seconds'):
+            continue
+        change = result['seconds'] / old['seconds'] - 1
+        result['change'] = change
+        if change > tolerance and result['seconds'] - old['seconds'] > IMPORT_NOISE:
+            regressions.append(result)
+    return regressions
+
+def result_key(result):
+    return result['bench'], result['size'], result['routers']
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Marca em cada resultado a variação de vazão em relação ao baseline;
+    retorna os resultados mais lentos que a tolerância permite"""
+    previous = {result_key(result): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or not old.get('throughput'):
+            continue
+        change = result['throughput'] / old['throughput'] - 1
+        result['change'] = change
+        if change < -tolerance:
+            regressions.append(result)
+    return regressions
+
+def format_result(result):
+    line = (f"  {result['bench']:<20} {result['size']:>9,} redes {result['routers']:>4} rot. "
+            f"{result['seconds']:9.3f} s {result['throughput']:14,.0f} itens/s")
+    if result['peak_bytes'] is not None:
+        line += f" {result['peak_bytes'] / 2**20:9.1f} MiB"
+    if 'change' in result:
+        line += f" {result['change']:+7.1%}"
+    return line
+
+def run_suite(sizes, router_counts, names, repeat=1, memory=True, output=None, baseline=None, tolerance=0.10,
+              route_limit=ROUTE_LIMIT, imports=True, budget_scale=1.0):
+    """Roda as medições pedidas; retorna 1 se houver regressão em relação
+    ao baseline ou importação acima do limite e 0 caso contrário"""
+    import_results, over_budget = run_imports(budget_scale=budget_scale) if imports else ([], [])
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for routers in router_counts:
+                inventory = Inventory(size, routers, directory, route_limit)
+                print(f"Inventário: {size:,} redes, {routers} roteadores")
+                for name in names:
+                    run = BENCHMARKS[name](inventory)
+                    if run is None:
+                        print(f"  {name:<20} ignorado (mais de {route_limit:,} rotas)")
+                        continue
+                    items, seconds, peak = measure(run, repeat, memory)
+                    result = {
+                        'bench': name,
+                        'size': size,
+                        'routers': routers,
+                        'items': items,
+                        'seconds': seconds,
+                        'throughput': items / seconds if seconds else 0.0,
+                        'peak_bytes': peak,
+                    }
+                    results.append(result)
+                    print(format_result(result))
+    
+    regressions, slower_imports = [], []
+    if baseline:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = compare_with_baseline(results, previous, tolerance)
+        slower_imports = compare_imports_with_baseline(import_results, previous, tolerance)
+        print(f"\nComparação com {baseline} (tolerância {tolerance:.0%}):")
+        for result in import_results:
+            if 'change' in result:
+                print(format_import(result))
+        for result in results:
+            if 'change' in result:
+                print(format_result(result))
+        if slower_imports:
+            print(f"{len(slower_imports)} importações mais lentas que a tolerância:")
+            for result in slower_imports:
+                print(format_import(result))
+        if regressions:
+            print(f"{len(regressions)} medições abaixo da tolerância:")
+            for result in regressions:
+                print(format_result(result))
+        elif not slower_imports:
+            print("Nenhuma regressão encontrada")
+    
+    if output:
+        document = {
+            'created': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': load_numpy().__version__ if load_numpy() is not None else None,
+            'repeat': repeat,
+            'imports': import_results,
+            'results': results,
+        }
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"Resultados salvos em {output}")
+    return 1 if regressions or slower_imports or over_budget else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Medições de desempenho da Calculadora de Redes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    batch_parser = subparsers.add_parser("batch", help="Modo em lote serial x paralelo")
+    batch_parser.add_argument("--rows", type=int, default=200000)
+    batch_parser.add_argument("--workers", type=int, nargs="+",
+                              default=[1, 2, 4, os.cpu_count() or 1])
+    batch_parser.add_argument("--chunk-size", type=int, default=5000)
+    
+    suite_parser = subparsers.add_parser("suite", help="Calculadora, roteamento, importação, exportação e ordenação")
+    suite_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000],
+                              help="Tamanhos dos inventários (número de redes)")
+    suite_parser.add_argument("--routers", type=int, nargs="+", default=[4, 32],
+                              help="Quantidades de roteadores")
+    suite_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                              help="Medições a executar (padrão: todas)")
+    suite_parser.add_argument("--repeat", type=int, default=1,
+                              help="Execuções por medição; vale o melhor tempo")
+    suite_parser.add_argument("--no-memory", action="store_true",
+                              help="Não mede o pico de memória (execução extra com tracemalloc)")
+    suite_parser.add_argument("--route-limit", type=int, default=ROUTE_LIMIT,
+                              help=f"Maior tabela de roteamento gerada (padrão: {ROUTE_LIMIT})")
+    suite_parser.add_argument("-o", "--output", help="Salva os resultados em JSON")
+    suite_parser.add_argument("--baseline", help="Resultados JSON anteriores para comparação")
+    suite_parser.add_argument("--tolerance", type=float, default=0.10,
+                              help="Queda de vazão aceita em relação ao baseline (padrão: 0.10)")
+    suite_parser.add_argument("--no-imports", action="store_true",
+                              help="Não mede o tempo de importação dos pontos de entrada")
+    suite_parser.add_argument("--budget-scale", type=float, default=1.0,
+                              help="Multiplica os limites de tempo de importação (máquinas mais lentas)")
+    
+    imports_parser = subparsers.add_parser("imports", help="Tempo de importação dos pontos de entrada")
+    imports_parser.add_argument("--repeat", type=int, default=5,
+                                help="Importações por módulo; vale o melhor tempo")
+    imports_parser.add_argument("--budget-scale", type=float, default=1.0,
+                                help="Multiplica os limites de tempo de importação (máquinas mais lentas)")
+    
+    service_parser = subparsers.add_parser("service", help="Latência do serviço HTTP (exe.py serve)")
+    service_parser.add_argument("--requests", type=int, default=2000,
+                                help="Requisições isoladas por medição (padrão: 2000)")
+    service_parser.add_argument("--batch-size", type=int, default=1000,
+                                help="Redes e endereços por requisição em lote (padrão: 1000)")
+    
+    args = parser.parse_args()
+    if args.command == "batch":
+        bench_batch(args.rows, sorted(set(args.workers)), args.chunk_size)
+    elif args.command == "suite":
+        sys.exit(run_suite(args.sizes, args.routers, args.only, max(args.repeat, 1), not args.no_memory,
+                           args.output, args.baseline, args.tolerance, args.route_limit,
+                           not args.no_imports, args.budget_scale))
+    elif args.command == "imports":
+        sys.exit(1 if run_imports(max(args.repeat, 1), args.budget_scale)[1] else 0)
+    elif args.command == "service":
+        bench_service(max(args.requests, 1), max(args.batch_size, 1))
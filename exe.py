@@ -1,5 +1,328 @@
-import ipaddress
 import math
+from array import array
+
+from masks import IPV6_TAG, MASK_INPUT_TABLE, MASK_INT_TABLE, MASK_TABLE, PREFIX_TABLE, lookup_mask
+
+# O NumPy é opcional e só é importado quando um cálculo vetorizado precisa
+# dele: sozinho, ele leva mais tempo para carregar que o resto do programa
+_numpy = None
+_numpy_loaded = False
+
+def load_numpy():
+    """Retorna o módulo numpy, importado na primeira chamada, ou None se
+    não estiver instalado"""
+    global _numpy, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy, _numpy_loaded = numpy, True
+    return _numpy
+
+def ipv4_to_int(ip):
+    """Converte um IPv4 em formato decimal com pontos para inteiro de 32 bits"""
+    try:
+        a, b, c, d = map(int, ip.split('.'))
+    except ValueError:
+        raise ValueError(f"IP inválido: {ip}") from None
+    # Mesmas regras do ipaddress: octetos até 255, sem sinais, espaços ou
+    # zeros à esquerda (a forma canônica precisa ser idêntica à entrada)
+    if (a | b | c | d) >> 8 or f"{a}.{b}.{c}.{d}" != ip:
+        raise ValueError(f"IP inválido: {ip}")
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+def int_to_ipv4(value):
+    """Converte um inteiro de 32 bits para IPv4 em formato decimal com pontos"""
+    return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+def int_to_binary(value):
+    """Converte um inteiro de 32 bits para binário com pontos a cada octeto"""
+    bits = format(value, '032b')
+    return f"{bits[0:8]}.{bits[8:16]}.{bits[16:24]}.{bits[24:32]}"
+
+def parse_address(ip):
+    """Converte um IPv4 ou IPv6 em texto para inteiro marcado (o IPv6 somado
+    a IPV6_TAG, veja masks.py)"""
+    if ':' in ip:
+        import ipv6
+        
+        return ipv6.ipv6_to_int(ip) | IPV6_TAG
+    return ipv4_to_int(ip)
+
+def format_address(value):
+    """Converte um inteiro marcado (veja parse_address) para texto"""
+    if value < IPV6_TAG:
+        return int_to_ipv4(value)
+    import ipv6
+    
+    return ipv6.int_to_ipv6(value ^ IPV6_TAG)
+
+def address_version(value):
+    """Família (4 ou 6) de um endereço em texto ou inteiro (inteiros de até
+    32 bits são tratados como IPv4)"""
+    if isinstance(value, str):
+        return 6 if ':' in value else 4
+    return 6 if int(value) > 0xFFFFFFFF else 4
+
+def mask_to_prefix(mask_int):
+    """Retorna o comprimento de prefixo de uma máscara contígua (ou None)"""
+    info = MASK_INT_TABLE.get(mask_int)
+    return info.prefix if info is not None else None
+
+# Campos retornados por process_network_entry, na ordem de exibição
+ROW_FIELDS = ('Nome Host', 'IP', 'Máscara', 'IP Rede', 'Gateway', 'Broadcast',
+              'IP Binario', 'Mascara Binaria', 'Binario de Rede', 'Numero de Sub-Redes',
+              'Intervalo de Subredes', 'Total de IPs', 'Hosts Utilizaveis')
+
+
+def prefix_to_mask(prefix):
+    """Converte um comprimento de prefixo para a máscara como inteiro de 32 bits"""
+    return PREFIX_TABLE[prefix].mask_int
+
+def normalize_mask(mask, ip=None):
+    """Normaliza a máscara de entrada (aceita CIDR ou formato tradicional)
+    
+    Se o IP informado for IPv6, a máscara é um prefixo de 0 a 128 ou uma
+    máscara IPv6, normalizada para a forma comprimida.
+    """
+    if ip is not None and ':' in ip:
+        import ipv6
+        
+        return ipv6.lookup_mask6(mask).mask
+    return lookup_mask(mask).mask
+
+def _address_to_int(value):
+    """Aceita um IPv4 em texto ou já como inteiro"""
+    if isinstance(value, str):
+        return ipv4_to_int(value)
+    return int(value)
+
+def _mask_to_int(value):
+    """Aceita máscara em texto ("24", "/24" ou em pontos), inteiro de 32 bits ou prefixo (0 a 32)"""
+    if isinstance(value, str):
+        info = MASK_INPUT_TABLE.get(value)
+        if info is not None:
+            return info.mask_int
+        value = value.strip()
+        if value.startswith('/') or value.isdigit():
+            return lookup_mask(value).mask_int
+        # Máscaras em pontos não contíguas passam adiante e são relatadas com o número da linha
+        return ipv4_to_int(value)
+    value = int(value)
+    # Inteiros de 1 a 32 nunca são máscaras contíguas, então são prefixos
+    return PREFIX_TABLE[value].mask_int if 0 <= value <= 32 else value
+
+class NetworkBatch:
+    """Resultado colunar de NetworkCalculator.process_network_entries
+    
+    As colunas numéricas ('ip', 'mask', 'prefix', 'network', 'gateway',
+    'broadcast', 'total_ips', 'usable_hosts', 'subnet_count') são calculadas
+    de uma vez. As colunas de texto, com os mesmos nomes do dicionário de
+    process_network_entry, só são montadas quando acessadas.
+    """
+    
+    NUMERIC_COLUMNS = ('ip', 'mask', 'prefix', 'network', 'network_ip', 'gateway',
+                       'broadcast', 'total_ips', 'usable_hosts', 'subnet_count')
+    
+    # Família e formatação dos endereços (IPv6 em ipv6.NetworkBatch6)
+    version = 4
+    format_address = staticmethod(int_to_ipv4)
+    format_binary = staticmethod(int_to_binary)
+    
+    def __init__(self, columns, host_names=None, ips=None, masks=None):
+        self.columns = columns
+        self.host_names = host_names
+        self.ips = ips
+        self.masks = masks
+        self.string_columns = {}
+    
+    def __len__(self):
+        return len(self.columns['ip'])
+    
+    def __getitem__(self, name):
+        if name in self.columns:
+            return self.columns[name]
+        if name not in self.string_columns:
+            self.string_columns[name] = self.build_string_column(name)
+        return self.string_columns[name]
+    
+    def keys(self):
+        """Nomes de todas as colunas disponíveis"""
+        return list(self.NUMERIC_COLUMNS) + list(ROW_FIELDS)
+    
+    def _ints(self, name):
+        column = self.columns[name]
+        return column.tolist()
+    
+    def build_string_column(self, name):
+        """Monta uma coluna de texto a partir das colunas inteiras"""
+        if name == 'Nome Host':
+            return list(self.host_names) if self.host_names is not None else [''] * len(self)
+        if name == 'IP':
+            if self.ips is not None and all(isinstance(ip, str) for ip in self.ips):
+                return list(self.ips)
+            return [self.format_address(value) for value in self._ints('ip')]
+        if name == 'Máscara':
+            if self.masks is not None and all(isinstance(mask, str) for mask in self.masks):
+                return list(self.masks)
+            return [self.format_address(value) for value in self._ints('mask')]
+        if name == 'IP Rede':
+            return [self.format_address(value) for value in self._ints('network_ip')]
+        if name == 'Gateway':
+            return [self.format_address(value) for value in self._ints('gateway')]
+        if name == 'Broadcast':
+            return [self.format_address(value) for value in self._ints('broadcast')]
+        if name == 'IP Binario':
+            return [self.format_binary(value) for value in self._ints('ip')]
+        if name == 'Mascara Binaria':
+            return [self.format_binary(value) for value in self._ints('mask')]
+        if name == 'Binario de Rede':
+            return [self.format_binary(value) for value in self._ints('network_ip')]
+        if name == 'Intervalo de Subredes':
+            return [f"{self.format_address(start)} - {self.format_address(end)}"
+                    for start, end in zip(self._ints('network'), self._ints('broadcast'))]
+        if name == 'Numero de Sub-Redes':
+            return self._ints('subnet_count')
+        if name == 'Total de IPs':
+            return self._ints('total_ips')
+        if name == 'Hosts Utilizaveis':
+            return self._ints('usable_hosts')
+        raise KeyError(name)
+    
+    def rows(self):
+        """Gera cada linha no mesmo formato de process_network_entry"""
+        columns = [self[name] for name in ROW_FIELDS]
+        for values in zip(*columns):
+            yield dict(zip(ROW_FIELDS, values))
+
+class NetworkResult(dict):
+    """Resultado de process_network_entry: um dicionário com os campos de
+    ROW_FIELDS
+    
+    Na criação só entram os campos que vêm da própria entrada (host, IP,
+    máscara); cada campo derivado (gateway, broadcast, binários, intervalo) é
+    calculado em __missing__ na primeira leitura e guardado no dicionário.
+    Quem nunca lê as colunas binárias, como a aba de roteamento ou
+    importações grandes, não paga por elas. Iterar, comparar, copiar ou
+    serializar (json.dumps) completa antes todos os campos; qualquer campo,
+    como 'Roteador', pode ser atribuído.
+    """
+    
+    __slots__ = ('ip_int', 'network_int', 'mask_info', '_complete')
+    
+    # Família e formatação dos endereços (IPv6 em ipv6.NetworkResult6)
+    version = 4
+    format_address = staticmethod(int_to_ipv4)
+    format_binary = staticmethod(int_to_binary)
+    all_ones = 0xFFFFFFFF
+    
+    def __init__(self, host_name, ip, mask, ip_int, network_int, mask_info, network_ip=None):
+        self['Nome Host'] = host_name
+        # O IP de entrada é mantido; o IPv6 é montado na forma comprimida
+        if ip is not None:
+            self['IP'] = ip
+        self['Máscara'] = mask
+        if network_ip:
+            self['IP Rede'] = network_ip
+        self.ip_int = ip_int
+        self.network_int = network_int
+        self.mask_info = mask_info
+        self._complete = False
+    
+    @property
+    def network_start(self):
+        """Início da rede (IP de rede com a máscara aplicada) como inteiro"""
+        return self.network_int & self.mask_info.mask_int
+    
+    @property
+    def broadcast_int(self):
+        """Endereço de broadcast como inteiro"""
+        return self.network_start | (self.all_ones ^ self.mask_info.mask_int)
+    
+    def __missing__(self, key):
+        getter = RESULT_FIELD_GETTERS.get(key)
+        if getter is None or self._complete:
+            raise KeyError(key)
+        value = self[key] = getter(self)
+        return value
+    
+    def complete(self):
+        """Calcula os campos que faltam e reordena o dicionário: ROW_FIELDS
+        primeiro, depois os campos atribuídos (como 'Roteador')"""
+        if not self._complete:
+            fields = {name: self[name] for name in ROW_FIELDS if name in self}
+            assigned = [(key, value) for key, value in dict.items(self) if key not in fields]
+            dict.clear(self)
+            dict.update(self, fields)
+            dict.update(self, assigned)
+            self._complete = True
+        return self
+    
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (not self._complete and key in RESULT_FIELD_GETTERS)
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    def __iter__(self):
+        return dict.__iter__(self.complete())
+    
+    def __len__(self):
+        return dict.__len__(self.complete())
+    
+    def keys(self):
+        return dict.keys(self.complete())
+    
+    def values(self):
+        return dict.values(self.complete())
+    
+    def items(self):
+        return dict.items(self.complete())
+    
+    def copy(self):
+        return dict(self.complete())
+    
+    def pop(self, key, *default):
+        return dict.pop(self.complete(), key, *default)
+    
+    def popitem(self):
+        return dict.popitem(self.complete())
+    
+    def setdefault(self, key, default=None):
+        return dict.setdefault(self.complete(), key, default)
+    
+    def __eq__(self, other):
+        if isinstance(other, NetworkResult):
+            other.complete()
+        return dict.__eq__(self.complete(), other)
+    
+    def __ne__(self, other):
+        if isinstance(other, NetworkResult):
+            other.complete()
+        return dict.__ne__(self.complete(), other)
+    
+    def __or__(self, other):
+        return dict(self.complete()) | other
+    
+    def __repr__(self):
+        return f"NetworkResult({dict.__repr__(self.complete())})"
+
+# Campos calculados na primeira leitura (os demais vêm da entrada)
+RESULT_FIELD_GETTERS = {
+    'IP': lambda result: result.format_address(result.ip_int),
+    'IP Rede': lambda result: result.format_address(result.network_int),
+    'Gateway': lambda result: result.format_address(result.network_start + 1),
+    'Broadcast': lambda result: result.format_address(result.broadcast_int),
+    'IP Binario': lambda result: result.format_binary(result.ip_int),
+    'Mascara Binaria': lambda result: result.mask_info.binary,
+    'Binario de Rede': lambda result: result.format_binary(result.network_int),
+    'Numero de Sub-Redes': lambda result: result.mask_info.subnet_count,
+    'Intervalo de Subredes': lambda result: (
+        f"{result.format_address(result.network_start)} - {result['Broadcast']}"),
+    'Total de IPs': lambda result: result.mask_info.total_ips,
+    'Hosts Utilizaveis': lambda result: result.mask_info.usable_hosts,
+}
 
 class NetworkCalculator:
     def __init__(self):
@@ -19,11 +342,15 @@ class NetworkCalculator:
     
     def calculate_network_ip(self, ip, mask):
         """Calcula o IP de rede"""
+        import ipaddress
+        
         network = ipaddress.IPv4Network(f"{ip}/{mask}", strict=False)
         return str(network.network_address)
     
     def calculate_gateway(self, network_ip, mask):
         """Calcula o gateway (primeiro IP válido da rede)"""
+        import ipaddress
+        
         network = ipaddress.IPv4Network(f"{network_ip}/{mask}", strict=False)
         # Gateway é normalmente o primeiro IP utilizável da rede
         first_usable = network.network_address + 1
@@ -31,11 +358,17 @@ class NetworkCalculator:
     
     def calculate_broadcast(self, network_ip, mask):
         """Calcula o endereço de broadcast da rede"""
+        import ipaddress
+        
         network = ipaddress.IPv4Network(f"{network_ip}/{mask}", strict=False)
         return str(network.broadcast_address)
     
     def calculate_subnet_count(self, mask):
         """Calcula o número de sub-redes possíveis"""
+        info = MASK_TABLE.get(mask)
+        if info is not None:
+            return info.subnet_count
+        
         # Converte máscara para CIDR
         mask_int = sum([bin(int(octet)).count('1') for octet in mask.split('.')])
         
@@ -69,6 +402,8 @@ class NetworkCalculator:
     
     def calculate_subnet_range(self, network_ip, mask):
         """Calcula o intervalo de IPs da sub-rede"""
+        import ipaddress
+        
         network = ipaddress.IPv4Network(f"{network_ip}/{mask}", strict=False)
         
         # IP inicial da rede
@@ -81,6 +416,13 @@ class NetworkCalculator:
     
     def calculate_host_count(self, mask):
         """Calcula o número de hosts possíveis na rede"""
+        info = MASK_TABLE.get(mask)
+        if info is not None:
+            return {
+                'total_ips': info.total_ips,
+                'usable_hosts': info.usable_hosts
+            }
+        
         # Converte máscara para CIDR
         mask_int = sum([bin(int(octet)).count('1') for octet in mask.split('.')])
         
@@ -99,7 +441,155 @@ class NetworkCalculator:
         }
     
     def process_network_entry(self, host_name, ip, mask, network_ip=None):
-        """Processa uma entrada de rede e calcula todos os campos"""
+        """Processa uma entrada de rede; os campos derivados são calculados na
+        primeira leitura (veja NetworkResult)"""
+        if ':' in ip:
+            return self.process_network_entry6(host_name, ip, mask, network_ip)
+        
+        # Caminho rápido: a máscara vem da tabela pré-calculada e o IP é
+        # interpretado uma única vez como inteiro; o resto é aritmética de bits
+        mask_info = MASK_TABLE.get(mask)
+        try:
+            if mask_info is None:
+                raise ValueError(f"Máscara fora da tabela: {mask}")
+            ip_int = ipv4_to_int(ip)
+            network_int = ipv4_to_int(network_ip) if network_ip else None
+        except ValueError:
+            # Entradas fora do formato padrão seguem pelo cálculo com ipaddress,
+            # que mantém exatamente as mesmas respostas e mensagens de erro
+            return self.process_network_entry_ipaddress(host_name, ip, mask, network_ip)
+        
+        if network_int is None:
+            network_int = ip_int & mask_info.mask_int
+        
+        if network_int & mask_info.mask_int == 0xFFFFFFFF:
+            # Não existe primeiro IP utilizável após 255.255.255.255
+            return self.process_network_entry_ipaddress(host_name, ip, mask, network_ip)
+        
+        # Os campos derivados só são calculados quando lidos
+        return NetworkResult(host_name, ip, mask, ip_int, network_int, mask_info, network_ip)
+    
+    def process_network_entry6(self, host_name, ip, mask, network_ip=None):
+        """Processa uma entrada de rede IPv6 sobre inteiros de 128 bits (veja
+        ipv6.py); a máscara pode ser um prefixo ou uma máscara IPv6"""
+        import ipv6
+        
+        mask_info = ipv6.lookup_mask6(mask)
+        ip_int = ipv6.ipv6_to_int(ip)
+        network_int = ipv6.ipv6_to_int(network_ip) if network_ip else ip_int & mask_info.mask_int
+        if network_int & mask_info.mask_int == ipv6.ALL_ONES:
+            raise ValueError("A rede ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff/128 não tem IP utilizável")
+        # IP, máscara e IP de rede aparecem na forma comprimida (IP e IP de
+        # rede montados na primeira leitura)
+        return ipv6.NetworkResult6(host_name, None, mask_info.mask, ip_int, network_int, mask_info)
+    
+    def process_network_entries(self, ips, masks, network_ips=None, host_names=None, version=None):
+        """Processa colunas inteiras de IPs e máscaras de uma só vez
+        
+        Aceita listas (IPs em texto ou inteiros; máscaras em texto, inteiros
+        ou prefixos de 0 a 32) ou arrays NumPy uint32. Com NumPy instalado o
+        cálculo é vetorizado; sem ele, usa arrays compactos do módulo array.
+        Retorna um NetworkBatch.
+        
+        As colunas são de uma só família: version (4 ou 6) é deduzida do
+        primeiro IP quando não informada (IPv6 em texto ou inteiro acima de
+        32 bits). Redes IPv6 são calculadas com inteiros do Python (prefixos
+        de 0 a 128) e retornam um ipv6.NetworkBatch6.
+        """
+        if len(masks) != len(ips) or (network_ips is not None and len(network_ips) != len(ips)):
+            raise ValueError("As colunas de IP, máscara e IP de rede devem ter o mesmo tamanho")
+        
+        if version is None:
+            version = address_version(ips[0]) if len(ips) else 4
+        if version == 6:
+            import ipv6
+            
+            return ipv6.NetworkBatch6(ipv6.process_columns6(ips, masks, network_ips), host_names, ips, masks)
+        
+        if load_numpy() is not None:
+            columns = self._process_columns_numpy(ips, masks, network_ips)
+        else:
+            columns = self._process_columns_python(ips, masks, network_ips)
+        return NetworkBatch(columns, host_names, ips, masks)
+    
+    def _process_columns_numpy(self, ips, masks, network_ips):
+        """Cálculo vetorizado das colunas com NumPy"""
+        np = load_numpy()
+        
+        def address_column(values):
+            if isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+                return values.astype(np.uint32)
+            return np.fromiter((_address_to_int(value) for value in values), dtype=np.uint32, count=len(values))
+        
+        ip = address_column(ips)
+        if isinstance(masks, np.ndarray) and masks.dtype.kind in 'iu':
+            raw = masks.astype(np.uint64)
+            as_prefix = np.left_shift(np.uint64(0xFFFFFFFF), np.uint64(32) - np.minimum(raw, 32)) & np.uint64(0xFFFFFFFF)
+            mask = np.where(raw <= 32, as_prefix, raw).astype(np.uint32)
+        else:
+            mask = np.fromiter((_mask_to_int(value) for value in masks), dtype=np.uint32, count=len(masks))
+        
+        host = ~mask
+        invalid = np.flatnonzero(host & (host + np.uint32(1)))
+        if invalid.size:
+            raise ValueError(f"Máscara não contígua na linha {int(invalid[0]) + 1}")
+        
+        # Para máscaras contíguas, host + 1 é potência de 2
+        host_bits = np.log2(host.astype(np.uint64) + 1).astype(np.uint8)
+        prefix = (32 - host_bits).astype(np.uint8)
+        
+        network_ip = address_column(network_ips) if network_ips is not None else ip & mask
+        network = network_ip & mask
+        overflow = np.flatnonzero(network == np.uint32(0xFFFFFFFF))
+        if overflow.size:
+            raise ValueError(f"Rede sem IP utilizável na linha {int(overflow[0]) + 1}")
+        
+        total_ips = np.left_shift(np.uint64(1), host_bits.astype(np.uint64))
+        return {
+            'ip': ip,
+            'mask': mask,
+            'prefix': prefix,
+            'network_ip': network_ip,
+            'network': network,
+            'gateway': network + np.uint32(1),
+            'broadcast': network | host,
+            'total_ips': total_ips,
+            'usable_hosts': np.where(total_ips > 2, total_ips - 2, 0).astype(np.uint64),
+            'subnet_count': np.left_shift(np.uint64(1), np.maximum(prefix, 24).astype(np.uint64) - np.uint64(24)),
+        }
+    
+    def _process_columns_python(self, ips, masks, network_ips):
+        """Cálculo das colunas sem NumPy, linha a linha sobre inteiros"""
+        typecodes = {'prefix': 'B', 'total_ips': 'Q', 'usable_hosts': 'Q', 'subnet_count': 'Q'}
+        columns = {name: array(typecodes.get(name, 'I')) for name in NetworkBatch.NUMERIC_COLUMNS}
+        
+        for row, (ip, mask) in enumerate(zip(ips, masks)):
+            ip_int = _address_to_int(ip)
+            mask_info = MASK_INT_TABLE.get(_mask_to_int(mask))
+            if mask_info is None:
+                raise ValueError(f"Máscara não contígua na linha {row + 1}")
+            
+            mask_int = mask_info.mask_int
+            network_ip = _address_to_int(network_ips[row]) if network_ips is not None else ip_int & mask_int
+            network = network_ip & mask_int
+            if network == 0xFFFFFFFF:
+                raise ValueError(f"Rede sem IP utilizável na linha {row + 1}")
+            
+            columns['ip'].append(ip_int)
+            columns['mask'].append(mask_int)
+            columns['prefix'].append(mask_info.prefix)
+            columns['network_ip'].append(network_ip)
+            columns['network'].append(network)
+            columns['gateway'].append(network + 1)
+            columns['broadcast'].append(network | (~mask_int & 0xFFFFFFFF))
+            columns['total_ips'].append(mask_info.total_ips)
+            columns['usable_hosts'].append(mask_info.usable_hosts)
+            columns['subnet_count'].append(mask_info.subnet_count)
+        
+        return columns
+    
+    def process_network_entry_ipaddress(self, host_name, ip, mask, network_ip=None):
+        """Processa uma entrada de rede campo a campo usando o módulo ipaddress"""
         
         # Se network_ip não foi fornecido, calcula
         if not network_ip:
@@ -142,6 +632,8 @@ class NetworkCalculator:
         }
 
 def main():
+    import sys
+    
     calculator = NetworkCalculator()
     
     print("=== CALCULADORA DE REDES ===\n")
@@ -189,26 +681,7 @@ def main():
         print("TABELA FINAL DE REDES")
         print("="*150)
         
-        # Cabeçalho
-        headers = ['Nome Host', 'IP', 'Máscara', 'IP Rede', 'Gateway', 'IP Binario', 
-                  'Mascara Binaria', 'Binario de Rede', 'Numero de Sub-Redes', 'Intervalo de Subredes',
-                  'Total de IPs', 'Hosts Utilizaveis']
-        
-        # Calcula larguras das colunas
-        col_widths = {}
-        for header in headers:
-            col_widths[header] = max(len(header), 
-                                   max(len(str(network.get(header, ''))) for network in networks))
-        
-        # Imprime cabeçalho
-        header_line = " | ".join(header.ljust(col_widths[header]) for header in headers)
-        print(header_line)
-        print("-" * len(header_line))
-        
-        # Imprime dados
-        for network in networks:
-            row = " | ".join(str(network.get(header, '')).ljust(col_widths[header]) for header in headers)
-            print(row)
+        write_network_table(sys.stdout, networks)
         
         print("="*150)
         
@@ -221,32 +694,32 @@ def main():
             
             save_to_file(networks, filename)
 
+# Colunas das tabelas de texto do modo interativo
+TEXT_TABLE_FIELDS = ('Nome Host', 'IP', 'Máscara', 'IP Rede', 'Gateway', 'IP Binario',
+                     'Mascara Binaria', 'Binario de Rede', 'Numero de Sub-Redes', 'Intervalo de Subredes',
+                     'Total de IPs', 'Hosts Utilizaveis')
+
+def write_network_table(stream, networks):
+    """Escreve as redes em tabela de largura fixa, numa única passada"""
+    from table_writer import mapping_rows, write_fixed_width
+    
+    # Só o nome do host tem largura livre; as demais colunas têm tamanho
+    # conhecido (maior se houver redes IPv6)
+    host_width = max((len(str(network.get('Nome Host', ''))) for network in networks), default=0)
+    prefixes6 = {network.mask_info.prefix for network in networks if getattr(network, 'version', 4) == 6}
+    write_fixed_width(stream, TEXT_TABLE_FIELDS, mapping_rows(networks, TEXT_TABLE_FIELDS),
+                      text_widths={'Nome Host': host_width}, prefixes6=prefixes6)
+
 def save_to_file(networks, filename):
     """Salva os resultados em arquivo de texto"""
+    from table_writer import open_output
+    
     try:
-        with open(f"{filename}.txt", "w", encoding="utf-8") as f:
+        with open_output(f"{filename}.txt") as f:
             f.write("TABELA DE REDES CALCULADAS\n")
             f.write("="*150 + "\n\n")
             
-            headers = ['Nome Host', 'IP', 'Máscara', 'IP Rede', 'Gateway', 'IP Binario', 
-                      'Mascara Binaria', 'Binario de Rede', 'Numero de Sub-Redes', 'Intervalo de Subredes',
-                      'Total de IPs', 'Hosts Utilizaveis']
-            
-            # Calcula larguras das colunas
-            col_widths = {}
-            for header in headers:
-                col_widths[header] = max(len(header), 
-                                       max(len(str(network.get(header, ''))) for network in networks))
-            
-            # Escreve cabeçalho
-            header_line = " | ".join(header.ljust(col_widths[header]) for header in headers)
-            f.write(header_line + "\n")
-            f.write("-" * len(header_line) + "\n")
-            
-            # Escreve dados
-            for network in networks:
-                row = " | ".join(str(network.get(header, '')).ljust(col_widths[header]) for header in headers)
-                f.write(row + "\n")
+            write_network_table(f, networks)
             
             f.write("\n" + "="*150)
         
@@ -265,7 +738,8 @@ def test_examples():
         ("Host teste", "172.16.0.62", "255.255.255.192", "172.16.0.0"),
         ("Almoxarifado", "10.0.20.0", "255.255.255.240", "10.0.20.0"),
         ("Vendas", "10.0.16.0", "255.255.252.0", "10.0.16.0"),
-        ("Terceirizados", "10.0.0.0", "255.255.240.0", "10.0.0.0")
+        ("Terceirizados", "10.0.0.0", "255.255.240.0", "10.0.0.0"),
+        ("Matriz IPv6", "2001:db8:0:10::1", "64", None)
     ]
     
     print("=== TESTE COM EXEMPLOS ===\n")
@@ -278,15 +752,538 @@ def test_examples():
             print(f"  {key}: {value}")
         print()
 
+def verify_fast_path(samples=20000, seed=0, version=None):
+    """Compara o caminho rápido com o cálculo baseado em ipaddress (IPv4, IPv6 ou ambos)"""
+    ok = True
+    if version in (None, 4):
+        ok = verify_ipv4(samples, seed) and ok
+    if version in (None, 6):
+        from ipv6 import verify_ipv6
+        
+        ok = verify_ipv6(samples, seed) and ok
+    return ok
+
+def verify_ipv4(samples=20000, seed=0):
+    """Compara o caminho rápido IPv4 com o cálculo baseado em ipaddress"""
+    import random
+    
+    calculator = NetworkCalculator()
+    rng = random.Random(seed)
+    
+    # Todas as máscaras válidas em pontos, incluindo /0 e /32
+    masks = [int_to_ipv4((0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF) for prefix in range(33)]
+    
+    cases = []
+    for host_name, ip, mask, network_ip in [
+        ("Host teste", "10.0.0.0", "255.255.255.0", "10.0.0.0"),
+        ("Host teste", "172.16.0.62", "255.255.255.192", "172.16.0.0"),
+        ("Borda", "255.255.255.254", "255.255.255.254", None),
+        ("Borda", "0.0.0.0", "0.0.0.0", None),
+    ]:
+        cases.append((host_name, ip, mask, network_ip))
+    
+    for _ in range(samples):
+        ip = int_to_ipv4(rng.getrandbits(32))
+        mask = rng.choice(masks)
+        network_ip = int_to_ipv4(rng.getrandbits(32)) if rng.random() < 0.25 else None
+        cases.append(("Host", ip, mask, network_ip))
+    
+    mismatches = 0
+    for host_name, ip, mask, network_ip in cases:
+        try:
+            expected = calculator.process_network_entry_ipaddress(host_name, ip, mask, network_ip)
+        except ValueError:
+            # Entradas que o ipaddress rejeita também devem ser rejeitadas
+            try:
+                calculator.process_network_entry(host_name, ip, mask, network_ip)
+            except ValueError:
+                continue
+            expected = None
+        
+        result = calculator.process_network_entry(host_name, ip, mask, network_ip)
+        if result != expected:
+            mismatches += 1
+            print(f"Divergência em {ip} {mask} {network_ip}:")
+            print(f"  esperado: {expected}")
+            print(f"  obtido:   {result}")
+    
+    print(f"{len(cases)} casos verificados, {mismatches} divergências")
+    return mismatches == 0
+
+# Nomes de coluna aceitos na entrada do modo em lote
+BATCH_INPUT_ALIASES = {
+    'Roteador': ('Roteador', 'roteador', 'router'),
+    'Nome Host': ('Nome Host', 'nome_host', 'host'),
+    'IP': ('IP', 'ip'),
+    'Máscara': ('Máscara', 'Mascara', 'mascara', 'mask'),
+    'IP Rede': ('IP Rede', 'ip_rede', 'network', 'network_ip'),
+}
+
+BATCH_OUTPUT_FIELDS = ROW_FIELDS + ('Roteador',)
+
+def detect_format(filename, default='csv'):
+    """Deduz o formato (csv ou jsonl) pela extensão do arquivo"""
+    if filename and filename.lower().endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return default
+
+def iter_input_rows(stream, input_format='csv'):
+    """Lê as linhas de entrada uma a uma, gerando (número da linha, registro)"""
+    import csv
+    import json
+    
+    if input_format == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("cada linha deve ser um objeto JSON")
+            except ValueError as e:
+                yield line_number, ValueError(f"JSON inválido: {e}")
+                continue
+            yield line_number, record
+    else:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # line_num aponta para a última linha física lida pelo leitor
+            yield reader.line_num, record
+
+def read_batch_fields(record):
+    """Extrai os campos de entrada de um registro, aceitando os nomes alternativos"""
+    fields = {}
+    for field, aliases in BATCH_INPUT_ALIASES.items():
+        for alias in aliases:
+            value = record.get(alias)
+            if value not in (None, ''):
+                fields[field] = str(value).strip()
+                break
+    
+    missing = [field for field in ('Nome Host', 'IP', 'Máscara') if field not in fields]
+    if missing:
+        raise ValueError(f"Campos obrigatórios ausentes: {', '.join(missing)}")
+    return fields
+
+def process_batch_record(calculator, record):
+    """Calcula uma linha do modo em lote a partir de um registro lido"""
+    fields = read_batch_fields(record)
+    result = calculator.process_network_entry(fields['Nome Host'], fields['IP'],
+                                              normalize_mask(fields['Máscara'], fields['IP']),
+                                              fields.get('IP Rede'))
+    result['Roteador'] = fields.get('Roteador', '')
+    return result
+
+class BatchFormatter:
+    """Formata os resultados do modo em lote como linhas de texto CSV ou JSON"""
+    
+    def __init__(self, output_format='csv'):
+        import csv
+        import io
+        import json
+        
+        self.output_format = output_format
+        self.json = json
+        if output_format == 'csv':
+            self.buffer = io.StringIO()
+            self.writer = csv.writer(self.buffer)
+    
+    def _csv_line(self, values):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(values)
+        return self.buffer.getvalue()
+    
+    def header(self):
+        """Cabeçalho da saída (vazio para JSON Lines)"""
+        if self.output_format == 'csv':
+            return self._csv_line(BATCH_OUTPUT_FIELDS)
+        return ''
+    
+    def format(self, result):
+        """Formata uma linha de resultado"""
+        if self.output_format == 'csv':
+            return self._csv_line([result.get(field, '') for field in BATCH_OUTPUT_FIELDS])
+        return self.json.dumps(result, ensure_ascii=False) + "\n"
+
+def process_batch_chunk(lines, output_format='csv'):
+    """Processa um bloco de linhas lidas, devolvendo o texto de saída e os erros
+    
+    Executada tanto no processo principal quanto nos processos do modo
+    paralelo, por isso recebe e devolve apenas dados simples.
+    """
+    calculator = NetworkCalculator()
+    formatter = BatchFormatter(output_format)
+    output = []
+    errors = []
+    
+    for line_number, record in lines:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            result = process_batch_record(calculator, record)
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append(f"linha {line_number}: {e}\n")
+            continue
+        output.append(formatter.format(result))
+    
+    return ''.join(output), len(output), errors
+
+def iter_chunks(rows, chunk_size):
+    """Agrupa as linhas de entrada em listas de até chunk_size itens"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_parallel_chunks(chunks, output_format, workers):
+    """Processa os blocos em um pool de processos, mantendo a ordem de entrada
+    
+    No máximo 2 blocos por processo ficam em andamento: os resultados são
+    liberados em ordem assim que o bloco mais antigo termina, enquanto os
+    seguintes continuam sendo calculados.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(process_batch_chunk, chunk, output_format))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def run_batch(input_stream, output_stream, error_stream, input_format='csv', output_format='csv',
+              workers=1, chunk_size=5000):
+    """Processa um fluxo de entrada linha a linha, sem carregar tudo em memória
+    
+    Linhas inválidas são relatadas em error_stream com o número da linha e o
+    processamento continua. Com workers > 1 os blocos de chunk_size linhas são
+    distribuídos entre processos, e a saída mantém a ordem da entrada.
+    Retorna (linhas processadas, linhas com erro).
+    """
+    output_stream.write(BatchFormatter(output_format).header())
+    chunks = iter_chunks(iter_input_rows(input_stream, input_format), chunk_size)
+    
+    if workers > 1:
+        results = iter_parallel_chunks(chunks, output_format, workers)
+    else:
+        results = (process_batch_chunk(chunk, output_format) for chunk in chunks)
+    
+    processed = errors = 0
+    for text, count, chunk_errors in results:
+        output_stream.write(text)
+        error_stream.writelines(chunk_errors)
+        processed += count
+        errors += len(chunk_errors)
+    
+    return processed, errors
+
+def inventory_block(record):
+    """Converte um registro de inventário em (roteador, host, início da
+    rede, prefixo); redes IPv6 têm o início marcado (veja parse_address)"""
+    fields = read_batch_fields(record)
+    address = fields.get('IP Rede') or fields['IP']
+    if ':' in address:
+        import ipv6
+        
+        info = ipv6.TAGGED_PREFIX_TABLE[ipv6.lookup_mask6(fields['Máscara']).prefix]
+    else:
+        info = lookup_mask(fields['Máscara'])
+    return fields.get('Roteador', ''), fields['Nome Host'], parse_address(address) & info.mask_int, info.prefix
+
+def iter_inventory_blocks(input_stream, input_format, error_stream):
+    """Lê um inventário (CSV ou JSON Lines) e gera (número da linha,
+    roteador, host, início da rede, prefixo); linhas inválidas são
+    relatadas em error_stream"""
+    for line_number, record in iter_input_rows(input_stream, input_format):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            router, host_name, start, prefix = inventory_block(record)
+        except ValueError as e:
+            error_stream.write(f"linha {line_number}: {e}\n")
+            continue
+        yield line_number, router, host_name, start, prefix
+
+def build_prefix_index(input_stream, input_format, error_stream):
+    """Monta um PrefixIndex a partir de um inventário (CSV ou JSON Lines)"""
+    from prefix_index import PrefixIndex
+    
+    index = PrefixIndex()
+    for _, router, host_name, start, prefix in iter_inventory_blocks(input_stream, input_format, error_stream):
+        index.insert(start, prefix, (router, host_name))
+    return index
+
+def run_lookup(index, addresses, output_stream, error_stream, chunk_size=10000):
+    """Classifica endereços pelo maior prefixo correspondente, escrevendo CSV"""
+    import csv
+    
+    from prefix_index import format_match
+    
+    writer = csv.writer(output_stream)
+    writer.writerow(('Endereço', 'Rede', 'Roteador', 'Nome Host'))
+    found = missing = 0
+    
+    for chunk in iter_chunks((address.strip() for address in addresses if address.strip()), chunk_size):
+        valid = []
+        for address in chunk:
+            try:
+                parse_address(address)
+            except ValueError as e:
+                error_stream.write(f"{e}\n")
+                continue
+            valid.append(address)
+        
+        for address, match in zip(valid, index.lookup_many(valid)):
+            if match is None:
+                missing += 1
+                writer.writerow((address, '', '', ''))
+            else:
+                found += 1
+                router, host_name = match[2]
+                writer.writerow((address, format_match(match), router, host_name))
+    
+    return found, missing
+
+# Colunas da saída do comando routes (rotas e links WAN)
+ROUTE_OUTPUT_FIELDS = ('Tabela', 'Roteador', 'Descrição', 'Origem', 'Destino', 'Gateway')
+WAN_OUTPUT_FIELDS = ('Roteador', 'Rede de Enlace', 'IP WAN (Roteador)', 'Gateway (ISP)')
+
+def write_records(records, fields, output_stream, output_format='csv'):
+    """Escreve registros (tuplas na ordem de fields) em CSV ou JSON Lines,
+    um a um; retorna quantos foram escritos"""
+    import csv
+    import json
+    
+    count = 0
+    if output_format == 'csv':
+        writer = csv.writer(output_stream)
+        writer.writerow(fields)
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            output_stream.write(json.dumps(dict(zip(fields, record)), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def run_routes(tables, output_stream, output_format='csv', wan_stream=None):
+    """Escreve as rotas (e, se pedido, os links WAN) geradas pelas tabelas
+    de roteamento sem montá-las na memória; retorna o número de rotas"""
+    if wan_stream is not None:
+        write_records(tables.wan_links(), WAN_OUTPUT_FIELDS, wan_stream, output_format)
+    return write_records(tables.routes(), ROUTE_OUTPUT_FIELDS, output_stream, output_format)
+
+def enable_profiling(output=None):
+    """Liga a medição de tempos dos métodos da calculadora (veja profiling.py)
+
+    Sem output, usa o arquivo pedido na variável de ambiente REDES_PROFILE.
+    Retorna False se a medição continuar desligada.
+    """
+    from profiling import PROFILER, profile_output_from_env
+    
+    output = output or profile_output_from_env()
+    if not output:
+        return False
+    PROFILER.enable(output)
+    PROFILER.instrument(NetworkCalculator)
+    return True
+
+def cli(argv):
+    """Interface de linha de comando não interativa"""
+    import argparse
+    import sys
+    
+    parser = argparse.ArgumentParser(prog="exe.py", description="Calculadora de Redes")
+    parser.add_argument("--profile", metavar="ARQUIVO",
+                        help="Grava contagens e tempos das operações em ARQUIVO ao sair "
+                             "(JSON, ou cProfile se terminar em .prof)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    batch_parser = subparsers.add_parser("batch", help="Processa redes em lote (CSV ou JSON Lines)")
+    batch_parser.add_argument("-i", "--input", help="Arquivo de entrada (padrão: stdin)")
+    batch_parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: stdout)")
+    batch_parser.add_argument("-e", "--errors", help="Arquivo para as linhas com erro (padrão: stderr)")
+    batch_parser.add_argument("--input-format", choices=("csv", "jsonl"),
+                              help="Formato da entrada (padrão: pela extensão, ou csv)")
+    batch_parser.add_argument("--output-format", choices=("csv", "jsonl"),
+                              help="Formato da saída (padrão: pela extensão, ou csv)")
+    batch_parser.add_argument("-j", "--workers", type=int, default=1,
+                              help="Número de processos (0 = todos os núcleos; padrão: 1)")
+    batch_parser.add_argument("--chunk-size", type=int, default=5000,
+                              help="Linhas por bloco enviado a cada processo (padrão: 5000)")
+    
+    lookup_parser = subparsers.add_parser("lookup", help="Descobre a rede (e o roteador) de cada endereço")
+    lookup_parser.add_argument("-n", "--networks", required=True, help="Inventário de redes (CSV ou JSON Lines)")
+    lookup_parser.add_argument("--networks-format", choices=("csv", "jsonl"),
+                               help="Formato do inventário (padrão: pela extensão, ou csv)")
+    lookup_parser.add_argument("-a", "--addresses", help="Arquivo com um endereço por linha (padrão: stdin)")
+    lookup_parser.add_argument("-o", "--output", help="Arquivo CSV de saída (padrão: stdout)")
+    lookup_parser.add_argument("address", nargs="*", help="Endereços a consultar")
+    
+    routes_parser = subparsers.add_parser("routes", help="Gera as tabelas de roteamento de um inventário")
+    routes_parser.add_argument("-i", "--input", help="Inventário de redes (padrão: stdin)")
+    routes_parser.add_argument("-o", "--output", help="Arquivo de saída das rotas (padrão: stdout)")
+    routes_parser.add_argument("--wan-links", help="Arquivo de saída dos links WAN de cada roteador")
+    routes_parser.add_argument("--input-format", choices=("csv", "jsonl"),
+                               help="Formato da entrada (padrão: pela extensão, ou csv)")
+    routes_parser.add_argument("--output-format", choices=("csv", "jsonl"),
+                               help="Formato da saída (padrão: pela extensão, ou csv)")
+    routes_parser.add_argument("--inbound", action="store_true", help="Inclui as tabelas de entrada (WAN->LAN)")
+    routes_parser.add_argument("--outbound", action="store_true", help="Inclui as tabelas de saída (LAN->WAN)")
+    routes_parser.add_argument("--summarize", action="store_true", help="Sumariza as rotas em super-redes")
+    routes_parser.add_argument("--wan-pool", default="100.0.0.0/16",
+                               help="Pool de onde saem os links WAN (padrão: 100.0.0.0/16)")
+    routes_parser.add_argument("--wan-prefix", type=int, choices=(30, 31), default=30,
+                               help="Tamanho de cada link WAN: /30 ou /31 (padrão: 30)")
+    routes_parser.add_argument("--count", action="store_true",
+                               help="Só informa quantas rotas seriam geradas, sem gerá-las")
+    
+    verify_parser = subparsers.add_parser("verify", help="Compara o cálculo rápido com o módulo ipaddress")
+    verify_parser.add_argument("--samples", type=int, default=20000,
+                               help="Entradas aleatórias verificadas (padrão: 20000)")
+    verify_parser.add_argument("--seed", type=int, default=0, help="Semente das entradas aleatórias (padrão: 0)")
+    verify_parser.add_argument("--version", type=int, choices=(4, 6), dest="ip_version",
+                               help="Verifica só IPv4 ou só IPv6 (padrão: ambos)")
+    
+    serve_parser = subparsers.add_parser("serve", help="Atende cálculos, consultas e rotas por HTTP/JSON local")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Porta de escuta (padrão: 8080)")
+    serve_parser.add_argument("-n", "--networks", help="Inventário inicial para /lookup e /routes (CSV ou JSON Lines)")
+    serve_parser.add_argument("--networks-format", choices=("csv", "jsonl"),
+                              help="Formato do inventário (padrão: pela extensão, ou csv)")
+    serve_parser.add_argument("--max-routes", type=int, default=1000000,
+                              help="Maior tabela de rotas devolvida por /routes (padrão: 1000000)")
+    
+    args = parser.parse_args(argv)
+    enable_profiling(args.profile)
+    
+    if args.command == "verify":
+        # Código de saída 1 em qualquer divergência, para uso em CI
+        return 0 if verify_fast_path(max(args.samples, 0), args.seed, args.ip_version) else 1
+    
+    if args.command == "serve":
+        import service
+        
+        inventory = service.load_inventory_file(args.networks, args.networks_format) if args.networks else ()
+        try:
+            return service.serve(args.host, args.port, inventory, args.max_routes)
+        except OSError as e:
+            # Porta em uso ou endereço inválido
+            parser.error(str(e))
+    
+    if args.command == "routes":
+        from routing import RoutingTables
+        from wan import WanAllocator
+        
+        try:
+            wan = WanAllocator(args.wan_pool, args.wan_prefix)
+        except ValueError as e:
+            parser.error(str(e))
+        
+        input_format = args.input_format or detect_format(args.input)
+        input_stream = open(args.input, 'r', newline='', encoding='utf-8') if args.input else sys.stdin
+        try:
+            tables = RoutingTables(iter_inventory_blocks(input_stream, input_format, sys.stderr),
+                                   args.inbound, args.outbound, args.summarize, wan)
+        except ValueError as e:
+            # Pool WAN pequeno demais para os roteadores do inventário
+            parser.error(str(e))
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+        
+        if args.count:
+            print(f"{tables.count_routes()} rotas (tabela completa: {tables.full_count()}), "
+                  f"{len(tables.router_order)} roteadores")
+            return 0
+        
+        output_format = args.output_format or detect_format(args.output)
+        output_stream = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        wan_stream = open(args.wan_links, 'w', newline='', encoding='utf-8') if args.wan_links else None
+        try:
+            count = run_routes(tables, output_stream, output_format, wan_stream)
+        finally:
+            for stream in (output_stream, wan_stream):
+                if stream not in (None, sys.stdout):
+                    stream.close()
+        
+        print(f"{count} rotas geradas para {len(tables.router_order)} roteadores", file=sys.stderr)
+        return 0
+    
+    if args.command == "lookup":
+        networks_format = args.networks_format or detect_format(args.networks)
+        with open(args.networks, 'r', newline='', encoding='utf-8') as networks_stream:
+            index = build_prefix_index(networks_stream, networks_format, sys.stderr)
+        
+        if args.address:
+            addresses = iter(args.address)
+        elif args.addresses:
+            addresses = open(args.addresses, 'r', encoding='utf-8')
+        else:
+            addresses = sys.stdin
+        output_stream = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        try:
+            found, missing = run_lookup(index, addresses, output_stream, sys.stderr)
+        finally:
+            if output_stream is not sys.stdout:
+                output_stream.close()
+            if hasattr(addresses, 'close') and addresses is not sys.stdin:
+                addresses.close()
+        
+        print(f"{found} endereços encontrados, {missing} sem rede correspondente", file=sys.stderr)
+        return 0
+    
+    if args.command == "batch":
+        import os
+        
+        workers = args.workers or os.cpu_count() or 1
+        input_format = args.input_format or detect_format(args.input)
+        output_format = args.output_format or detect_format(args.output)
+        
+        input_stream = open(args.input, 'r', newline='', encoding='utf-8') if args.input else sys.stdin
+        output_stream = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        error_stream = open(args.errors, 'w', encoding='utf-8') if args.errors else sys.stderr
+        try:
+            processed, errors = run_batch(input_stream, output_stream, error_stream,
+                                          input_format, output_format,
+                                          workers, max(1, args.chunk_size))
+        finally:
+            for stream in (input_stream, output_stream, error_stream):
+                if stream not in (sys.stdin, sys.stdout, sys.stderr):
+                    stream.close()
+        
+        print(f"{processed} redes processadas, {errors} linhas com erro", file=sys.stderr)
+        return 1 if errors else 0
+
 if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
+    
+    enable_profiling()
+    
     # Pergunta se deseja testar com exemplos ou usar modo interativo
     print("Escolha uma opção:")
     print("1 - Modo interativo (inserir dados manualmente)")
     print("2 - Testar com exemplos fornecidos")
+    print("3 - Verificar cálculo rápido contra o módulo ipaddress")
     
-    choice = input("Opção (1 ou 2): ").strip()
+    choice = input("Opção (1, 2 ou 3): ").strip()
     
     if choice == "2":
         test_examples()
+    elif choice == "3":
+        verify_fast_path()
     else:
         main()
\ No newline at end of file
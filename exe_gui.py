@@ -1,9 +1,86 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import ipaddress
-import csv
-import json
-from datetime import datetime
+from tkinter import ttk, messagebox
+import os
+import queue
+import threading
+import time
+from array import array
+
+# Só o necessário para abrir a janela é importado aqui. Arquivos (csv,
+# project_io, table_writer, diálogos de arquivo), roteamento e VLSM são
+# importados nas funções que os usam, na primeira vez que são chamadas.
+from exe import enable_profiling, normalize_mask, parse_address
+from masks import MASK_INPUT_TABLE, lookup_mask
+from network_table import TABLE_FIELDS, NetworkTable, network_key, parse_record
+from overlaps import IntervalIndex, find_overlaps
+from prefix_index import PrefixIndex, format_match
+from profiling import DEFAULT_PROFILE_FILE, PERCENTILES, PROFILER
+
+# Linhas extras renderizadas além das que cabem na janela (linha parcial no fim)
+VIEW_BUFFER = 2
+
+# Carregamento em segundo plano: redes por lote, intervalo entre verificações
+# da fila (ms) e tempo máximo gasto com lotes a cada verificação (s)
+LOAD_BATCH_SIZE = 5000
+LOAD_POLL_MS = 50
+LOAD_POLL_BUDGET = 0.05
+
+# Operações da interface medidas quando a instrumentação está ligada
+PROFILED_METHODS = ('update_routing_table', 'import_csv', 'load_project', 'save_project', 'export_csv',
+                    'export_txt', 'sort_by_column', 'apply_sort', 'render_view', 'add_network_row',
+                    'remove_selected', 'edit_selected_row', 'finish_bulk_load', 'check_overlaps')
+PROFILED_ROUTING_METHODS = ('rebuild', 'add_network', 'remove_networks', 'refresh_summaries')
+
+class BackgroundLoad:
+    """Estado de um carregamento em segundo plano (importação ou projeto)
+    
+    A thread de trabalho lê e converte as redes em lotes e os entrega à
+    interface por uma fila limitada; a interface adiciona os lotes ao modelo
+    em root.after, então a janela continua respondendo durante a leitura.
+    """
+    
+    def __init__(self, produce_records, parse=parse_record):
+        self.produce_records = produce_records
+        self.parse = parse
+        self.queue = queue.Queue(maxsize=8)
+        self.cancelled = threading.Event()
+        self.progress = 0.0
+        self.first = 0
+        self.added = 0
+        self.invalid = 0
+        self.error = None
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.work, daemon=True)
+    
+    def put(self, message):
+        """Entrega uma mensagem à interface, desistindo se houver cancelamento"""
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def work(self):
+        """Corpo da thread: converte as redes com parse e as envia em lotes"""
+        try:
+            batch, invalid = [], 0
+            for record in self.produce_records(self):
+                if self.cancelled.is_set():
+                    break
+                try:
+                    batch.append(self.parse(record))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    invalid += 1
+                if len(batch) >= LOAD_BATCH_SIZE:
+                    if not self.put(('rows', batch, invalid, self.progress)):
+                        return
+                    batch, invalid = [], 0
+            if self.put(('rows', batch, invalid, 1.0)):
+                self.put(('done',))
+        except Exception as e:
+            self.put(('error', str(e)))
 
 class NetworkCalculatorGUI:
     def __init__(self):
@@ -12,9 +89,28 @@ class NetworkCalculatorGUI:
         self.root.geometry("1400x800")
         
         # Dados das redes
-        self.networks_data = []
+        self.networks_data = NetworkTable()
+        # Índice de maior prefixo para consultar a rede de um endereço
+        self.prefix_index = PrefixIndex()
+        # Índice de intervalos (rede, broadcast) para detectar sobreposições
+        self.overlap_index = IntervalIndex()
+        # Redes em conflito: {ID: quantas outras redes se sobrepõem a ela}
+        self.conflicting_rows = {}
+        # Tabela virtual: a Treeview mostra só a janela visível de view_order
+        # (IDs das redes na ordem de exibição) a partir de view_top
+        self.view_order = array('I')
+        self.view_top = 0
+        self.visible_rows = 15
+        self.selected_rows = set()
+        # Critérios de ordenação da tabela: [(coluna, decrescente)]
+        self.sort_columns = []
         self.show_inter_router_routes = tk.BooleanVar(value=False)
         self.show_inbound_routes = tk.BooleanVar(value=False)
+        self.summarize_routes = tk.BooleanVar(value=False)
+        # Aba de roteamento e links WAN são criados no primeiro uso
+        self.routing_model = None
+        self.routing_live = False
+        self.wan_allocator = None
         self.router_colors = ['#E8F0FE', '#E6F4EA', '#FEF7E0', '#FCE8E6', '#F3E8FD', '#E0F7FA'] # Cores de fundo suaves
         
         self.setup_ui()
@@ -41,15 +137,24 @@ class NetworkCalculatorGUI:
         calculator_tab = ttk.Frame(self.notebook)
         self.notebook.add(calculator_tab, text="Calculadora de Redes")
 
-        # Aba da Tabela de Roteamento
-        routing_tab = ttk.Frame(self.notebook)
-        self.notebook.add(routing_tab, text="Tabela de Roteamento")
+        # Aba da Tabela de Roteamento: o conteúdo só é montado quando a aba
+        # é aberta pela primeira vez
+        self.routing_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.routing_tab, text="Tabela de Roteamento")
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
 
         # Configurar conteúdo da aba da calculadora
         self.setup_calculator_tab(calculator_tab)
 
-        # Configurar conteúdo da aba de roteamento
-        self.setup_routing_tab(routing_tab)
+    def on_tab_changed(self, event=None):
+        """Monta a aba de roteamento ao ser aberta"""
+        if str(self.notebook.select()) == str(self.routing_tab):
+            self.ensure_routing_tab()
+
+    def ensure_routing_tab(self):
+        """Monta a aba de roteamento se ainda não foi montada"""
+        if self.routing_model is None:
+            self.setup_routing_tab(self.routing_tab)
 
     def setup_calculator_tab(self, parent):
         """Configura o conteúdo da aba da calculadora"""
@@ -64,6 +169,13 @@ class NetworkCalculatorGUI:
 
     def setup_routing_tab(self, parent):
         """Configura a aba da tabela de roteamento"""
+        from routing import RoutingModel
+        from wan import LINK_PREFIXES
+        
+        wan = self.current_wan_allocator()
+        self.wan_pool = tk.StringVar(value=wan.pool)
+        self.wan_link_prefix = tk.StringVar(value=str(wan.link_prefix))
+        
         # Frame principal da aba
         main_frame = ttk.Frame(parent)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -72,6 +184,18 @@ class NetworkCalculatorGUI:
         wan_links_frame = ttk.LabelFrame(main_frame, text="Links WAN com Provedor (ISP)", padding=10)
         wan_links_frame.pack(fill=tk.X, padx=10, pady=10)
 
+        # Pool de onde saem os links e tamanho de cada link
+        wan_config_frame = ttk.Frame(wan_links_frame)
+        wan_config_frame.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(wan_config_frame, text="Pool WAN:").pack(side=tk.LEFT)
+        ttk.Entry(wan_config_frame, textvariable=self.wan_pool, width=18).pack(side=tk.LEFT, padx=5)
+        ttk.Label(wan_config_frame, text="Links /").pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Combobox(wan_config_frame, textvariable=self.wan_link_prefix, values=LINK_PREFIXES,
+                     width=4, state="readonly").pack(side=tk.LEFT)
+        ttk.Button(wan_config_frame, text="Aplicar Pool",
+                   command=self.apply_wan_settings).pack(side=tk.LEFT, padx=10)
+
         self.wan_links_tree = ttk.Treeview(wan_links_frame, 
                                            columns=("Roteador", "Rede de Enlace", "IP WAN (Roteador)", "Gateway (ISP)"), 
                                            show="headings", height=4)
@@ -107,6 +231,13 @@ class NetworkCalculatorGUI:
                         variable=self.show_inbound_routes, 
                         command=self.update_routing_table).pack(side=tk.LEFT, padx=5)
 
+        ttk.Checkbutton(controls_frame, text="Sumarizar Rotas (Super-redes)", 
+                        variable=self.summarize_routes, 
+                        command=self.update_routing_table).pack(side=tk.LEFT, padx=5)
+
+        self.route_count_label = ttk.Label(controls_frame, text="")
+        self.route_count_label.pack(side=tk.RIGHT, padx=5)
+
         # Treeview para a tabela de roteamento
         self.routing_tree = ttk.Treeview(routing_frame, columns=("DEPT", "SRC", "DST", "GATEWAY"), show="headings")
         
@@ -121,71 +252,62 @@ class NetworkCalculatorGUI:
         self.routing_tree.column("GATEWAY", width=150)
 
         self.routing_tree.pack(fill=tk.BOTH, expand=True)
+        
+        # As tabelas são geradas pelo botão e, a partir daí, acompanham cada
+        # rede adicionada ou removida
+        self.routing_model = RoutingModel(self.routing_tree, self.wan_links_tree, self.router_colors, wan=wan)
 
     def update_routing_table(self):
         """Atualiza a tabela de roteamento com base nas redes adicionadas"""
-        for item in self.wan_links_tree.get_children(): self.wan_links_tree.delete(item)
-        for item in self.routing_tree.get_children(): self.routing_tree.delete(item)
+        self.ensure_routing_tab()
+        self.routing_model.set_options(self.show_inbound_routes.get(), self.show_inter_router_routes.get(),
+                                       self.summarize_routes.get())
+        self.routing_model.load(self.route_networks())
+        self.routing_live = True
+        self.update_route_count_label()
+    
+    def apply_wan_settings(self):
+        """Troca o pool ou o tamanho dos links WAN, realocando todos os links"""
+        from wan import WanAllocator
+        
+        try:
+            wan = WanAllocator(self.wan_pool.get(), self.wan_link_prefix.get())
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        self.set_wan_allocator(wan)
+        if self.routing_live:
+            self.update_routing_table()
+    
+    def current_wan_allocator(self):
+        """Alocador dos links WAN, criado com o pool padrão no primeiro uso"""
+        if self.wan_allocator is None:
+            from wan import WanAllocator
             
-        if not self.networks_data: return
-
-        # 1. Gerar links WAN e preparar cores
-        routers = sorted(list(set(net.get("Roteador", "Roteador Padrão") for net in self.networks_data)))
-        wan_info, router_color_map = {}, {}
-        current_wan_ip = ipaddress.ip_address('100.0.0.0')
-
-        for i, router_name in enumerate(routers):
-            color = self.router_colors[i % len(self.router_colors)]
-            router_color_map[router_name] = color
-            self.routing_tree.tag_configure(router_name, background=color)
-
-            wan_network = ipaddress.ip_network(f"{current_wan_ip}/30")
-            isp_gateway, router_wan_ip = wan_network.network_address + 1, wan_network.network_address + 2
-            wan_info[router_name] = {'isp_gateway': isp_gateway}
-            self.wan_links_tree.insert("", tk.END, values=(router_name, str(wan_network), str(router_wan_ip), str(isp_gateway)))
-            current_wan_ip += 4
-
-        # 2. Agrupar redes por roteador
-        routers_data = {router_name: [] for router_name in routers}
-        for net in self.networks_data:
-            routers_data[net.get("Roteador", "Roteador Padrão")].append(net)
-
-        # 3. Gerar tabelas
-        for router_name in routers:
-            networks = routers_data[router_name]
-            color_tag = (router_name,)
-
-            # Tabela Interna
-            self.routing_tree.insert("", tk.END, values=(f"--- Tabela Interna: {router_name} ---", "", "", ""), tags=('header',))
-            if len(networks) > 1:
-                for src_net in networks:
-                    for dst_net in networks:
-                        if src_net == dst_net: continue
-                        entry = (f"  (INT) {src_net['Nome Host']} -> {dst_net['Nome Host']}", f"{src_net['IP Rede']}/{src_net['Máscara']}", f"{dst_net['IP Rede']}/{dst_net['Máscara']}", dst_net['Gateway'])
-                        self.routing_tree.insert("", tk.END, values=entry, tags=color_tag)
-
-            # Tabela de Entrada (WAN->LAN)
-            if self.show_inbound_routes.get() and len(routers) > 1:
-                self.routing_tree.insert("", tk.END, values=(f"--- Tabela de Entrada (WAN->LAN): {router_name} ---", "", "", ""), tags=('header',))
-                for ext_router_name, ext_networks in routers_data.items():
-                    if router_name == ext_router_name: continue
-                    for src_net in ext_networks:
-                        for dst_net in networks:
-                            entry = (f"  (IN) De {src_net['Nome Host']} ({ext_router_name}) Para {dst_net['Nome Host']}", f"{src_net['IP Rede']}/{src_net['Máscara']}", f"{dst_net['IP Rede']}/{dst_net['Máscara']}", dst_net['Gateway'])
-                            self.routing_tree.insert("", tk.END, values=entry, tags=color_tag)
-
-            # Tabela de Saída (LAN->WAN)
-            if self.show_inter_router_routes.get() and len(routers) > 1:
-                self.routing_tree.insert("", tk.END, values=(f"--- Tabela de Saída (LAN->WAN): {router_name} ---", "", "", ""), tags=('header',))
-                src_gateway = wan_info[router_name]['isp_gateway']
-                for src_net in networks:
-                    for ext_router_name, ext_networks in routers_data.items():
-                        if router_name == ext_router_name: continue
-                        for dst_net in ext_networks:
-                            entry = (f"  (OUT) De {src_net['Nome Host']} Para {dst_net['Nome Host']} ({ext_router_name})", f"{src_net['IP Rede']}/{src_net['Máscara']}", f"{dst_net['IP Rede']}/{dst_net['Máscara']}", str(src_gateway))
-                            self.routing_tree.insert("", tk.END, values=entry, tags=color_tag)
-
-        self.routing_tree.tag_configure('header', font=('Arial', 10, 'bold'), background='#ddd')
+            self.wan_allocator = WanAllocator()
+        return self.wan_allocator
+    
+    def set_wan_allocator(self, wan):
+        """Passa a usar o alocador de links WAN informado"""
+        self.wan_allocator = wan
+        if self.routing_model is not None:
+            self.routing_model.wan = wan
+            self.wan_pool.set(wan.pool)
+            self.wan_link_prefix.set(str(wan.link_prefix))
+    
+    def route_networks(self):
+        """(ID, roteador, host, início, prefixo) de cada rede do modelo"""
+        table = self.networks_data
+        for row_id, start, prefix in table.network_keys():
+            yield row_id, table.router_names[table.routers[row_id]], table.host_names[row_id], start, prefix
+    
+    def update_route_count_label(self):
+        """Mostra a contagem de rotas ao lado da contagem da tabela completa"""
+        if not self.routing_live or not self.networks_data:
+            self.route_count_label.config(text="")
+            return
+        self.route_count_label.config(text=f"Rotas: {self.routing_model.route_count} "
+                                           f"(tabela completa: {self.routing_model.full_count()})")
 
     def setup_input_frame(self, parent):
         """Configura o frame de entrada de dados"""
@@ -226,7 +348,9 @@ class NetworkCalculatorGUI:
         ttk.Button(button_frame, text="Limpar Campos", 
                   command=self.clear_fields).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(button_frame, text="Adicionar Exemplos", 
-                  command=self.add_examples).pack(side=tk.LEFT)
+                  command=self.add_examples).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(button_frame, text="Alocar Sub-Redes (VLSM)", 
+                  command=self.open_vlsm_dialog).pack(side=tk.LEFT)
     
     def setup_table_frame(self, parent):
         """Configura o frame da tabela estilo planilha"""
@@ -260,7 +384,7 @@ class NetworkCalculatorGUI:
         # Colunas visíveis inicialmente (sem as binárias)
         self.visible_columns = tuple(col for col in self.all_columns if col not in self.binary_columns)
         
-        self.tree = ttk.Treeview(tree_frame, columns=self.all_columns, show="headings", height=15)
+        self.tree = ttk.Treeview(tree_frame, columns=self.all_columns, show="headings", height=self.visible_rows)
         
         # Configurar cabeçalhos e larguras das colunas
         self.column_widths = {
@@ -280,6 +404,13 @@ class NetworkCalculatorGUI:
             "Hosts Utilizáveis": 100
         }
         
+        # Campo do modelo exibido em cada coluna
+        self.column_fields = dict(zip(self.all_columns, (
+            'Roteador', 'Nome Host', 'IP', 'Máscara', 'IP Rede', 'Gateway', 'Broadcast',
+            'IP Binario', 'Mascara Binaria', 'Binario de Rede',
+            'Numero de Sub-Redes', 'Intervalo de Subredes', 'Total de IPs', 'Hosts Utilizaveis'
+        )))
+        
         for col in self.all_columns:
             self.tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
             self.tree.column(col, width=self.column_widths.get(col, 100), minwidth=50)
@@ -290,23 +421,118 @@ class NetworkCalculatorGUI:
         # Frame para scrollbars
         scrollbar_frame = ttk.Frame(tree_frame)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        # Scrollbars (a vertical percorre o modelo, não os itens da Treeview)
+        self.v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.on_view_scroll)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
         
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
         
         # Grid layout for better scrollbars positioning
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
         
         self.tree.grid(row=0, column=0, sticky="nsew")
-        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         
+        # Destaque das redes sobrepostas ou duplicadas
+        self.tree.tag_configure('conflict', background='#F8D7DA')
+        
         # Bind para seleção
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
         self.tree.bind("<Double-1>", self.edit_selected_row)
+        # Shift+clique no cabeçalho acrescenta a coluna à ordenação
+        self.tree.bind("<Shift-Button-1>", self.on_tree_shift_click)
+        
+        # Rolagem da tabela virtual
+        self.tree.bind("<Configure>", self.on_tree_configure)
+        self.tree.bind("<MouseWheel>", self.on_tree_wheel)
+        self.tree.bind("<Button-4>", self.on_tree_wheel)
+        self.tree.bind("<Button-5>", self.on_tree_wheel)
+        self.tree.bind("<Up>", lambda event: self.move_cursor(-1))
+        self.tree.bind("<Down>", lambda event: self.move_cursor(1))
+        self.tree.bind("<Prior>", lambda event: self.move_cursor(-self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.move_cursor(self.visible_rows))
+        self.tree.bind("<Home>", lambda event: self.move_cursor(-len(self.view_order)))
+        self.tree.bind("<End>", lambda event: self.move_cursor(len(self.view_order)))
+    
+    def render_view(self):
+        """Redesenha a janela visível da tabela a partir do modelo"""
+        focus = self.tree.focus()
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        
+        total = len(self.view_order)
+        self.view_top = max(0, min(self.view_top, total - self.visible_rows))
+        end = min(total, self.view_top + self.visible_rows + VIEW_BUFFER)
+        selection = []
+        for position in range(self.view_top, end):
+            row_id = self.view_order[position]
+            tags = ('conflict',) if row_id in self.conflicting_rows else ()
+            item = self.tree.insert("", tk.END, iid=str(row_id), values=self.tree_values(self.networks_data[row_id]), tags=tags)
+            if row_id in self.selected_rows:
+                selection.append(item)
+        self.tree.selection_set(selection)
+        if focus and self.tree.exists(focus):
+            self.tree.focus(focus)
+        self.tree.yview_moveto(0)
+        
+        if total:
+            self.v_scrollbar.set(self.view_top / total, min(total, self.view_top + self.visible_rows) / total)
+        else:
+            self.v_scrollbar.set(0, 1)
+    
+    def scroll_to(self, top):
+        """Posiciona a janela visível a partir da linha top da exibição"""
+        top = max(0, min(top, len(self.view_order) - self.visible_rows))
+        if top != self.view_top:
+            self.view_top = top
+            self.render_view()
+    
+    def on_view_scroll(self, action, amount, unit=None):
+        """Comando da scrollbar vertical ("moveto" ou "scroll")"""
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.view_order)))
+        else:
+            step = int(amount) * (self.visible_rows if unit == 'pages' else 1)
+            self.scroll_to(self.view_top + step)
+    
+    def on_tree_wheel(self, event):
+        """Rolagem pela roda do mouse"""
+        self.scroll_to(self.view_top + (-3 if event.num == 4 or event.delta > 0 else 3))
+        return "break"
+    
+    def on_tree_configure(self, event):
+        """Recalcula quantas linhas cabem na Treeview quando ela muda de tamanho"""
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        if not bbox:
+            return
+        rows = max(1, (event.height - bbox[1]) // bbox[3])
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render_view()
+    
+    def move_cursor(self, step):
+        """Move a seleção pelo teclado, rolando a janela quando necessário"""
+        total = len(self.view_order)
+        if not total:
+            return "break"
+        focus = self.tree.focus()
+        position = self.view_top + self.tree.index(focus) if focus else self.view_top
+        position = max(0, min(position + step, total - 1))
+        
+        if position < self.view_top:
+            self.view_top = position
+        elif position >= self.view_top + self.visible_rows:
+            self.view_top = position - self.visible_rows + 1
+        row_id = self.view_order[position]
+        self.selected_rows = {row_id}
+        self.render_view()
+        self.tree.focus(str(row_id))
+        self.fill_fields(row_id)
+        return "break"
     
     def setup_action_frame(self, parent):
         """Configura o frame de ações"""
@@ -326,6 +552,16 @@ class NetworkCalculatorGUI:
         ttk.Button(row1_frame, text="Limpar Tabela", 
                   command=self.clear_table).pack(side=tk.LEFT, padx=(0, 5))
         
+        ttk.Button(row1_frame, text="Consultar Endereços", 
+                  command=self.open_lookup_dialog).pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Button(row1_frame, text="Verificar Sobreposições", 
+                  command=self.check_overlaps).pack(side=tk.LEFT, padx=(0, 5))
+        
+        if PROFILER.enabled:
+            ttk.Button(row1_frame, text="Desempenho", 
+                      command=self.open_profile_dialog).pack(side=tk.LEFT, padx=(0, 5))
+        
         # Segunda linha de botões
         row2_frame = ttk.Frame(action_frame)
         row2_frame.pack(fill=tk.X)
@@ -361,7 +597,7 @@ class NetworkCalculatorGUI:
             
             # Normalizar a máscara (aceita CIDR ou formato tradicional)
             try:
-                normalized_mask = self.normalize_mask(mask)
+                normalized_mask = self.normalize_mask(mask, ip)
             except ValueError as e:
                 messagebox.showerror("Erro", str(e))
                 return
@@ -371,34 +607,231 @@ class NetworkCalculatorGUI:
             result['Roteador'] = router
             
             # Adicionar à tabela
-            values = (
-                result['Roteador'],
-                result['Nome Host'],
-                result['IP'],
-                result['Máscara'],
-                result['IP Rede'],
-                result['Gateway'],
-                result.get('Broadcast', ''),
-                result['IP Binario'],
-                result['Mascara Binaria'],
-                result['Binario de Rede'],
-                result['Numero de Sub-Redes'],
-                result['Intervalo de Subredes'],
-                result['Total de IPs'],
-                result['Hosts Utilizaveis']
-            )
-            
-            self.tree.insert("", tk.END, values=values)
-            self.networks_data.append(result)
+            conflicts = self.add_network_row(result)
             
             # Limpar campos após adicionar
             self.clear_fields()
             
-            messagebox.showinfo("Sucesso", "Rede adicionada com sucesso!")
+            if conflicts:
+                described = ", ".join(self.describe_row(key) for _, _, key in conflicts[:5])
+                messagebox.showwarning("Aviso", f"Rede adicionada, mas ela se sobrepõe a: {described}")
+            else:
+                messagebox.showinfo("Sucesso", "Rede adicionada com sucesso!")
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao processar rede: {str(e)}")
     
+    def add_network_row(self, record):
+        """Adiciona uma rede ao modelo, à tabela e aos índices
+        
+        Retorna os blocos (início, prefixo, linha) já existentes que se
+        sobrepõem à nova rede; eles e a nova linha ficam destacados.
+        """
+        network = self.networks_data.append(record)
+        row_id = network.index
+        start, prefix = network_key(network)
+        self.prefix_index.insert(start, prefix, (network['Roteador'], network['Nome Host']))
+        
+        conflicts = self.overlap_index.overlapping(start, prefix)
+        self.overlap_index.insert(start, prefix, row_id)
+        if conflicts:
+            self.conflicting_rows[row_id] = len(conflicts)
+            for _, _, key in conflicts:
+                self.conflicting_rows[key] = self.conflicting_rows.get(key, 0) + 1
+        
+        self.view_order.append(row_id)
+        self.render_view()
+        if self.routing_live:
+            self.routing_model.add_network(row_id, network['Roteador'], network['Nome Host'], start, prefix)
+            self.update_route_count_label()
+        return conflicts
+    
+    def append_parsed_rows(self, rows):
+        """Adiciona redes já convertidas por parse_record ao modelo
+        
+        O índice de sobreposições não é atualizado aqui: em cargas grandes ele
+        é reconstruído uma única vez no fim (veja finish_bulk_load).
+        """
+        first = self.networks_data.next_id
+        for row in rows:
+            network = self.networks_data.add(*row)
+            start, prefix = network_key(network)
+            self.prefix_index.insert(start, prefix, (row[0], row[1]))
+        self.view_order.extend(range(first, self.networks_data.next_id))
+    
+    def finish_bulk_load(self, first):
+        """Reconstrói as sobreposições após uma carga em lote a partir do
+        ID first; retorna quantas redes novas estão em conflito"""
+        self.rebuild_overlaps()
+        if self.sort_columns:
+            self.apply_sort()
+        else:
+            self.render_view()
+        if self.routing_live:
+            self.update_routing_table()
+        return sum(1 for row_id in self.conflicting_rows if row_id >= first)
+    
+    def start_background_load(self, title, produce_records, finish, parse=parse_record):
+        """Carrega redes em segundo plano com barra de progresso e cancelamento
+        
+        produce_records(load) roda na thread de trabalho, gera registros que
+        parse converte nos argumentos de NetworkTable.add (por padrão,
+        dicionários no formato da calculadora) e pode atualizar
+        load.progress (0 a 1). finish(load, conflict_count) é chamada na
+        interface ao terminar.
+        """
+        load = BackgroundLoad(produce_records, parse)
+        load.first = self.networks_data.next_id
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title(title)
+        dialog.geometry("400x140")
+        dialog.transient(self.root)
+        
+        ttk.Label(dialog, text=title + "...").pack(anchor=tk.W, padx=10, pady=(10, 5))
+        progress_bar = ttk.Progressbar(dialog, mode='determinate', maximum=100)
+        progress_bar.pack(fill=tk.X, padx=10)
+        count_label = ttk.Label(dialog, text="0 redes carregadas")
+        count_label.pack(anchor=tk.W, padx=10, pady=5)
+        ttk.Button(dialog, text="Cancelar", command=load.cancelled.set).pack(anchor=tk.E, padx=10, pady=(0, 10))
+        dialog.protocol("WM_DELETE_WINDOW", load.cancelled.set)
+        # Evita edições na tabela enquanto as linhas chegam
+        dialog.grab_set()
+        
+        load.dialog, load.progress_bar, load.count_label, load.finish = dialog, progress_bar, count_label, finish
+        load.title = title
+        load.thread.start()
+        self.root.after(LOAD_POLL_MS, self.poll_background_load, load)
+    
+    def poll_background_load(self, load):
+        """Adiciona os lotes prontos ao modelo e atualiza o progresso"""
+        deadline = time.perf_counter() + LOAD_POLL_BUDGET
+        finished = False
+        while time.perf_counter() < deadline:
+            try:
+                message = load.queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if message[0] == 'rows':
+                _, rows, invalid, load.progress = message
+                self.append_parsed_rows(rows)
+                load.added += len(rows)
+                load.invalid += invalid
+            else:
+                if message[0] == 'error':
+                    load.error = message[1]
+                finished = True
+                break
+        
+        if load.cancelled.is_set() and not load.thread.is_alive():
+            finished = True
+        
+        if not finished:
+            load.progress_bar['value'] = load.progress * 100
+            load.count_label.config(text=f"{load.added} redes carregadas")
+            self.render_view()
+            self.root.after(LOAD_POLL_MS, self.poll_background_load, load)
+            return
+        
+        load.dialog.grab_release()
+        load.dialog.destroy()
+        conflict_count = self.finish_bulk_load(load.first)
+        if PROFILER.enabled:
+            # Duração da carga inteira, da leitura na thread ao último lote
+            PROFILER.record(f"{load.title} (segundo plano)", time.perf_counter() - load.started)
+        load.finish(load, conflict_count)
+    
+    def remove_network_rows(self, row_ids):
+        """Remove as redes com os IDs indicados do modelo e dos índices
+        
+        Cada remoção custa O(1) no modelo e uma busca nos índices; a ordem de
+        exibição é filtrada uma única vez no fim.
+        """
+        removed = [row_id for row_id in set(row_ids) if row_id in self.networks_data]
+        blocks = []
+        for row_id in removed:
+            network = self.networks_data[row_id]
+            start, prefix = network_key(network)
+            self.prefix_index.remove(start, prefix, (network['Roteador'], network['Nome Host']))
+            blocks.append((start, prefix, row_id))
+            del self.networks_data[row_id]
+        self.overlap_index.remove_many(blocks)
+        
+        # Redes que só conflitavam com as removidas deixam de ser destacadas
+        for start, prefix, row_id in blocks:
+            if self.conflicting_rows.pop(row_id, 0):
+                for _, _, other in self.overlap_index.overlapping(start, prefix):
+                    if self.conflicting_rows[other] > 1:
+                        self.conflicting_rows[other] -= 1
+                    else:
+                        del self.conflicting_rows[other]
+        
+        alive = self.networks_data.alive
+        self.view_order = array('I', [row_id for row_id in self.view_order if alive[row_id]])
+        self.selected_rows.difference_update(removed)
+        self.render_view()
+        if self.routing_live:
+            self.routing_model.remove_networks(removed)
+            self.update_route_count_label()
+    
+    def rebuild_overlaps(self):
+        """Reconstrói o índice de sobreposições e as linhas em conflito"""
+        self.overlap_index.load((start, prefix, row_id) for row_id, start, prefix in self.networks_data.network_keys())
+        self.count_conflicts(find_overlaps((start, prefix, key) for start, _, prefix, key in self.overlap_index.blocks))
+    
+    def count_conflicts(self, pairs):
+        """Recalcula conflicting_rows a partir dos pares sobrepostos"""
+        counts = {}
+        for outer, inner in pairs:
+            counts[outer] = counts.get(outer, 0) + 1
+            counts[inner] = counts.get(inner, 0) + 1
+        self.conflicting_rows = counts
+    
+    def describe_row(self, row_id):
+        """Descrição curta (host e rede) de uma linha do modelo"""
+        network = self.networks_data[row_id]
+        mask = network['Máscara']
+        if ':' in mask:
+            # No IPv6 o comprimento do prefixo é mais legível que a máscara
+            mask = network_key(network)[1]
+        return f"{network['Nome Host']} ({network['IP Rede']}/{mask})"
+    
+    def check_overlaps(self):
+        """Verifica sobreposições em toda a tabela de uma só vez"""
+        pairs = list(find_overlaps((start, prefix, key) for start, _, prefix, key in self.overlap_index.blocks))
+        self.count_conflicts(pairs)
+        self.render_view()
+        
+        if not pairs:
+            messagebox.showinfo("Sobreposições", "Nenhuma rede sobreposta ou duplicada.")
+            return
+        
+        lines = [f"{self.describe_row(outer)} contém {self.describe_row(inner)}" for outer, inner in pairs[:15]]
+        if len(pairs) > 15:
+            lines.append(f"... e mais {len(pairs) - 15} conflitos")
+        messagebox.showwarning("Sobreposições",
+                               f"{len(pairs)} conflitos em {len(self.conflicting_rows)} redes (destacadas na tabela):\n\n" + "\n".join(lines))
+    
+    def tree_values(self, network):
+        """Valores de uma rede na ordem das colunas da tabela"""
+        return (
+            network['Roteador'],
+            network['Nome Host'],
+            network['IP'],
+            network['Máscara'],
+            network['IP Rede'],
+            network['Gateway'],
+            network['Broadcast'],
+            network['IP Binario'],
+            network['Mascara Binaria'],
+            network['Binario de Rede'],
+            network['Numero de Sub-Redes'],
+            network['Intervalo de Subredes'],
+            network['Total de IPs'],
+            network['Hosts Utilizaveis']
+        )
+    
     def clear_fields(self):
         """Limpa os campos de entrada"""
         self.host_entry.delete(0, tk.END)
@@ -418,29 +851,11 @@ class NetworkCalculatorGUI:
         
         try:
             for router, host_name, ip, mask, network_ip in examples:
-                normalized_mask = self.normalize_mask(mask)
+                normalized_mask = self.normalize_mask(mask, ip)
                 result = self.calculator.process_network_entry(host_name, ip, normalized_mask, network_ip)
                 result['Roteador'] = router
                 
-                values = (
-                    result['Roteador'],
-                    result['Nome Host'],
-                    result['IP'],
-                    result['Máscara'],
-                    result['IP Rede'],
-                    result['Gateway'],
-                    result.get('Broadcast', ''),
-                    result['IP Binario'],
-                    result['Mascara Binaria'],
-                    result['Binario de Rede'],
-                    result['Numero de Sub-Redes'],
-                    result['Intervalo de Subredes'],
-                    result['Total de IPs'],
-                    result['Hosts Utilizaveis']
-                )
-                
-                self.tree.insert("", tk.END, values=values)
-                self.networks_data.append(result)
+                self.add_network_row(result)
             
             messagebox.showinfo("Sucesso", "Exemplos adicionados com sucesso!")
             
@@ -449,92 +864,244 @@ class NetworkCalculatorGUI:
     
     def remove_selected(self):
         """Remove o item selecionado da tabela"""
-        selected = self.tree.selection()
-        if not selected:
+        if not self.selected_rows:
             messagebox.showwarning("Aviso", "Selecione um item para remover!")
             return
         
         if messagebox.askyesno("Confirmar", "Deseja remover o item selecionado?"):
-            for item in selected:
-                index = self.tree.index(item)
-                self.tree.delete(item)
-                if 0 <= index < len(self.networks_data):
-                    del self.networks_data[index]
+            self.remove_network_rows(self.selected_rows)
     
     def clear_table(self):
-        """Limpa toda a tabela"""
-        if messagebox.askyesno("Confirmar", "Deseja limpar toda a tabela?"):
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            self.networks_data.clear()
+        """Limpa toda a tabela; retorna False se o usuário não confirmar"""
+        if not messagebox.askyesno("Confirmar", "Deseja limpar toda a tabela?"):
+            return False
+        self.networks_data.clear()
+        self.prefix_index.clear()
+        self.overlap_index.clear()
+        self.conflicting_rows.clear()
+        self.view_order = array('I')
+        self.view_top = 0
+        self.selected_rows.clear()
+        self.render_view()
+        if self.routing_live:
+            self.routing_model.clear()
+            self.update_route_count_label()
+        return True
     
     def on_tree_select(self, event):
         """Callback para seleção na tabela"""
+        # A seleção fica no modelo: linhas selecionadas fora da janela visível
+        # continuam selecionadas enquanto o usuário só rola a tabela
+        window = set(self.view_order[self.view_top:self.view_top + self.visible_rows + VIEW_BUFFER])
+        visible = {int(item) for item in self.tree.selection()}
+        if visible == self.selected_rows & window:
+            return
+        self.selected_rows = visible
+        
         selected = self.tree.selection()
         if selected:
-            item = self.tree.item(selected[0])
-            values = item['values']
-            
-            self.clear_fields()
-
-            if len(values) > 4:
-                self.router_entry.insert(0, values[0])
-                self.host_entry.insert(0, values[1])
-                self.ip_entry.insert(0, values[2])
-                self.mask_entry.insert(0, values[3])
-                self.network_entry.insert(0, values[4])
+            self.fill_fields(int(selected[0]))
+    
+    def fill_fields(self, row_id):
+        """Preenche os campos de entrada com uma rede do modelo"""
+        network = self.networks_data[row_id]
+        self.clear_fields()
+        self.router_entry.insert(0, network['Roteador'])
+        self.host_entry.insert(0, network['Nome Host'])
+        self.ip_entry.insert(0, network['IP'])
+        self.mask_entry.insert(0, network['Máscara'])
+        self.network_entry.insert(0, network['IP Rede'])
+    
+    def first_selected_row(self):
+        """Linha selecionada que aparece primeiro na tabela"""
+        selected = self.tree.selection()
+        if selected:
+            return int(selected[0])
+        return min(self.selected_rows)
     
     def edit_selected_row(self, event=None):
         """Permite editar a linha selecionada"""
-        selected = self.tree.selection()
-        if not selected:
+        if not self.selected_rows:
             messagebox.showwarning("Aviso", "Selecione um item para editar!")
             return
         
-        self.on_tree_select(None)
+        row_id = self.first_selected_row()
+        self.fill_fields(row_id)
 
         if messagebox.askyesno("Editar", "Os campos foram preenchidos com os dados selecionados.\nDeseja substituir este item pelos novos dados?"):
-            item = selected[0]
-            index = self.tree.index(item)
-            self.tree.delete(item)
-            if 0 <= index < len(self.networks_data):
-                del self.networks_data[index]
+            self.remove_network_rows([row_id])
             
             self.add_network()
     
-    def cidr_to_netmask(self, cidr):
-        """Converte notação CIDR para máscara de sub-rede"""
-        if isinstance(cidr, str) and cidr.startswith('/'):
-            cidr = cidr[1:]
+    def open_vlsm_dialog(self):
+        """Abre a janela de alocação VLSM a partir de um bloco pai"""
+        from vlsm import allocate_networks
         
-        try:
-            cidr_int = int(cidr)
-            if not 0 <= cidr_int <= 32:
-                raise ValueError("CIDR deve estar entre 0 e 32")
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Alocar Sub-Redes (VLSM)")
+        dialog.geometry("500x450")
+        
+        parent_frame = ttk.Frame(dialog)
+        parent_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Label(parent_frame, text="Bloco pai (ex.: 10.0.0.0/16):").pack(side=tk.LEFT)
+        parent_entry = ttk.Entry(parent_frame, width=20)
+        parent_entry.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(dialog, text="Uma rede por linha: Nome;Hosts;Roteador (roteador opcional)").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        requirements_text = tk.Text(dialog, height=15)
+        requirements_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        def run_allocation():
+            requirements = []
+            for line_number, line in enumerate(requirements_text.get("1.0", tk.END).splitlines(), start=1):
+                if not line.strip():
+                    continue
+                parts = [part.strip() for part in line.replace(',', ';').split(';')]
+                if len(parts) < 2 or not parts[0] or not parts[1].isdigit():
+                    messagebox.showerror("Erro", f"Linha {line_number} inválida: {line}", parent=dialog)
+                    return
+                requirements.append((parts[0], int(parts[1]), parts[2] if len(parts) > 2 else ""))
             
-            mask_bits = '1' * cidr_int + '0' * (32 - cidr_int)
+            if not requirements:
+                messagebox.showwarning("Aviso", "Informe ao menos uma rede!", parent=dialog)
+                return
             
-            octets = []
-            for i in range(0, 32, 8):
-                octet_bits = mask_bits[i:i+8]
-                octets.append(str(int(octet_bits, 2)))
+            try:
+                results = allocate_networks(self.calculator, parent_entry.get().strip(), requirements)
+            except ValueError as e:
+                messagebox.showerror("Erro", str(e), parent=dialog)
+                return
             
-            return '.'.join(octets)
-        except ValueError:
-            raise ValueError(f"Formato CIDR inválido: /{cidr}")
+            # Mesmo caminho das importações: uma renderização, uma reconstrução
+            # das sobreposições e uma atualização das rotas para todo o lote
+            first = self.networks_data.next_id
+            self.append_parsed_rows([parse_record(result) for result in results])
+            conflict_count = self.finish_bulk_load(first)
+            
+            message = f"{len(results)} sub-redes alocadas em {parent_entry.get().strip()}"
+            if conflict_count:
+                message += f"\n{conflict_count} delas se sobrepõem a redes já existentes (destacadas na tabela)"
+            messagebox.showinfo("Sucesso", message)
+            dialog.destroy()
+        
+        ttk.Button(dialog, text="Alocar", command=run_allocation).pack(anchor=tk.E, padx=10, pady=(0, 10))
     
-    def normalize_mask(self, mask):
-        """Normaliza a máscara de entrada (aceita CIDR ou formato tradicional)"""
-        mask = mask.strip()
+    def open_lookup_dialog(self):
+        """Abre a janela de consulta de endereços (maior prefixo correspondente)"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Consultar Endereços")
+        dialog.geometry("700x500")
         
-        if mask.startswith('/') or mask.isdigit():
-            return self.cidr_to_netmask(mask)
+        ttk.Label(dialog, text="Endereços IP (um por linha):").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        addresses_text = tk.Text(dialog, height=8)
+        addresses_text.pack(fill=tk.X, padx=10, pady=5)
         
-        try:
-            ipaddress.IPv4Address(mask)
-            return mask
-        except ipaddress.AddressValueError:
-            raise ValueError(f"Máscara inválida: {mask}")
+        columns = ("Endereço", "Rede", "Roteador", "Nome Host")
+        results_tree = ttk.Treeview(dialog, columns=columns, show="headings")
+        for col in columns:
+            results_tree.heading(col, text=col)
+            results_tree.column(col, width=150)
+        
+        status_label = ttk.Label(dialog, text="")
+        
+        def run_lookup():
+            for item in results_tree.get_children():
+                results_tree.delete(item)
+            
+            addresses = [line.strip() for line in addresses_text.get("1.0", tk.END).splitlines() if line.strip()]
+            valid, invalid = [], []
+            for address in addresses:
+                try:
+                    parse_address(address)
+                    valid.append(address)
+                except ValueError:
+                    invalid.append(address)
+            
+            found = 0
+            for address, match in zip(valid, self.prefix_index.lookup_many(valid)):
+                if match is None:
+                    results_tree.insert("", tk.END, values=(address, "Nenhuma rede", "", ""))
+                else:
+                    router, host_name = match[2]
+                    results_tree.insert("", tk.END, values=(address, format_match(match), router, host_name))
+                    found += 1
+            for address in invalid:
+                results_tree.insert("", tk.END, values=(address, "Endereço inválido", "", ""))
+            
+            status_label.config(text=f"{found} de {len(addresses)} endereços pertencem a redes da tabela")
+        
+        ttk.Button(dialog, text="Consultar", command=run_lookup).pack(anchor=tk.W, padx=10)
+        results_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        status_label.pack(anchor=tk.W, padx=10, pady=(0, 10))
+    
+    def open_profile_dialog(self):
+        """Abre a janela com as medições de desempenho das operações"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Desempenho")
+        dialog.geometry("900x400")
+        
+        columns = ("Operação", "Chamadas", "Total (s)", "Média (ms)") + tuple(f"p{percent} (ms)" for percent in PERCENTILES) + ("Máx (ms)",)
+        stats_tree = ttk.Treeview(dialog, columns=columns, show="headings")
+        for col in columns:
+            stats_tree.heading(col, text=col)
+            stats_tree.column(col, width=260 if col == "Operação" else 80, anchor=tk.W if col == "Operação" else tk.E)
+        
+        def refresh():
+            children = stats_tree.get_children()
+            if children:
+                stats_tree.delete(*children)
+            for row in PROFILER.stats():
+                values = [row['operation'], row['count'], f"{row['total']:.3f}", f"{row['mean'] * 1000:.2f}"]
+                values.extend(f"{row[f'p{percent}'] * 1000:.2f}" for percent in PERCENTILES)
+                values.append(f"{row['max'] * 1000:.2f}")
+                stats_tree.insert("", tk.END, values=values)
+        
+        def save():
+            from tkinter import filedialog
+            
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".json",
+                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                title="Salvar Medições"
+            )
+            if filename:
+                try:
+                    PROFILER.write_json(filename)
+                except OSError as e:
+                    messagebox.showerror("Erro", f"Erro ao salvar medições: {str(e)}")
+                    return
+                messagebox.showinfo("Sucesso", f"Medições salvas em {filename}")
+        
+        def reset():
+            PROFILER.reset()
+            refresh()
+        
+        buttons_frame = ttk.Frame(dialog)
+        buttons_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Button(buttons_frame, text="Atualizar", command=refresh).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(buttons_frame, text="Zerar", command=reset).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(buttons_frame, text="Salvar JSON", command=save).pack(side=tk.LEFT)
+        stats_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        refresh()
+    
+    def cidr_to_netmask(self, cidr):
+        """Converte notação CIDR para máscara de sub-rede"""
+        if isinstance(cidr, str) and cidr.startswith('/'):
+            cidr = cidr[1:]
+        
+        info = MASK_INPUT_TABLE.get(str(cidr))
+        if info is None:
+            raise ValueError(f"Formato CIDR inválido: /{cidr}")
+        return info.mask
+    
+    def normalize_mask(self, mask, ip=None):
+        """Normaliza a máscara de entrada (aceita CIDR ou formato tradicional;
+        no IPv6, prefixo de 0 a 128 ou máscara IPv6)"""
+        if ip is not None and ':' in ip:
+            return normalize_mask(mask, ip)
+        # Consulta direta à tabela de máscaras; máscaras não contíguas não
+        # estão na tabela e são rejeitadas aqui mesmo
+        return lookup_mask(mask).mask
     
     def toggle_binary_columns(self):
         """Alterna a visibilidade das colunas binárias"""
@@ -547,20 +1114,53 @@ class NetworkCalculatorGUI:
             self.toggle_binary_btn.config(text="Ocultar Colunas Binárias")
             self.binary_columns_visible = True
     
-    def sort_by_column(self, col):
-        """Ordena a tabela por coluna"""
-        data = [(self.tree.set(item, col), item) for item in self.tree.get_children()]
+    def sort_by_column(self, col, add=False):
+        """Ordena a tabela por coluna
         
-        try:
-            data.sort(key=lambda x: float(x[0].replace('.', '').replace('-', '').replace(' ', '')[:10]))
-        except:
-            data.sort()
+        Clicar de novo na coluna principal inverte o sentido; com add=True
+        (Shift+clique) a coluna entra como critério de desempate, ou tem o
+        sentido invertido se já fizer parte da ordenação.
+        """
+        columns = [column for column, _ in self.sort_columns]
+        if col in columns and (add or columns.index(col) == 0):
+            position = columns.index(col)
+            self.sort_columns[position] = (col, not self.sort_columns[position][1])
+        elif add:
+            self.sort_columns.append((col, False))
+        else:
+            self.sort_columns = [(col, False)]
+        self.apply_sort()
+    
+    def apply_sort(self):
+        """Reordena a exibição pelos critérios atuais de uma só vez"""
+        fields = [(self.column_fields[col], descending) for col, descending in self.sort_columns]
+        self.view_order = array('I', self.networks_data.sorted_ids(fields))
         
-        for index, (val, item) in enumerate(data):
-            self.tree.move(item, '', index)
+        for col in self.all_columns:
+            self.tree.heading(col, text=col)
+        for position, (col, descending) in enumerate(self.sort_columns, start=1):
+            arrow = "▼" if descending else "▲"
+            suffix = f" {arrow}{position}" if len(self.sort_columns) > 1 else f" {arrow}"
+            self.tree.heading(col, text=col + suffix)
+        self.render_view()
+    
+    def on_tree_shift_click(self, event):
+        """Shift+clique no cabeçalho: ordenação por várias colunas"""
+        if self.tree.identify_region(event.x, event.y) != 'heading':
+            return None
+        column = self.tree.identify_column(event.x)
+        displayed = self.all_columns if self.binary_columns_visible else self.visible_columns
+        position = int(column.lstrip('#')) - 1
+        if 0 <= position < len(displayed):
+            self.sort_by_column(displayed[position], add=True)
+        return "break"
     
     def export_csv(self):
-        """Exporta dados para CSV"""
+        """Exporta dados para CSV (compactado com gzip se o nome terminar em .gz)"""
+        from tkinter import filedialog
+        
+        from table_writer import open_output, write_csv
+        
         try:
             if not self.networks_data:
                 messagebox.showwarning("Aviso", "Não há dados para exportar!")
@@ -568,18 +1168,13 @@ class NetworkCalculatorGUI:
             
             filename = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                filetypes=[("CSV files", "*.csv"), ("CSV compactado", "*.csv.gz"), ("All files", "*.*")],
                 title="Salvar como CSV"
             )
             
             if filename:
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = list(self.networks_data[0].keys())
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    writer.writeheader()
-                    for network in self.networks_data:
-                        writer.writerow(network)
+                with open_output(filename, newline='') as csvfile:
+                    write_csv(csvfile, TABLE_FIELDS, self.networks_data.values(TABLE_FIELDS))
                 
                 messagebox.showinfo("Sucesso", f"Dados exportados para {filename}")
         
@@ -587,7 +1182,13 @@ class NetworkCalculatorGUI:
             messagebox.showerror("Erro", f"Erro ao exportar CSV: {str(e)}")
     
     def export_txt(self):
-        """Exporta dados para TXT formatado"""
+        """Exporta dados para TXT formatado (compactado com gzip se o nome
+        terminar em .gz)"""
+        from datetime import datetime
+        from tkinter import filedialog
+        
+        from table_writer import open_output, write_fixed_width
+        
         try:
             if not self.networks_data:
                 messagebox.showwarning("Aviso", "Não há dados para exportar!")
@@ -595,31 +1196,22 @@ class NetworkCalculatorGUI:
             
             filename = filedialog.asksaveasfilename(
                 defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+                filetypes=[("Text files", "*.txt"), ("Texto compactado", "*.txt.gz"), ("All files", "*.*")],
                 title="Salvar como TXT"
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
+                with open_output(filename) as f:
                     f.write("CALCULADORA DE REDES - RELATÓRIO\n")
                     f.write("="*80 + "\n")
                     f.write(f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
                     f.write(f"Total de redes: {len(self.networks_data)}\n\n")
                     
-                    headers = list(self.networks_data[0].keys())
-                    
-                    col_widths = {}
-                    for header in headers:
-                        col_widths[header] = max(len(header), 
-                                               max(len(str(network.get(header, ''))) for network in self.networks_data))
-                    
-                    header_line = " | ".join(header.ljust(col_widths[header]) for header in headers)
-                    f.write(header_line + "\n")
-                    f.write("-" * len(header_line) + "\n")
-                    
-                    for network in self.networks_data:
-                        row = " | ".join(str(network.get(header, '')).ljust(col_widths[header]) for header in headers)
-                        f.write(row + "\n")
+                    # Larguras conhecidas de antemão: uma única passada pelas redes
+                    prefixes, prefixes6 = self.networks_data.prefix_sets()
+                    write_fixed_width(f, TABLE_FIELDS, self.networks_data.values(TABLE_FIELDS),
+                                      prefixes=prefixes, text_widths=self.networks_data.text_widths(),
+                                      prefixes6=prefixes6)
                     
                     f.write("\n" + "="*80)
                 
@@ -630,6 +1222,9 @@ class NetworkCalculatorGUI:
     
     def import_csv(self):
         """Importa dados de CSV"""
+        import csv
+        from tkinter import filedialog
+        
         try:
             filename = filedialog.askopenfilename(
                 filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
@@ -637,59 +1232,57 @@ class NetworkCalculatorGUI:
             )
             
             if filename:
-                with open(filename, 'r', encoding='utf-8') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    imported_count = 0
-                    
-                    for row in reader:
-                        if 'Nome Host' in row and 'IP' in row and 'Máscara' in row:
-                            values = (
-                                row.get('Roteador', ''),
-                                row.get('Nome Host', ''),
-                                row.get('IP', ''),
-                                row.get('Máscara', ''),
-                                row.get('IP Rede', ''),
-                                row.get('Gateway', ''),
-                                row.get('Broadcast', ''),
-                                row.get('IP Binario', ''),
-                                row.get('Mascara Binaria', ''),
-                                row.get('Binario de Rede', ''),
-                                row.get('Numero de Sub-Redes', ''),
-                                row.get('Intervalo de Subredes', ''),
-                                row.get('Total de IPs', ''),
-                                row.get('Hosts Utilizaveis', '')
-                            )
-                            
-                            self.tree.insert("", tk.END, values=values)
-                            self.networks_data.append(dict(row))
-                            imported_count += 1
+                def read_rows(load):
+                    with open(filename, 'r', encoding='utf-8') as csvfile:
+                        size = os.fstat(csvfile.fileno()).st_size or 1
+                        reader = csv.DictReader(csvfile)
+                        for row_number, row in enumerate(reader):
+                            if row_number % 1000 == 0:
+                                load.progress = csvfile.buffer.tell() / size
+                            if 'Nome Host' in row and 'IP' in row and 'Máscara' in row:
+                                yield row
                 
-                messagebox.showinfo("Sucesso", f"{imported_count} redes importadas de {filename}")
+                def finish(load, conflict_count):
+                    if load.error:
+                        messagebox.showerror("Erro", f"Erro ao importar CSV: {load.error}")
+                        return
+                    if load.invalid:
+                        messagebox.showwarning("Aviso", f"{load.invalid} linhas com IP ou máscara inválidos foram ignoradas")
+                    if conflict_count:
+                        messagebox.showwarning("Aviso", f"{conflict_count} redes importadas se sobrepõem a outras redes (destacadas na tabela)")
+                    if load.cancelled.is_set():
+                        messagebox.showinfo("Cancelado", f"Importação cancelada: {load.added} redes importadas de {filename}")
+                    else:
+                        messagebox.showinfo("Sucesso", f"{load.added} redes importadas de {filename}")
+                
+                self.start_background_load("Importando CSV", read_rows, finish)
         
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao importar CSV: {str(e)}")
     
     def save_project(self):
-        """Salva projeto em JSON"""
+        """Salva projeto no formato de linhas (veja project_io)"""
+        from tkinter import filedialog
+        
+        from project_io import write_project
+        
         try:
             if not self.networks_data:
                 messagebox.showwarning("Aviso", "Não há dados para salvar!")
                 return
             
             filename = filedialog.asksaveasfilename(
-                defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                defaultextension=".jsonl",
+                filetypes=[("Projetos", "*.jsonl"), ("All files", "*.*")],
                 title="Salvar Projeto"
             )
             
             if filename:
-                project_data = {
-                    'created': datetime.now().isoformat(),
-                    'networks': self.networks_data
-                }
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(project_data, f, indent=2, ensure_ascii=False)
+                # Links WAN de todos os roteadores, mesmo sem as tabelas geradas
+                wan = self.current_wan_allocator()
+                wan.sync(sorted(self.networks_data.active_routers()))
+                with open(filename, 'w', encoding='utf-8', newline='\n') as f:
+                    write_project(f, self.networks_data.records(), wan=wan.to_dict())
                 
                 messagebox.showinfo("Sucesso", f"Projeto salvo em {filename}")
         
@@ -697,44 +1290,82 @@ class NetworkCalculatorGUI:
             messagebox.showerror("Erro", f"Erro ao salvar projeto: {str(e)}")
     
     def load_project(self):
-        """Carrega projeto de JSON"""
+        """Carrega projeto no formato de linhas ou no JSON antigo"""
+        from tkinter import filedialog
+        
+        from project_io import iter_json_networks, iter_project_lines, parse_project_line, read_project_header
+        from wan import WanAllocator
+        
         try:
             filename = filedialog.askopenfilename(
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                filetypes=[("Projetos", "*.jsonl *.json"), ("All files", "*.*")],
                 title="Carregar Projeto"
             )
             
             if filename:
                 with open(filename, 'r', encoding='utf-8') as f:
-                    project_data = json.load(f)
+                    header = read_project_header(f.readline())
+                
+                def finish(load, conflict_count):
+                    if load.error:
+                        messagebox.showerror("Erro", f"Erro ao carregar projeto: {load.error}")
+                        return
+                    if load.invalid:
+                        messagebox.showwarning("Aviso", f"{load.invalid} redes com IP ou máscara inválidos foram ignoradas")
+                    if conflict_count:
+                        messagebox.showwarning("Aviso", f"{conflict_count} redes do projeto se sobrepõem a outras redes (destacadas na tabela)")
+                    if load.cancelled.is_set():
+                        messagebox.showinfo("Cancelado", f"Carregamento cancelado: {load.added} redes carregadas de {filename}")
+                    else:
+                        messagebox.showinfo("Sucesso", f"Projeto carregado de {filename}")
                 
-                if 'networks' in project_data:
-                    self.clear_table()
+                if header is not None:
+                    # Projetos sem links WAN recebem links novos do pool atual
+                    if 'wan' in header:
+                        wan = WanAllocator.from_dict(header['wan'])
+                    else:
+                        current = self.current_wan_allocator()
+                        wan = WanAllocator(current.pool, current.link_prefix)
+                    # Recusada a limpeza, as redes atuais continuam com os links WAN atuais
+                    if not self.clear_table():
+                        return
+                    self.set_wan_allocator(wan)
                     
-                    for network in project_data['networks']:
-                        values = (
-                            network.get('Roteador', ''),
-                            network.get('Nome Host', ''),
-                            network.get('IP', ''),
-                            network.get('Máscara', ''),
-                            network.get('IP Rede', ''),
-                            network.get('Gateway', ''),
-                            network.get('Broadcast', ''),
-                            network.get('IP Binario', ''),
-                            network.get('Mascara Binaria', ''),
-                            network.get('Binario de Rede', ''),
-                            network.get('Numero de Sub-Redes', ''),
-                            network.get('Intervalo de Subredes', ''),
-                            network.get('Total de IPs', ''),
-                            network.get('Hosts Utilizaveis', '')
-                        )
-                        
-                        self.tree.insert("", tk.END, values=values)
-                        self.networks_data.append(network)
+                    def read_lines(load):
+                        # Lê linha a linha: o arquivo nunca fica inteiro na memória
+                        with open(filename, 'r', encoding='utf-8') as f:
+                            size = os.fstat(f.fileno()).st_size or 1
+                            f.readline()
+                            for line_number, line in enumerate(iter_project_lines(f)):
+                                if line_number % 1000 == 0:
+                                    load.progress = f.buffer.tell() / size
+                                yield line
                     
-                    messagebox.showinfo("Sucesso", f"Projeto carregado de {filename}")
-                else:
+                    self.start_background_load("Carregando projeto", read_lines, finish, parse_project_line)
+                    return
+                
+                # Sem cabeçalho: formato antigo, um único documento JSON com a
+                # lista "networks", lido em blocos na thread de trabalho
+                f = open(filename, 'r', encoding='utf-8')
+                try:
+                    networks = iter_json_networks(f)
+                except ValueError:
+                    f.close()
                     messagebox.showerror("Erro", "Arquivo de projeto inválido!")
+                    return
+                if not self.clear_table():
+                    f.close()
+                    return
+                
+                def read_networks(load):
+                    with f:
+                        size = os.fstat(f.fileno()).st_size or 1
+                        for count, network in enumerate(networks):
+                            if count % 1000 == 0:
+                                load.progress = f.buffer.tell() / size
+                            yield network
+                
+                self.start_background_load("Carregando projeto", read_networks, finish)
         
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar projeto: {str(e)}")
@@ -744,5 +1375,20 @@ class NetworkCalculatorGUI:
         self.root.mainloop()
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Calculadora de Redes (interface gráfica)")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_FILE, metavar="ARQUIVO",
+                        help="Mede as operações e grava as medições em ARQUIVO ao sair "
+                             f"(padrão: {DEFAULT_PROFILE_FILE}; cProfile se terminar em .prof)")
+    args = parser.parse_args()
+    
+    # Sem --profile nem REDES_PROFILE nada é instrumentado
+    if enable_profiling(args.profile):
+        from routing import RoutingModel
+        
+        PROFILER.instrument(NetworkCalculatorGUI, PROFILED_METHODS)
+        PROFILER.instrument(RoutingModel, PROFILED_ROUTING_METHODS)
+    
     app = NetworkCalculatorGUI()
     app.run()
\ No newline at end of file
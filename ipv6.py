@@ -0,0 +1,257 @@
+"""Cálculo de redes IPv6 sobre inteiros de 128 bits
+
+Mesmo caminho do IPv4: os 129 comprimentos de prefixo ficam numa tabela
+montada uma única vez (com a mesma forma de masks.MaskInfo) e cada endereço
+é interpretado uma única vez como inteiro. Rede, primeiro host, último
+endereço e contagens saem de operações de bits, sem criar objetos do
+ipaddress por linha. Este módulo só é importado quando aparece o primeiro
+endereço IPv6.
+
+O IPv6 não tem broadcast: a coluna 'Broadcast' traz o último endereço da
+rede e 'Hosts Utilizaveis' desconta só o início da rede (o anycast do
+roteador da sub-rede), exceto nos /127 e /128, em que todos os endereços
+são usados (RFC 6164), como em ipaddress.IPv6Network.hosts(). O 'Numero de
+Sub-Redes' segue a regra do IPv4 com o /64 no lugar do /24.
+"""
+from exe import NetworkBatch, NetworkResult, ipv4_to_int
+from masks import IPV6_TAG, MaskInfo
+
+ALL_ONES = (1 << 128) - 1
+
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+def ipv6_to_int(ip):
+    """Converte um IPv6 em texto para inteiro de 128 bits
+
+    Aceita as formas completa, abreviada com :: e com um IPv4 nos últimos
+    32 bits, com as mesmas regras do ipaddress (sem zona, como %eth0).
+    """
+    head, separator, tail = ip.partition('::')
+    groups = head.split(':') if head else []
+    right = tail.split(':') if tail else []
+    last = right if separator else groups
+    if last and '.' in last[-1]:
+        try:
+            value = ipv4_to_int(last[-1])
+        except ValueError:
+            raise ValueError(f"IP inválido: {ip}") from None
+        last[-1:] = ('%x' % (value >> 16), '%x' % (value & 0xFFFF))
+    if separator:
+        # :: substitui ao menos um grupo de zeros
+        missing = 8 - len(groups) - len(right)
+        if missing < 1:
+            raise ValueError(f"IP inválido: {ip}")
+        groups += ['0'] * missing + right
+    elif len(groups) != 8:
+        raise ValueError(f"IP inválido: {ip}")
+    # Com oito grupos não vazios, 32 dígitos só saem de grupos de 1 a 4
+    digits = ''.join([group.rjust(4, '0') for group in groups])
+    if len(digits) != 32 or '' in groups or not _HEX_DIGITS.issuperset(digits):
+        raise ValueError(f"IP inválido: {ip}")
+    return int(digits, 16)
+
+def int_to_ipv6(value):
+    """Converte um inteiro de 128 bits para IPv6 na forma comprimida
+    (RFC 5952, a mesma do ipaddress)"""
+    full = ':%x:%x:%x:%x:%x:%x:%x:%x:' % (
+        value >> 112, value >> 96 & 0xFFFF, value >> 80 & 0xFFFF, value >> 64 & 0xFFFF,
+        value >> 48 & 0xFFFF, value >> 32 & 0xFFFF, value >> 16 & 0xFFFF, value & 0xFFFF)
+    # A maior sequência de dois ou mais grupos zerados (a primeira, em caso
+    # de empate) vira ::
+    for zeros in _ZERO_RUNS:
+        position = full.find(zeros)
+        if position >= 0:
+            return f"{full[1:position]}::{full[position + len(zeros):-1]}"
+    return full[1:-1]
+
+_ZERO_RUNS = tuple(':0' * count + ':' for count in range(8, 1, -1))
+
+def int_to_ipv6_exploded(value):
+    """Converte um inteiro de 128 bits para IPv6 em hexadecimal completo
+    (oito grupos de quatro dígitos)"""
+    digits = '%032x' % value
+    return ':'.join([digits[i:i + 4] for i in range(0, 32, 4)])
+
+def int_to_binary6(value):
+    """Converte um inteiro de 128 bits para binário com : a cada 16 bits"""
+    bits = format(value, '0128b')
+    return ':'.join([bits[i:i + 16] for i in range(0, 128, 16)])
+
+def _build_mask_info(prefix):
+    mask_int = ALL_ONES ^ ((1 << (128 - prefix)) - 1)
+    total_ips = 1 << (128 - prefix)
+    return MaskInfo(
+        prefix=prefix,
+        mask_int=mask_int,
+        mask=int_to_ipv6(mask_int),
+        binary=int_to_binary6(mask_int),
+        wildcard=int_to_ipv6(ALL_ONES ^ mask_int),
+        total_ips=total_ips,
+        usable_hosts=total_ips - 1 if prefix < 127 else total_ips,
+        subnet_count=2 ** (prefix - 64) if prefix > 64 else 1,
+    )
+
+# Indexada pelo comprimento do prefixo
+PREFIX6_TABLE = tuple(_build_mask_info(prefix) for prefix in range(129))
+
+# Mesma tabela com as máscaras marcadas, para os inícios de rede marcados
+# das tabelas com as duas famílias (veja masks.prefix_table)
+TAGGED_PREFIX_TABLE = tuple(info._replace(mask_int=info.mask_int | IPV6_TAG) for info in PREFIX6_TABLE)
+
+# Indexadas pela máscara comprimida e pela máscara inteira
+MASK6_TABLE = {info.mask: info for info in PREFIX6_TABLE}
+MASK6_INT_TABLE = {info.mask_int: info for info in PREFIX6_TABLE}
+
+# Formas aceitas na entrada: "64", "/64" e "ffff:ffff:ffff:ffff::"
+MASK6_INPUT_TABLE = dict(MASK6_TABLE)
+for _info in PREFIX6_TABLE:
+    MASK6_INPUT_TABLE[str(_info.prefix)] = _info
+    MASK6_INPUT_TABLE[f"/{_info.prefix}"] = _info
+
+def lookup_mask6(mask):
+    """Retorna o MaskInfo de um prefixo IPv6 ou de uma máscara IPv6
+
+    Prefixos acima de 128 e máscaras não contíguas geram ValueError.
+    """
+    info = MASK6_INPUT_TABLE.get(mask)
+    if info is None:
+        mask = mask.strip()
+        info = MASK6_INPUT_TABLE.get(mask)
+        if info is None:
+            if mask.startswith('/') or mask.isdigit():
+                raise ValueError(f"Prefixo IPv6 inválido: /{mask.lstrip('/')}")
+            try:
+                info = MASK6_INT_TABLE.get(ipv6_to_int(mask))
+            except ValueError:
+                info = None
+            if info is None:
+                raise ValueError(f"Máscara IPv6 inválida: {mask}")
+    return info
+
+def _mask_info(value):
+    """MaskInfo de uma máscara em texto, inteiro de 128 bits ou prefixo (0 a
+    128), ou None se não for contígua"""
+    if isinstance(value, str):
+        return lookup_mask6(value)
+    value = int(value)
+    # Inteiros de 1 a 128 nunca são máscaras contíguas, então são prefixos
+    return PREFIX6_TABLE[value] if 0 <= value <= 128 else MASK6_INT_TABLE.get(value)
+
+def _address_to_int(value):
+    """Aceita um IPv6 em texto ou já como inteiro"""
+    if isinstance(value, str):
+        return ipv6_to_int(value)
+    return int(value)
+
+class NetworkResult6(NetworkResult):
+    """Resultado de NetworkCalculator.process_network_entry para uma rede
+    IPv6: os mesmos campos, calculados sobre inteiros de 128 bits"""
+    
+    __slots__ = ()
+    
+    version = 6
+    format_address = staticmethod(int_to_ipv6)
+    format_binary = staticmethod(int_to_binary6)
+    all_ones = ALL_ONES
+
+class NetworkBatch6(NetworkBatch):
+    """NetworkBatch de redes IPv6; as colunas numéricas são listas de
+    inteiros do Python, já que 128 bits não cabem num array tipado"""
+    
+    version = 6
+    format_address = staticmethod(int_to_ipv6)
+    format_binary = staticmethod(int_to_binary6)
+    
+    def _ints(self, name):
+        return self.columns[name]
+    
+    def build_string_column(self, name):
+        # IPs e máscaras são reescritos na forma comprimida
+        if name == 'IP':
+            return [int_to_ipv6(value) for value in self.columns['ip']]
+        if name == 'Máscara':
+            return [PREFIX6_TABLE[prefix].mask for prefix in self.columns['prefix']]
+        return super().build_string_column(name)
+
+def process_columns6(ips, masks, network_ips=None):
+    """Colunas numéricas de NetworkCalculator.process_network_entries para
+    redes IPv6 (IPs em texto ou inteiros; máscaras em texto, inteiros ou
+    prefixos de 0 a 128)"""
+    columns = {name: [] for name in NetworkBatch.NUMERIC_COLUMNS}
+    for row, (ip, mask) in enumerate(zip(ips, masks)):
+        ip_int = _address_to_int(ip)
+        info = _mask_info(mask)
+        if info is None:
+            raise ValueError(f"Máscara não contígua na linha {row + 1}")
+        
+        mask_int = info.mask_int
+        network_ip = _address_to_int(network_ips[row]) if network_ips is not None else ip_int & mask_int
+        network = network_ip & mask_int
+        if network == ALL_ONES:
+            raise ValueError(f"Rede sem IP utilizável na linha {row + 1}")
+        
+        columns['ip'].append(ip_int)
+        columns['mask'].append(mask_int)
+        columns['prefix'].append(info.prefix)
+        columns['network_ip'].append(network_ip)
+        columns['network'].append(network)
+        columns['gateway'].append(network + 1)
+        columns['broadcast'].append(network | (ALL_ONES ^ mask_int))
+        columns['total_ips'].append(info.total_ips)
+        columns['usable_hosts'].append(info.usable_hosts)
+        columns['subnet_count'].append(info.subnet_count)
+    return columns
+
+def verify_ipv6(samples=20000, seed=0):
+    """Compara o cálculo IPv6 sobre inteiros com o módulo ipaddress"""
+    import ipaddress
+    import random
+    
+    from exe import NetworkCalculator
+    
+    calculator = NetworkCalculator()
+    rng = random.Random(seed)
+    
+    cases = [("Borda", "::", 0, None), ("Borda", "::1", 128, None),
+             ("Borda", "ffff:ffff:ffff:ffff:ffff:ffff:ffff:fffe", 127, None),
+             ("Mapeado", "::ffff:192.168.0.1", 120, None), ("Doc", "2001:DB8:0:0:1::1", 64, None)]
+    for _ in range(samples):
+        # Grupos zerados são frequentes para exercitar a compressão
+        value = 0
+        for _ in range(8):
+            value = value << 16 | (0 if rng.random() < 0.4 else rng.getrandbits(16))
+        ip = int_to_ipv6_exploded(value) if rng.random() < 0.2 else str(ipaddress.IPv6Address(value))
+        network_ip = str(ipaddress.IPv6Address(rng.getrandbits(128))) if rng.random() < 0.25 else None
+        cases.append(("Host", ip, rng.randint(0, 128), network_ip))
+    
+    mismatches = 0
+    for host_name, ip, prefix, network_ip in cases:
+        address = ipaddress.IPv6Address(ip)
+        network = ipaddress.IPv6Network(f"{network_ip or ip}/{prefix}", strict=False)
+        if network.broadcast_address == ipaddress.IPv6Address(ALL_ONES) and prefix == 128:
+            continue
+        hosts = network.num_addresses - 1 if prefix < 127 else network.num_addresses
+        expected = {
+            'Nome Host': host_name,
+            'IP': str(address),
+            'Máscara': str(network.netmask),
+            'IP Rede': str(ipaddress.IPv6Address(network_ip)) if network_ip else str(network.network_address),
+            'Gateway': str(network.network_address + 1),
+            'Broadcast': str(network.broadcast_address),
+            'IP Binario': int_to_binary6(int(address)),
+            'Mascara Binaria': int_to_binary6(int(network.netmask)),
+            'Binario de Rede': int_to_binary6(int(ipaddress.IPv6Address(network_ip or str(network.network_address)))),
+            'Numero de Sub-Redes': 2 ** (prefix - 64) if prefix > 64 else 1,
+            'Intervalo de Subredes': f"{network.network_address} - {network.broadcast_address}",
+            'Total de IPs': network.num_addresses,
+            'Hosts Utilizaveis': hosts,
+        }
+        result = dict(calculator.process_network_entry(host_name, ip, str(prefix), network_ip))
+        if result != expected or int_to_ipv6_exploded(int(address)) != address.exploded:
+            mismatches += 1
+            print(f"Divergência em {ip}/{prefix} {network_ip}:")
+            print(f"  esperado: {expected}")
+            print(f"  obtido:   {result}")
+    
+    print(f"{len(cases)} casos IPv6 verificados, {mismatches} divergências")
+    return mismatches == 0
@@ -0,0 +1,83 @@
+"""Tabela pré-calculada das 33 máscaras IPv4 válidas
+
+Montada uma única vez na importação e compartilhada por exe.py e exe_gui.py:
+qualquer tratamento de máscara vira uma consulta a dicionário. A tabela das
+129 máscaras IPv6 fica em ipv6.py, importado só quando aparece um endereço
+IPv6.
+"""
+from collections import namedtuple
+
+MaskInfo = namedtuple('MaskInfo', [
+    'prefix',        # Comprimento do prefixo (0 a 32; no IPv6, 0 a 128)
+    'mask_int',      # Máscara como inteiro de 32 bits (128 no IPv6)
+    'mask',          # Máscara em formato decimal com pontos (hexadecimal no IPv6)
+    'binary',        # Máscara em binário com pontos
+    'wildcard',      # Máscara invertida (wildcard) com pontos
+    'total_ips',     # Total de endereços da rede
+    'usable_hosts',  # Hosts utilizáveis (sem rede e broadcast)
+    'subnet_count',  # Sub-redes em relação à classe padrão (ver calculate_subnet_count)
+])
+
+def _dotted(value):
+    return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+def _build_mask_info(prefix):
+    mask_int = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    bits = format(mask_int, '032b')
+    total_ips = 2 ** (32 - prefix)
+    return MaskInfo(
+        prefix=prefix,
+        mask_int=mask_int,
+        mask=_dotted(mask_int),
+        binary=f"{bits[0:8]}.{bits[8:16]}.{bits[16:24]}.{bits[24:32]}",
+        wildcard=_dotted(~mask_int & 0xFFFFFFFF),
+        total_ips=total_ips,
+        usable_hosts=total_ips - 2 if total_ips > 2 else 0,
+        # Até /24 a regra de classes resulta em uma única sub-rede
+        subnet_count=2 ** (prefix - 24) if prefix > 24 else 1,
+    )
+
+# Indexada pelo comprimento do prefixo
+PREFIX_TABLE = tuple(_build_mask_info(prefix) for prefix in range(33))
+
+# Indexadas pela máscara em pontos e pela máscara inteira
+MASK_TABLE = {info.mask: info for info in PREFIX_TABLE}
+MASK_INT_TABLE = {info.mask_int: info for info in PREFIX_TABLE}
+
+# Todas as formas aceitas na entrada: "24", "/24" e "255.255.255.0"
+MASK_INPUT_TABLE = dict(MASK_TABLE)
+for _info in PREFIX_TABLE:
+    MASK_INPUT_TABLE[str(_info.prefix)] = _info
+    MASK_INPUT_TABLE[f"/{_info.prefix}"] = _info
+
+def lookup_mask(mask):
+    """Retorna o MaskInfo de uma máscara em CIDR ou formato tradicional
+
+    Máscaras fora da tabela (não contíguas ou mal formadas) geram ValueError.
+    """
+    info = MASK_INPUT_TABLE.get(mask)
+    if info is None:
+        info = MASK_INPUT_TABLE.get(mask.strip())
+        if info is None:
+            mask = mask.strip()
+            if mask.startswith('/') or mask.isdigit():
+                raise ValueError(f"Formato CIDR inválido: /{mask.lstrip('/')}")
+            raise ValueError(f"Máscara inválida: {mask}")
+    return info
+
+# Onde as duas famílias se misturam (tabela da interface, índices e rotas),
+# os endereços IPv6 são inteiros "marcados": somados a IPV6_TAG, ficam depois
+# de todos os IPv4 na ordenação e nunca coincidem com eles
+IPV6_TAG = 1 << 128
+
+def prefix_table(start):
+    """Tabela de prefixos da família de um endereço (inteiro marcado)
+
+    PREFIX_TABLE para IPv4; para IPv6, ipv6.TAGGED_PREFIX_TABLE, cujas
+    máscaras também são marcadas, de modo que start & mask_int continua
+    marcado.
+    """
+    if start < IPV6_TAG:
+        return PREFIX_TABLE
+    from ipv6 import TAGGED_PREFIX_TABLE
+    return TAGGED_PREFIX_TABLE
@@ -0,0 +1,566 @@
+"""Armazenamento compacto, em colunas, das redes da calculadora
+
+Cada rede ocupa alguns bytes em arrays tipados (IP, IP de rede e prefixo) e
+referências a nomes internados de roteador e host. Os demais campos (gateway,
+broadcast, binários, intervalo e contagens) são derivados na hora a partir
+desses inteiros e da tabela de máscaras.
+
+Cada rede recebe um ID estável (a posição da sua linha nos arrays). Remover
+uma rede só a marca como removida, então os IDs das demais não mudam e
+podem ser usados como chave nos índices e na interface.
+
+Redes IPv6 ocupam a mesma linha, com zeros nas colunas de endereço; seus
+inteiros de 128 bits ficam num dicionário à parte (NetworkTable.ipv6). Na
+entrada (add, parse_record) e na saída (records, network_keys, network_key)
+elas usam inteiros marcados (veja masks.IPV6_TAG), que as mantêm separadas
+das IPv4 nos índices e nas ordenações.
+"""
+import sys
+from array import array
+from collections.abc import Mapping
+from itertools import compress
+
+from exe import ROW_FIELDS, int_to_binary, int_to_ipv4, ipv4_to_int, load_numpy, parse_address
+from masks import IPV6_TAG, MASK_TABLE, PREFIX_TABLE, lookup_mask, prefix_table
+
+# Campos de cada linha, na ordem usada na exportação e no projeto
+TABLE_FIELDS = ROW_FIELDS + ('Roteador',)
+
+def _field_getters():
+    """Funções que derivam cada campo a partir de (tabela, índice)"""
+    def network_start(table, index):
+        return table.network_ips[index] & PREFIX_TABLE[table.prefixes[index]].mask_int
+    
+    def broadcast(table, index):
+        info = PREFIX_TABLE[table.prefixes[index]]
+        return (table.network_ips[index] & info.mask_int) | (~info.mask_int & 0xFFFFFFFF)
+    
+    return {
+        'Nome Host': lambda table, index: table.host_names[index],
+        'IP': lambda table, index: int_to_ipv4(table.ips[index]),
+        'Máscara': lambda table, index: PREFIX_TABLE[table.prefixes[index]].mask,
+        'IP Rede': lambda table, index: int_to_ipv4(table.network_ips[index]),
+        'Gateway': lambda table, index: int_to_ipv4(network_start(table, index) + 1),
+        'Broadcast': lambda table, index: int_to_ipv4(broadcast(table, index)),
+        'IP Binario': lambda table, index: int_to_binary(table.ips[index]),
+        'Mascara Binaria': lambda table, index: PREFIX_TABLE[table.prefixes[index]].binary,
+        'Binario de Rede': lambda table, index: int_to_binary(table.network_ips[index]),
+        'Numero de Sub-Redes': lambda table, index: PREFIX_TABLE[table.prefixes[index]].subnet_count,
+        'Intervalo de Subredes': lambda table, index: (
+            f"{int_to_ipv4(network_start(table, index))} - {int_to_ipv4(broadcast(table, index))}"),
+        'Total de IPs': lambda table, index: PREFIX_TABLE[table.prefixes[index]].total_ips,
+        'Hosts Utilizaveis': lambda table, index: PREFIX_TABLE[table.prefixes[index]].usable_hosts,
+        'Roteador': lambda table, index: table.router_names[table.routers[index]],
+    }
+
+FIELD_GETTERS = _field_getters()
+
+_FIELD6_GETTERS = None
+
+def field6_getters():
+    """FIELD_GETTERS das redes IPv6, montadas no primeiro uso (tabelas só
+    IPv4 não importam o ipv6)"""
+    global _FIELD6_GETTERS
+    if _FIELD6_GETTERS is None:
+        from ipv6 import ALL_ONES, PREFIX6_TABLE, int_to_binary6, int_to_ipv6
+        
+        def network_start(table, index):
+            return table.ipv6[index][1] & PREFIX6_TABLE[table.prefixes[index]].mask_int
+        
+        def last_address(table, index):
+            return network_start(table, index) | (ALL_ONES ^ PREFIX6_TABLE[table.prefixes[index]].mask_int)
+        
+        getters = dict(FIELD_GETTERS)
+        getters.update({
+            'IP': lambda table, index: int_to_ipv6(table.ipv6[index][0]),
+            'Máscara': lambda table, index: PREFIX6_TABLE[table.prefixes[index]].mask,
+            'IP Rede': lambda table, index: int_to_ipv6(table.ipv6[index][1]),
+            'Gateway': lambda table, index: int_to_ipv6(network_start(table, index) + 1),
+            'Broadcast': lambda table, index: int_to_ipv6(last_address(table, index)),
+            'IP Binario': lambda table, index: int_to_binary6(table.ipv6[index][0]),
+            'Mascara Binaria': lambda table, index: PREFIX6_TABLE[table.prefixes[index]].binary,
+            'Binario de Rede': lambda table, index: int_to_binary6(table.ipv6[index][1]),
+            'Numero de Sub-Redes': lambda table, index: PREFIX6_TABLE[table.prefixes[index]].subnet_count,
+            'Intervalo de Subredes': lambda table, index: (
+                f"{int_to_ipv6(network_start(table, index))} - {int_to_ipv6(last_address(table, index))}"),
+            'Total de IPs': lambda table, index: PREFIX6_TABLE[table.prefixes[index]].total_ips,
+            'Hosts Utilizaveis': lambda table, index: PREFIX6_TABLE[table.prefixes[index]].usable_hosts,
+        })
+        _FIELD6_GETTERS = getters
+    return _FIELD6_GETTERS
+
+def _sort_key_builders():
+    """Funções que montam, para a tabela inteira, a chave de ordenação tipada
+    de cada campo (inteiros para endereços e contagens, nomes sem caixa)"""
+    mask_ints = [info.mask_int for info in PREFIX_TABLE]
+    
+    def network_starts(table):
+        return array('I', (network_int & mask_ints[prefix]
+                           for network_int, prefix in zip(table.network_ips, table.prefixes)))
+    
+    def broadcasts(table):
+        return array('I', (network_int | (~mask_ints[prefix] & 0xFFFFFFFF)
+                           for network_int, prefix in zip(table.network_ips, table.prefixes)))
+    
+    def ranges(table):
+        return array('Q', ((start << 32) | end for start, end in zip(network_starts(table), broadcasts(table))))
+    
+    def by_prefix(attribute):
+        values = [getattr(info, attribute) for info in PREFIX_TABLE]
+        return lambda table: array('Q', (values[prefix] for prefix in table.prefixes))
+    
+    def routers(table):
+        folded = [name.casefold() for name in table.router_names]
+        return [folded[router_id] for router_id in table.routers]
+    
+    return {
+        'Roteador': routers,
+        'Nome Host': lambda table: [name.casefold() for name in table.host_names],
+        'IP': lambda table: table.ips,
+        'Máscara': lambda table: table.prefixes,
+        'IP Rede': lambda table: table.network_ips,
+        # O gateway é sempre o início da rede + 1
+        'Gateway': network_starts,
+        'Broadcast': broadcasts,
+        # Os binários ordenam como os inteiros que representam
+        'IP Binario': lambda table: table.ips,
+        'Mascara Binaria': lambda table: table.prefixes,
+        'Binario de Rede': lambda table: table.network_ips,
+        'Numero de Sub-Redes': by_prefix('subnet_count'),
+        'Intervalo de Subredes': ranges,
+        'Total de IPs': by_prefix('total_ips'),
+        'Hosts Utilizaveis': by_prefix('usable_hosts'),
+    }
+
+SORT_KEY_BUILDERS = _sort_key_builders()
+
+def _mixed_sort_key_builders():
+    """SORT_KEY_BUILDERS das tabelas com redes IPv6: listas de inteiros do
+    Python, com os endereços IPv6 marcados (depois de todos os IPv4)"""
+    def addresses(column, position):
+        # Coluna IPv4 com as linhas IPv6 trocadas pelo seu endereço marcado
+        def build(table):
+            keys = list(getattr(table, column))
+            for row_id, addresses6 in table.ipv6.items():
+                keys[row_id] = addresses6[position] | IPV6_TAG
+            return keys
+        return build
+    
+    def blocks(table):
+        for row_id in range(len(table.alive)):
+            start, prefix = table.block(row_id)
+            yield start, start + prefix_table(start)[prefix].total_ips - 1, prefix
+    
+    def by_prefix(attribute):
+        def build(table):
+            from ipv6 import PREFIX6_TABLE
+            
+            values = [getattr(info, attribute) for info in PREFIX_TABLE]
+            values6 = [getattr(info, attribute) for info in PREFIX6_TABLE]
+            return [values6[prefix] if row_id in table.ipv6 else values[prefix]
+                    for row_id, prefix in enumerate(table.prefixes)]
+        return build
+    
+    def prefixes(table):
+        # Máscaras IPv6 depois das IPv4
+        return [prefix | 256 if row_id in table.ipv6 else prefix for row_id, prefix in enumerate(table.prefixes)]
+    
+    builders = dict(SORT_KEY_BUILDERS)
+    builders.update({
+        'IP': addresses('ips', 0),
+        'Máscara': prefixes,
+        'IP Rede': addresses('network_ips', 1),
+        'Gateway': lambda table: [start for start, _, _ in blocks(table)],
+        'Broadcast': lambda table: [end for _, end, _ in blocks(table)],
+        'IP Binario': addresses('ips', 0),
+        'Mascara Binaria': prefixes,
+        'Binario de Rede': addresses('network_ips', 1),
+        'Numero de Sub-Redes': by_prefix('subnet_count'),
+        'Intervalo de Subredes': lambda table: [(start, end) for start, end, _ in blocks(table)],
+        'Total de IPs': by_prefix('total_ips'),
+        'Hosts Utilizaveis': by_prefix('usable_hosts'),
+    })
+    return builders
+
+MIXED_SORT_KEY_BUILDERS = _mixed_sort_key_builders()
+
+def parse_record(record):
+    """Converte um dicionário no formato da calculadora nos argumentos de
+    NetworkTable.add: (roteador, host, IP, prefixo, IP de rede ou None)
+
+    Apenas Roteador, Nome Host, IP, Máscara e IP Rede são lidos; o restante
+    é derivado. Endereços IPv6 saem marcados. Gera ValueError se IP, máscara
+    ou IP de rede forem inválidos ou de famílias diferentes.
+    """
+    ip = str(record['IP']).strip()
+    network_ip = record.get('IP Rede')
+    if ':' in ip:
+        from ipv6 import lookup_mask6
+        
+        prefix = lookup_mask6(str(record['Máscara'])).prefix
+        network_int = parse_address(str(network_ip).strip()) if network_ip else None
+        if network_int is not None and network_int < IPV6_TAG:
+            raise ValueError(f"IP de rede IPv4 para o IP IPv6 {ip}: {network_ip}")
+        return (
+            str(record.get('Roteador') or ''),
+            str(record.get('Nome Host') or ''),
+            parse_address(ip),
+            prefix,
+            network_int,
+        )
+    return (
+        str(record.get('Roteador') or ''),
+        str(record.get('Nome Host') or ''),
+        ipv4_to_int(ip),
+        lookup_mask(str(record['Máscara'])).prefix,
+        ipv4_to_int(str(network_ip).strip()) if network_ip else None,
+    )
+
+# Texto decimal e binário de cada octeto, para montar endereços sem format()
+_DECIMAL_OCTETS = [str(octet) for octet in range(256)]
+_BINARY_OCTETS = [format(octet, '08b') for octet in range(256)]
+
+def _table_rows(table):
+    """Gera os valores de TABLE_FIELDS de cada rede ativa
+    
+    Mesmo resultado de FIELD_GETTERS, mas calculando início e broadcast uma
+    vez por linha e montando os endereços a partir das tabelas de octetos;
+    é o caminho usado pelas exportações.
+    """
+    decimal, binary = _DECIMAL_OCTETS, _BINARY_OCTETS
+    
+    def dotted(value):
+        return f"{decimal[value >> 24]}.{decimal[value >> 16 & 255]}.{decimal[value >> 8 & 255]}.{decimal[value & 255]}"
+    
+    def bits(value):
+        return f"{binary[value >> 24]}.{binary[value >> 16 & 255]}.{binary[value >> 8 & 255]}.{binary[value & 255]}"
+    
+    ips, network_ips, prefixes = table.ips, table.network_ips, table.prefixes
+    host_names, routers, router_names = table.host_names, table.routers, table.router_names
+    ipv6 = table.ipv6
+    if ipv6:
+        getters = [field6_getters()[field] for field in TABLE_FIELDS]
+    for row_id in table.ids():
+        if row_id in ipv6:
+            yield [getter(table, row_id) for getter in getters]
+            continue
+        ip_int, network_int, info = ips[row_id], network_ips[row_id], PREFIX_TABLE[prefixes[row_id]]
+        start = network_int & info.mask_int
+        start_text = dotted(start)
+        broadcast_text = dotted(start | (~info.mask_int & 0xFFFFFFFF))
+        yield [
+            host_names[row_id],
+            dotted(ip_int),
+            info.mask,
+            start_text if network_int == start else dotted(network_int),
+            dotted(start + 1),
+            broadcast_text,
+            bits(ip_int),
+            info.binary,
+            bits(network_int),
+            info.subnet_count,
+            f"{start_text} - {broadcast_text}",
+            info.total_ips,
+            info.usable_hosts,
+            router_names[routers[row_id]],
+        ]
+
+class NetworkRow(Mapping):
+    """Visão leve de uma linha da NetworkTable, com a mesma forma do dicionário
+    retornado por NetworkCalculator.process_network_entry (mais 'Roteador')"""
+    
+    __slots__ = ('table', 'index')
+    
+    version = 4
+    getters = FIELD_GETTERS
+    
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+    
+    def __getitem__(self, key):
+        return self.getters[key](self.table, self.index)
+    
+    def __iter__(self):
+        return iter(TABLE_FIELDS)
+    
+    def __len__(self):
+        return len(TABLE_FIELDS)
+    
+    def __eq__(self, other):
+        if isinstance(other, NetworkRow):
+            return self.table is other.table and self.index == other.index
+        return Mapping.__eq__(self, other)
+    
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+    
+    def __repr__(self):
+        return f"NetworkRow({self.to_dict()!r})"
+    
+    def to_dict(self):
+        """Converte a linha para um dicionário comum (exportação e JSON)"""
+        table, index = self.table, self.index
+        return {field: getter(table, index) for field, getter in self.getters.items()}
+
+class NetworkRow6(NetworkRow):
+    """NetworkRow de uma rede IPv6"""
+    
+    __slots__ = ()
+    
+    version = 6
+    
+    @property
+    def getters(self):
+        return field6_getters()
+
+def network_key(network):
+    """Retorna (início da rede, prefixo) de uma rede no formato da calculadora
+    (o início das redes IPv6 é marcado)"""
+    if isinstance(network, NetworkRow):
+        return network.table.block(network.index)
+    network_ip = network['IP Rede']
+    if ':' in network_ip:
+        from ipv6 import lookup_mask6
+        
+        start = parse_address(network_ip)
+        info = prefix_table(start)[lookup_mask6(network['Máscara']).prefix]
+        return start & info.mask_int, info.prefix
+    info = MASK_TABLE[network['Máscara']]
+    return ipv4_to_int(network_ip) & info.mask_int, info.prefix
+
+def _ipv6_addresses(ip_int, prefix, network_int):
+    """(IP, IP de rede) sem marca de uma rede IPv6 recebida por
+    NetworkTable.add, validando a rede"""
+    from ipv6 import ALL_ONES, PREFIX6_TABLE
+    
+    mask_int = PREFIX6_TABLE[prefix].mask_int
+    ip_int &= ALL_ONES
+    network_int = ip_int & mask_int if network_int is None else network_int & ALL_ONES
+    if network_int & mask_int == ALL_ONES:
+        raise ValueError("A rede ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff/128 não tem IP utilizável")
+    return ip_int, network_int
+
+class NetworkTable:
+    """Tabela de redes em colunas tipadas
+
+    Aceita os mesmos dicionários produzidos pela calculadora em append() e
+    devolve NetworkRow (NetworkRow6 para redes IPv6) na leitura, então o
+    restante do código continua trabalhando com a forma de dicionário.
+    Linhas são acessadas e removidas pelo ID (NetworkRow.index) em O(1).
+    """
+    
+    def __init__(self):
+        self.ips = array('I')
+        self.network_ips = array('I')
+        self.prefixes = array('B')
+        self.routers = array('I')
+        self.host_names = []
+        # 1 para linhas ativas, 0 para removidas
+        self.alive = bytearray()
+        self.count = 0
+        # Nomes de roteador se repetem muito: ficam em um catálogo único
+        self.router_names = []
+        self.router_index = {}
+        # ipv6[ID] = (IP, IP de rede) das redes IPv6, sem marca; nas colunas
+        # acima elas ficam com zeros
+        self.ipv6 = {}
+        # Chaves de ordenação já montadas, descartadas a cada alteração
+        self._sort_keys = {}
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        for row_id in self.ids():
+            yield self.row(row_id)
+    
+    def __contains__(self, row_id):
+        return 0 <= row_id < len(self.alive) and self.alive[row_id] == 1
+    
+    def __getitem__(self, row_id):
+        if row_id not in self:
+            raise KeyError(f"rede {row_id} não está na tabela")
+        return self.row(row_id)
+    
+    def __delitem__(self, row_id):
+        if row_id not in self:
+            raise KeyError(f"rede {row_id} não está na tabela")
+        # As colunas ficam como estão: chaves de ordenação em cache
+        # continuam válidas para as demais linhas
+        self.alive[row_id] = 0
+        self.host_names[row_id] = ''
+        self.count -= 1
+        if self.ipv6.pop(row_id, None) is not None:
+            # A linha morta vira 0.0.0.0/0, válida para as chaves IPv4; sem
+            # redes IPv6, as chaves mistas em cache deixam de servir
+            self.prefixes[row_id] = 0
+            if not self.ipv6:
+                self._sort_keys.clear()
+    
+    @property
+    def next_id(self):
+        """ID que a próxima rede adicionada vai receber"""
+        return len(self.ips)
+    
+    def row(self, row_id):
+        """NetworkRow (ou NetworkRow6) de um ID, sem verificar se está ativo"""
+        if row_id in self.ipv6:
+            return NetworkRow6(self, row_id)
+        return NetworkRow(self, row_id)
+    
+    def block(self, row_id):
+        """(início da rede, prefixo) de um ID, com o início IPv6 marcado"""
+        prefix = self.prefixes[row_id]
+        addresses6 = self.ipv6.get(row_id)
+        if addresses6 is None:
+            return self.network_ips[row_id] & PREFIX_TABLE[prefix].mask_int, prefix
+        network_int = addresses6[1] | IPV6_TAG
+        return network_int & prefix_table(network_int)[prefix].mask_int, prefix
+    
+    def ids(self):
+        """IDs das redes ativas, em ordem de inserção"""
+        return compress(range(len(self.alive)), self.alive)
+    
+    def clear(self):
+        """Remove todas as redes"""
+        self.__init__()
+    
+    def router_id(self, router):
+        """Índice do roteador no catálogo de nomes, criando se necessário"""
+        router_id = self.router_index.get(router)
+        if router_id is None:
+            router_id = len(self.router_names)
+            self.router_names.append(sys.intern(router))
+            self.router_index[router] = router_id
+        return router_id
+    
+    def add(self, router, host_name, ip_int, prefix, network_int=None):
+        """Adiciona uma rede já convertida para inteiros (marcados, se IPv6)"""
+        if ip_int < IPV6_TAG:
+            mask_int = PREFIX_TABLE[prefix].mask_int
+            if network_int is None:
+                network_int = ip_int & mask_int
+            if network_int & mask_int == 0xFFFFFFFF:
+                raise ValueError("A rede 255.255.255.255/32 não tem IP utilizável")
+        else:
+            self.ipv6[len(self.ips)] = _ipv6_addresses(ip_int, prefix, network_int)
+            ip_int = network_int = 0
+        if self._sort_keys:
+            self._sort_keys.clear()
+        self.ips.append(ip_int)
+        self.network_ips.append(network_int)
+        self.prefixes.append(prefix)
+        self.routers.append(self.router_id(router or ''))
+        self.host_names.append(sys.intern(host_name))
+        self.alive.append(1)
+        self.count += 1
+        return self.row(len(self.ips) - 1)
+    
+    def append(self, record):
+        """Adiciona uma rede a partir de um dicionário no formato da calculadora
+        (veja parse_record)"""
+        return self.add(*parse_record(record))
+    
+    def sort_keys(self, field):
+        """Chave de ordenação de um campo para todas as linhas, indexável pelo
+        ID (montada na primeira ordenação e mantida em cache)"""
+        keys = self._sort_keys.get(field)
+        if keys is None:
+            builders = MIXED_SORT_KEY_BUILDERS if self.ipv6 else SORT_KEY_BUILDERS
+            keys = self._sort_keys[field] = builders[field](self)
+        return keys
+    
+    def sorted_ids(self, fields):
+        """IDs das redes ativas ordenados por vários campos
+        
+        fields é uma lista de (campo, decrescente), do critério principal ao
+        último desempate. Usa ordenações estáveis sucessivas, do último
+        critério para o primeiro; empates mantêm a ordem de inserção.
+        Tabelas com redes IPv6 (chaves maiores que 64 bits) não usam o NumPy.
+        """
+        if not self.ipv6 and load_numpy() is not None:
+            return self._sorted_ids_numpy(fields)
+        row_ids = list(self.ids())
+        for field, descending in reversed(fields):
+            row_ids.sort(key=self.sort_keys(field).__getitem__, reverse=descending)
+        return row_ids
+    
+    def _sorted_ids_numpy(self, fields):
+        """sorted_ids com argsort estável do NumPy"""
+        np = load_numpy()
+        row_ids = np.flatnonzero(np.frombuffer(bytes(self.alive), dtype=np.uint8))
+        for field, descending in reversed(fields):
+            keys = np.asarray(self.sort_keys(field))[row_ids]
+            if descending:
+                # Ordena a sequência invertida e desinverte o resultado: o
+                # sentido fica decrescente e os empates na ordem original
+                row_ids, keys = row_ids[::-1], keys[::-1]
+                row_ids = row_ids[np.argsort(keys, kind='stable')][::-1]
+            else:
+                row_ids = row_ids[np.argsort(keys, kind='stable')]
+        return row_ids.tolist()
+    
+    def network_keys(self):
+        """Gera (ID, início da rede, prefixo) de cada rede direto das colunas
+        (início marcado nas redes IPv6)"""
+        mask_ints = [info.mask_int for info in PREFIX_TABLE]
+        ipv6 = self.ipv6
+        for row_id, network_int, prefix, alive in zip(range(len(self.alive)), self.network_ips, self.prefixes, self.alive):
+            if alive:
+                if row_id in ipv6:
+                    yield (row_id, *self.block(row_id))
+                else:
+                    yield row_id, network_int & mask_ints[prefix], prefix
+    
+    def active_routers(self):
+        """Nomes dos roteadores com ao menos uma rede ativa"""
+        return {self.router_names[router_id] for router_id in set(compress(self.routers, self.alive))}
+    
+    def records(self):
+        """Gera os argumentos de add (roteador, host, IP, prefixo, IP de rede)
+        de cada rede ativa; o IP de rede vem como None quando é o padrão e
+        os endereços IPv6 vêm marcados"""
+        mask_ints = [info.mask_int for info in PREFIX_TABLE]
+        router_names, host_names, ipv6 = self.router_names, self.host_names, self.ipv6
+        for row_id in self.ids():
+            prefix = self.prefixes[row_id]
+            if row_id in ipv6:
+                ip_int, network_int = (address | IPV6_TAG for address in ipv6[row_id])
+                mask_int = prefix_table(ip_int)[prefix].mask_int
+            else:
+                ip_int, network_int = self.ips[row_id], self.network_ips[row_id]
+                mask_int = mask_ints[prefix]
+            if network_int == ip_int & mask_int:
+                network_int = None
+            yield router_names[self.routers[row_id]], host_names[row_id], ip_int, prefix, network_int
+    
+    def values(self, fields=TABLE_FIELDS):
+        """Gera, para cada rede ativa, a lista de valores dos campos pedidos
+        (exportação em fluxo, sem montar dicionários)"""
+        rows = _table_rows(self)
+        if tuple(fields) == TABLE_FIELDS:
+            return rows
+        positions = [TABLE_FIELDS.index(field) for field in fields]
+        return ([row[position] for position in positions] for row in rows)
+    
+    def prefix_sets(self):
+        """Prefixos presentes nas redes IPv4 e nas IPv6, como (IPv4, IPv6),
+        para as larguras de column_widths"""
+        prefixes = set(compress(self.prefixes, self.alive))
+        if not self.ipv6:
+            return prefixes, set()
+        prefixes6 = {self.prefixes[row_id] for row_id in self.ipv6}
+        return {self.prefixes[row_id] for row_id in self.ids() if row_id not in self.ipv6}, prefixes6
+    
+    def text_widths(self):
+        """Largura dos campos livres (host e roteador) para tabelas de
+        largura fixa"""
+        return {
+            'Nome Host': max(map(len, self.host_names), default=0),
+            'Roteador': max(map(len, self.router_names), default=0),
+        }
+    
+    def to_dicts(self):
+        """Lista de dicionários de todas as redes (exportação e JSON)"""
+        return [row.to_dict() for row in self]
@@ -0,0 +1,210 @@
+"""Detecção de sub-redes sobrepostas ou duplicadas
+
+Blocos CIDR nunca se cruzam parcialmente: ou são disjuntos ou um contém o
+outro. Por isso basta uma varredura ordenada com uma pilha para achar todas
+as sobreposições da tabela (O(N log N) + número de conflitos), e um índice
+ordenado por início para verificar, inserir e remover cada rede em O(log N)
+mais o deslocamento de um trecho de tamanho fixo (veja IntervalIndex).
+
+Os inícios são inteiros marcados (veja masks.IPV6_TAG): blocos IPv6 ficam
+num intervalo próprio, depois de todos os IPv4, e só se sobrepõem entre si.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import chain
+
+from masks import prefix_table
+
+# Tamanho dos trechos da lista ordenada de IntervalIndex
+BLOCK_SIZE = 512
+
+def find_overlaps(blocks):
+    """Encontra todos os pares de blocos sobrepostos
+
+    blocks é uma sequência de (início, prefixo, chave). Gera pares
+    (chave_externa, chave_interna), em que o primeiro bloco contém (ou é
+    igual a) o segundo.
+    """
+    ordered = sorted(((start, start + prefix_table(start)[prefix].total_ips - 1, key)
+                      for start, prefix, key in blocks),
+                     key=lambda block: (block[0], -block[1]))
+    # Pilha com a cadeia de blocos que contém a posição atual
+    stack = []
+    for start, end, key in ordered:
+        while stack and stack[-1][1] < start:
+            stack.pop()
+        for _, _, outer_key in stack:
+            yield outer_key, key
+        stack.append((start, end, key))
+
+class IntervalIndex:
+    """Índice de blocos (rede, broadcast) para checar conflitos de cada nova rede
+
+    Blocos que contêm a nova rede são achados consultando uma tabela por
+    comprimento de prefixo (no máximo 33 consultas, ou 129 no IPv6). Blocos
+    contidos nela são achados por busca binária nos inícios.
+
+    Os blocos ficam ordenados por (início, prefixo) numa lista de trechos de
+    até 2 * BLOCK_SIZE blocos, cada um com seu menor início em mins. Inserir
+    ou remover custa O(log N) na busca mais o deslocamento de um único
+    trecho. A lista de trechos só é deslocada (O(N / BLOCK_SIZE)) ao
+    dividir um trecho, o que exige BLOCK_SIZE inserções nele, ou ao
+    esvaziar um, o que exige remover todos os seus blocos.
+    """
+    
+    def __init__(self):
+        # Trechos paralelos: chaves de ordenação (início << 8 | prefixo) e
+        # blocos (início, fim, prefixo, chave)
+        self.sort_keys = []
+        self.chunks = []
+        self.mins = []
+        self.count = 0
+        # by_prefix[prefixo] = {início: [chaves]}, com as duas famílias
+        self.by_prefix = [{} for _ in range(129)]
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def blocks(self):
+        """Todos os blocos (início, fim, prefixo, chave), em ordem de início"""
+        return chain.from_iterable(self.chunks)
+    
+    def clear(self):
+        """Remove todos os blocos"""
+        self.__init__()
+    
+    def _set_blocks(self, ordered):
+        """Reparte blocos já ordenados em trechos de BLOCK_SIZE"""
+        self.chunks = [ordered[i:i + BLOCK_SIZE] for i in range(0, len(ordered), BLOCK_SIZE)]
+        self.sort_keys = [[start << 8 | prefix for start, _, prefix, _ in chunk] for chunk in self.chunks]
+        self.mins = [keys[0] for keys in self.sort_keys]
+        self.count = len(ordered)
+    
+    def load(self, blocks):
+        """Substitui o conteúdo por blocos (início, prefixo, chave) de uma vez
+        
+        Ordena uma única vez em vez de inserir bloco a bloco.
+        """
+        self.clear()
+        ordered = []
+        for start, prefix, key in blocks:
+            info = prefix_table(start)[prefix]
+            start &= info.mask_int
+            ordered.append((start, start + info.total_ips - 1, prefix, key))
+            self.by_prefix[prefix].setdefault(start, []).append(key)
+        ordered.sort(key=lambda block: (block[0], block[2]))
+        self._set_blocks(ordered)
+    
+    def insert(self, start, prefix, key):
+        """Adiciona um bloco ao índice"""
+        info = prefix_table(start)[prefix]
+        start &= info.mask_int
+        block = (start, start + info.total_ips - 1, prefix, key)
+        self.by_prefix[prefix].setdefault(start, []).append(key)
+        self.count += 1
+        
+        sort_key = start << 8 | prefix
+        if not self.chunks:
+            self.sort_keys.append([sort_key])
+            self.chunks.append([block])
+            self.mins.append(sort_key)
+            return
+        index = max(bisect_right(self.mins, sort_key) - 1, 0)
+        keys, chunk = self.sort_keys[index], self.chunks[index]
+        position = bisect_right(keys, sort_key)
+        keys.insert(position, sort_key)
+        chunk.insert(position, block)
+        if position == 0:
+            self.mins[index] = sort_key
+        
+        if len(keys) > 2 * BLOCK_SIZE:
+            self.sort_keys[index:index + 1] = [keys[:BLOCK_SIZE], keys[BLOCK_SIZE:]]
+            self.chunks[index:index + 1] = [chunk[:BLOCK_SIZE], chunk[BLOCK_SIZE:]]
+            self.mins.insert(index + 1, keys[BLOCK_SIZE])
+    
+    def remove(self, start, prefix, key):
+        """Remove um bloco do índice; retorna False se não existia"""
+        start &= prefix_table(start)[prefix].mask_int
+        keys = self.by_prefix[prefix].get(start)
+        if not keys or key not in keys:
+            return False
+        keys.remove(key)
+        if not keys:
+            del self.by_prefix[prefix][start]
+        self.count -= 1
+        
+        # Só blocos da mesma rede (redes duplicadas) são percorridos até achar a chave
+        sort_key = start << 8 | prefix
+        index = max(bisect_left(self.mins, sort_key) - 1, 0)
+        position = bisect_left(self.sort_keys[index], sort_key)
+        while True:
+            if position == len(self.chunks[index]):
+                index, position = index + 1, 0
+            elif self.sort_keys[index][position] == sort_key and self.chunks[index][position][3] == key:
+                break
+            else:
+                position += 1
+        
+        keys, chunk = self.sort_keys[index], self.chunks[index]
+        del keys[position]
+        del chunk[position]
+        if not keys:
+            del self.sort_keys[index]
+            del self.chunks[index]
+            del self.mins[index]
+        elif position == 0:
+            self.mins[index] = keys[0]
+        return True
+    
+    def remove_many(self, blocks):
+        """Remove vários blocos (início, prefixo, chave) de uma vez
+        
+        Com poucos blocos remove um a um; com muitos, filtra os trechos numa
+        única passada e os reparte de novo.
+        """
+        blocks = list(blocks)
+        if len(blocks) <= 32:
+            for start, prefix, key in blocks:
+                self.remove(start, prefix, key)
+            return
+        
+        removed = set()
+        for start, prefix, key in blocks:
+            start &= prefix_table(start)[prefix].mask_int
+            keys = self.by_prefix[prefix].get(start)
+            if not keys or key not in keys:
+                continue
+            keys.remove(key)
+            if not keys:
+                del self.by_prefix[prefix][start]
+            removed.add((start, prefix, key))
+        self._set_blocks([block for block in self.blocks if (block[0], block[2], block[3]) not in removed])
+    
+    def overlapping(self, start, prefix):
+        """Blocos (início, prefixo, chave) que se sobrepõem ao bloco informado"""
+        table = prefix_table(start)
+        start &= table[prefix].mask_int
+        end = start + table[prefix].total_ips - 1
+        found = []
+        
+        # Blocos iguais ou maiores que contêm o novo bloco
+        for length in range(prefix + 1):
+            outer_start = start & table[length].mask_int
+            keys = self.by_prefix[length].get(outer_start)
+            if keys:
+                found.extend((outer_start, length, key) for key in keys)
+        
+        # Blocos menores contidos no novo bloco: começam em [start, end]
+        first_key, last_key = start << 8 | prefix + 1, end << 8 | 0xFF
+        index = max(bisect_left(self.mins, first_key) - 1, 0)
+        while index < len(self.chunks):
+            keys, chunk = self.sort_keys[index], self.chunks[index]
+            last = bisect_right(keys, last_key)
+            for position in range(bisect_left(keys, first_key), last):
+                inner_start, _, inner_prefix, key = chunk[position]
+                if inner_prefix > prefix:
+                    found.append((inner_start, inner_prefix, key))
+            if last < len(keys):
+                break
+            index += 1
+        return found
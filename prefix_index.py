@@ -0,0 +1,155 @@
+"""Índice de maior prefixo correspondente (longest prefix match)
+
+Responde "a qual rede (e roteador) pertence o endereço X" sem percorrer o
+inventário. Há uma tabela hash por comprimento de prefixo: a consulta testa
+só os comprimentos presentes, do mais longo para o mais curto, com uma
+operação AND e uma busca em dicionário em cada um. Inserção e remoção são
+O(1). A consulta em lote usa NumPy (busca binária vetorizada por
+comprimento) quando disponível.
+
+Prefixos e endereços IPv6 usam inteiros marcados (veja masks.IPV6_TAG) e
+ficam em tabelas próprias, consultadas sem NumPy.
+"""
+from exe import format_address, load_numpy, parse_address
+from masks import IPV6_TAG, PREFIX_TABLE, prefix_table
+
+def _address_int(address):
+    if isinstance(address, str):
+        return parse_address(address.strip())
+    return int(address)
+
+class PrefixIndex:
+    """Índice de prefixos IPv4 e IPv6 com consulta pelo maior prefixo
+    correspondente
+
+    Cada prefixo guarda um ou mais valores (por exemplo, o roteador e o host
+    da rede); prefixos repetidos devolvem o primeiro valor inserido.
+    """
+    
+    def __init__(self):
+        # tables[prefixo] = {início da rede: [valores]}; tables6 é o mesmo
+        # para as redes IPv6, com os inícios marcados
+        self.tables = [{} for _ in range(33)]
+        self.tables6 = [{} for _ in range(129)]
+        self.lengths = []
+        self.lengths6 = []
+        self.size = 0
+        self._sorted_cache = {}
+    
+    def __len__(self):
+        return self.size
+    
+    def _update_lengths(self):
+        self.lengths = [prefix for prefix in range(32, -1, -1) if self.tables[prefix]]
+        self.lengths6 = [prefix for prefix in range(128, -1, -1) if self.tables6[prefix]]
+    
+    def _table(self, start, prefix):
+        """Tabela de um comprimento na família do início"""
+        return self.tables[prefix] if start < IPV6_TAG else self.tables6[prefix]
+    
+    def insert(self, start, prefix, value):
+        """Adiciona um prefixo (início da rede como inteiro e comprimento)"""
+        start &= prefix_table(start)[prefix].mask_int
+        table = self._table(start, prefix)
+        values = table.get(start)
+        if values is None:
+            table[start] = [value]
+            if len(table) == 1:
+                self._update_lengths()
+        else:
+            values.append(value)
+        self.size += 1
+        if start < IPV6_TAG:
+            self._sorted_cache.pop(prefix, None)
+    
+    def remove(self, start, prefix, value):
+        """Remove um valor de um prefixo; retorna False se não existia"""
+        start &= prefix_table(start)[prefix].mask_int
+        table = self._table(start, prefix)
+        values = table.get(start)
+        if not values or value not in values:
+            return False
+        values.remove(value)
+        if not values:
+            del table[start]
+            if not table:
+                self._update_lengths()
+        self.size -= 1
+        if start < IPV6_TAG:
+            self._sorted_cache.pop(prefix, None)
+        return True
+    
+    def clear(self):
+        """Remove todos os prefixos"""
+        self.__init__()
+    
+    def lookup(self, address):
+        """Retorna (início, prefixo, valor) do maior prefixo que contém o
+        endereço, ou None se nenhum contém"""
+        address = _address_int(address)
+        if address < IPV6_TAG:
+            tables, lengths, masks = self.tables, self.lengths, PREFIX_TABLE
+        else:
+            tables, lengths, masks = self.tables6, self.lengths6, prefix_table(address)
+        for prefix in lengths:
+            values = tables[prefix].get(address & masks[prefix].mask_int)
+            if values:
+                return address & masks[prefix].mask_int, prefix, values[0]
+        return None
+    
+    def _sorted_table(self, prefix):
+        """Chaves ordenadas (array NumPy) e valores de um comprimento, em cache"""
+        cached = self._sorted_cache.get(prefix)
+        if cached is None:
+            np = load_numpy()
+            starts = sorted(self.tables[prefix])
+            cached = (np.array(starts, dtype=np.uint32),
+                      [self.tables[prefix][start][0] for start in starts])
+            self._sorted_cache[prefix] = cached
+        return cached
+    
+    def lookup_many(self, addresses):
+        """Consulta vários endereços de uma vez; retorna uma lista de
+        (início, prefixo, valor) ou None, na ordem da entrada"""
+        np = load_numpy()
+        if np is None:
+            return [self.lookup(address) for address in addresses]
+        
+        if isinstance(addresses, np.ndarray) and addresses.dtype.kind in 'iu':
+            addresses = addresses.astype(np.uint32)
+        else:
+            values = [_address_int(address) for address in addresses]
+            if values and max(values) >= IPV6_TAG:
+                # Endereços IPv6 são consultados um a um; os IPv4 seguem juntos
+                rows = [row for row, value in enumerate(values) if value < IPV6_TAG]
+                results = [self.lookup(value) if value >= IPV6_TAG else None for value in values]
+                matches = self.lookup_many(np.array([values[row] for row in rows], dtype=np.uint32))
+                for row, match in zip(rows, matches):
+                    results[row] = match
+                return results
+            addresses = np.array(values, dtype=np.uint32)
+        
+        results = [None] * len(addresses)
+        # Com os endereços ordenados, as chaves mascaradas de cada comprimento
+        # também ficam ordenadas, o que deixa a busca binária bem mais rápida
+        pending = np.argsort(addresses, kind='stable')
+        sorted_addresses = addresses[pending]
+        for prefix in self.lengths:
+            if not pending.size:
+                break
+            starts, values = self._sorted_table(prefix)
+            keys = sorted_addresses & np.uint32(PREFIX_TABLE[prefix].mask_int)
+            positions = np.minimum(np.searchsorted(starts, keys), len(starts) - 1)
+            found = starts[positions] == keys
+            for row, position, key in zip(pending[found].tolist(), positions[found].tolist(),
+                                          keys[found].tolist()):
+                results[row] = (key, prefix, values[position])
+            pending = pending[~found]
+            sorted_addresses = sorted_addresses[~found]
+        return results
+
+def format_match(match):
+    """Formata o prefixo encontrado como IP/comprimento (ou vazio)"""
+    if match is None:
+        return ''
+    return f"{format_address(match[0])}/{match[1]}"
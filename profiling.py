@@ -0,0 +1,218 @@
+"""Instrumentação opcional de desempenho
+
+Desligada por padrão: nenhum método é embrulhado e o custo é zero. Ligada
+pela opção --profile (interface gráfica e linha de comando) ou pela
+variável de ambiente REDES_PROFILE, instrument() troca os métodos indicados
+por versões que medem cada chamada. Para cada operação são mantidos a
+contagem, o tempo acumulado, o mínimo e o máximo, além de uma amostra de
+tamanho fixo das durações (amostragem de reservatório), de onde saem os
+percentis 50/90/99. A memória usada não cresce com o número de chamadas,
+então a instrumentação pode ficar ligada em processos longos (o serviço
+HTTP, por exemplo).
+
+No fim da execução as medições são gravadas em JSON. Se o arquivo terminar
+em .prof ou .pstats, a thread principal é acompanhada também pelo cProfile
+durante toda a execução; o resultado vai para esse arquivo (legível com
+python -m pstats) e as medições para o mesmo nome com extensão .json.
+"""
+import atexit
+import functools
+import os
+import random
+import sys
+import time
+from array import array
+
+PROFILE_ENV = 'REDES_PROFILE'
+DEFAULT_PROFILE_FILE = 'redes_profile.json'
+CPROFILE_SUFFIXES = ('.prof', '.pstats')
+PERCENTILES = (50, 90, 99)
+
+# Durações guardadas por operação para os percentis
+RESERVOIR_SIZE = 2048
+
+def profile_output_from_env():
+    """Arquivo de saída pedido em REDES_PROFILE, ou None se desligado
+
+    Valores como 1, true ou yes usam o arquivo padrão; 0, false, no ou
+    vazio deixam a instrumentação desligada.
+    """
+    value = os.environ.get(PROFILE_ENV, '').strip()
+    if value.lower() in ('', '0', 'false', 'no', 'off'):
+        return None
+    if value.lower() in ('1', 'true', 'yes', 'on'):
+        return DEFAULT_PROFILE_FILE
+    return value
+
+def percentile(ordered, percent):
+    """Percentil (pelo posto mais próximo) de uma sequência já ordenada"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-percent * len(ordered) // 100))
+    return ordered[rank - 1]
+
+class OperationStats:
+    """Agregados das chamadas de uma operação
+
+    Contagem, total, mínimo e máximo são exatos. Os percentis vêm de uma
+    amostra uniforme de até RESERVOIR_SIZE durações; enquanto houver menos
+    chamadas que isso, também são exatos.
+    """
+    
+    __slots__ = ('count', 'total', 'min', 'max', 'samples', 'random')
+    
+    def __init__(self):
+        self.random = random.Random(0).random
+        self.clear()
+    
+    def clear(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.samples = array('d')
+    
+    def add(self, seconds):
+        """Registra a duração de uma chamada"""
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            # Cada chamada fica na amostra com probabilidade RESERVOIR_SIZE / count
+            slot = int(self.random() * self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+
+class Profiler:
+    """Contagens e durações das operações instrumentadas"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        # timings[operação] = OperationStats, com tempos em segundos
+        self.timings = {}
+        self.started = None
+        self.cprofile = None
+    
+    def enable(self, output=DEFAULT_PROFILE_FILE):
+        """Liga a instrumentação e grava as medições em output ao sair"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.output = output
+        self.started = time.perf_counter()
+        if output.lower().endswith(CPROFILE_SUFFIXES):
+            import cProfile
+            
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        atexit.register(self.dump)
+    
+    def record(self, name, seconds):
+        """Registra uma duração medida fora de um método instrumentado"""
+        stats = self.timings.get(name)
+        if stats is None:
+            stats = self.timings[name] = OperationStats()
+        stats.add(seconds)
+    
+    def timed(self, name, function):
+        """Embrulha function para registrar a duração de cada chamada"""
+        stats = self.timings.get(name)
+        if stats is None:
+            stats = self.timings[name] = OperationStats()
+        add = stats.add
+        clock = time.perf_counter
+        
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add(clock() - start)
+        
+        wrapper.profiled = True
+        return wrapper
+    
+    def instrument(self, cls, names=None):
+        """Instrumenta métodos de uma classe (por padrão, todos os públicos)
+
+        Não faz nada com a instrumentação desligada; métodos já
+        instrumentados não são embrulhados de novo.
+        """
+        if not self.enabled:
+            return
+        if names is None:
+            names = [name for name, value in vars(cls).items() if callable(value) and not name.startswith('_')]
+        for name in names:
+            method = vars(cls).get(name)
+            if method is None or getattr(method, 'profiled', False):
+                continue
+            setattr(cls, name, self.timed(f"{cls.__name__}.{name}", method))
+    
+    def reset(self):
+        """Descarta as medições feitas até agora"""
+        for stats in self.timings.values():
+            stats.clear()
+        self.started = time.perf_counter()
+    
+    def stats(self):
+        """Estatísticas de cada operação chamada ao menos uma vez, da que
+        consumiu mais tempo para a que consumiu menos"""
+        rows = []
+        for name, stats in list(self.timings.items()):
+            if not stats.count:
+                continue
+            ordered = sorted(stats.samples)
+            row = {'operation': name, 'count': stats.count, 'total': stats.total, 'mean': stats.total / stats.count,
+                   'min': stats.min}
+            for percent in PERCENTILES:
+                row[f'p{percent}'] = percentile(ordered, percent)
+            row['max'] = stats.max
+            rows.append(row)
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows
+    
+    def report(self):
+        """Medições em um dicionário serializável em JSON (tempos em segundos)"""
+        import platform
+        from datetime import datetime
+        
+        return {
+            'created': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'wall_time': time.perf_counter() - self.started if self.started is not None else 0.0,
+            'operations': self.stats(),
+        }
+    
+    def write_json(self, filename):
+        """Grava as medições em um arquivo JSON"""
+        import json
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+    
+    def dump(self):
+        """Grava as medições (e o cProfile, se ligado) no arquivo de saída"""
+        if not self.enabled:
+            return
+        files = [self.output]
+        try:
+            if self.cprofile is not None:
+                self.cprofile.disable()
+                self.cprofile.dump_stats(self.output)
+                files.append(os.path.splitext(self.output)[0] + '.json')
+            self.write_json(files[-1])
+        except OSError as e:
+            print(f"Erro ao gravar o perfil de desempenho: {e}", file=sys.stderr)
+            return
+        print(f"Perfil de desempenho gravado em {' e '.join(files)}", file=sys.stderr)
+
+# Instância única usada pela calculadora e pela interface
+PROFILER = Profiler()
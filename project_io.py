@@ -0,0 +1,222 @@
+"""Leitura e escrita dos arquivos de projeto da calculadora
+
+Formato atual (versão 2): JSON Lines. A primeira linha é um cabeçalho com o
+formato e a versão; cada linha seguinte guarda só os dados de entrada de uma
+rede, em uma lista compacta:
+
+    {"format": "redes-projeto", "version": 2, "created": "...", "fields": [...]}
+    ["R1","Vendas","192.168.0.10",24]
+    ["R1","Filial","10.0.0.5",30,"10.0.0.4"]
+    ["R2","Matriz","2001:db8::1",64]
+
+O cabeçalho pode trazer também os links WAN ("wan": pool, prefixo dos links
+e o início do link de cada roteador, veja wan.WanAllocator.to_dict), para
+que os roteadores mantenham seus links entre uma sessão e outra.
+
+Endereços IPv6 são gravados na forma comprimida, com prefixo de 0 a 128.
+O IP de rede só aparece quando difere do IP mascarado. Os demais campos
+(gateway, broadcast, binários, contagens) são recalculados na carga, então
+o arquivo é lido e gravado linha a linha, sem montar o documento inteiro.
+Projetos no formato antigo (um único JSON com a lista "networks") continuam
+sendo lidos, também em blocos, por iter_json_networks.
+"""
+import json
+import re
+from datetime import datetime
+
+from exe import format_address, parse_address
+from masks import IPV6_TAG
+
+PROJECT_FORMAT = 'redes-projeto'
+PROJECT_VERSION = 2
+PROJECT_FIELDS = ('Roteador', 'Nome Host', 'IP', 'Prefixo', 'IP Rede')
+
+# Tamanho dos blocos lidos dos projetos no formato antigo
+JSON_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'\s*')
+_NUMBER_CHARS = '0123456789.eE+-'
+
+def write_project(stream, records, created=None, wan=None):
+    """Grava um projeto no formato de linhas em um arquivo de texto
+
+    records gera (roteador, host, IP, prefixo, IP de rede ou None) com os
+    endereços como inteiros (os IPv6 marcados com masks.IPV6_TAG), como
+    NetworkTable.records(); wan é o dicionário dos links WAN (opcional).
+    Retorna quantas redes foram gravadas.
+    """
+    header = {
+        'format': PROJECT_FORMAT,
+        'version': PROJECT_VERSION,
+        'created': created or datetime.now().isoformat(),
+        'fields': list(PROJECT_FIELDS),
+    }
+    if wan is not None:
+        header['wan'] = wan
+    stream.write(json.dumps(header, ensure_ascii=False) + '\n')
+    
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    # Nomes de roteador se repetem: cada um é codificado uma única vez
+    routers = {}
+    count = 0
+    for router, host, ip_int, prefix, network_int in records:
+        router_text = routers.get(router)
+        if router_text is None:
+            router_text = routers[router] = encode(router)
+        if network_int is None:
+            stream.write(f'[{router_text},{encode(host)},"{format_address(ip_int)}",{prefix}]\n')
+        else:
+            stream.write(f'[{router_text},{encode(host)},"{format_address(ip_int)}",{prefix},"{format_address(network_int)}"]\n')
+        count += 1
+    return count
+
+def read_project_header(line):
+    """Interpreta a primeira linha de um arquivo de projeto
+
+    Retorna o cabeçalho se for um projeto no formato de linhas, ou None se
+    for um projeto no formato antigo. Gera ValueError para versões mais
+    novas que a suportada.
+    """
+    line = line.strip()
+    if not line.startswith('{') or not line.endswith('}'):
+        return None
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(header, dict) or header.get('format') != PROJECT_FORMAT:
+        return None
+    if not isinstance(header.get('version'), int) or header['version'] > PROJECT_VERSION:
+        raise ValueError(f"Versão de projeto não suportada: {header.get('version')}")
+    return header
+
+def parse_project_line(line):
+    """Converte uma linha de rede do projeto nos argumentos de
+    NetworkTable.add: (roteador, host, IP, prefixo, IP de rede ou None)
+
+    Gera ValueError para linhas malformadas, endereços ou prefixos inválidos.
+    """
+    row = json.loads(line)
+    if not isinstance(row, list) or len(row) not in (4, 5):
+        raise ValueError(f"Linha de projeto inválida: {line.strip()}")
+    router, host, ip, prefix = row[:4]
+    network_ip = row[4] if len(row) == 5 else None
+    ip_int = parse_address(ip)
+    max_prefix = 32 if ip_int < IPV6_TAG else 128
+    if not isinstance(prefix, int) or not 0 <= prefix <= max_prefix:
+        raise ValueError(f"Prefixo inválido: {prefix}")
+    network_int = parse_address(network_ip) if network_ip else None
+    if network_int is not None and (network_int < IPV6_TAG) != (ip_int < IPV6_TAG):
+        raise ValueError(f"IP de rede {network_ip} de outra família que o IP {ip}")
+    return (
+        str(router or ''),
+        str(host or ''),
+        ip_int,
+        prefix,
+        network_int,
+    )
+
+def iter_project_lines(stream):
+    """Percorre as linhas de rede de um projeto no formato de linhas
+
+    Deve ser chamada depois de o cabeçalho ter sido lido; linhas em branco
+    são ignoradas.
+    """
+    for line in stream:
+        if line.strip():
+            yield line
+
+class _JsonStreamReader:
+    """Decodifica valores JSON de um arquivo de texto lido em blocos
+
+    Só o trecho ainda não decodificado fica em memória. Valores incompletos
+    no fim do bloco atual fazem o próximo bloco ser lido antes de decodificar
+    de novo.
+    """
+    
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+    
+    def read_more(self):
+        """Descarta o trecho já decodificado e acrescenta o próximo bloco"""
+        chunk = self.stream.read(self.chunk_size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = not chunk
+    
+    def peek(self):
+        """Pula espaços e retorna o próximo caractere ('' no fim do arquivo)"""
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if self.eof:
+                return ''
+            self.read_more()
+    
+    def expect(self, char):
+        """Consome o caractere esperado ou gera ValueError"""
+        if self.peek() != char:
+            raise ValueError("Arquivo de projeto inválido!")
+        self.position += 1
+    
+    def decode(self):
+        """Decodifica o próximo valor JSON"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except ValueError:
+                if self.eof:
+                    raise ValueError("Arquivo de projeto inválido!") from None
+                self.read_more()
+                continue
+            # Um número no fim do bloco pode continuar no seguinte ("1" de "1.5")
+            if self.eof or isinstance(value, (dict, list, str)) or self.buffer[end:].strip(_NUMBER_CHARS):
+                self.position = end
+                return value
+            self.read_more()
+
+def iter_json_networks(stream, chunk_size=JSON_CHUNK_SIZE):
+    """Percorre as redes de um projeto JSON antigo uma a uma
+
+    O arquivo é lido em blocos e cada objeto da lista "networks" é
+    decodificado separadamente, então projetos grandes não ficam inteiros
+    na memória. As chaves do objeto principal são lidas de fato (não
+    procuradas no texto), e os valores antes de "networks" são ignorados.
+
+    A estrutura é verificada já na chamada: se o arquivo não for um objeto
+    JSON com a lista "networks", gera ValueError antes de retornar o
+    iterador das redes.
+    """
+    reader = _JsonStreamReader(stream, chunk_size)
+    reader.expect('{')
+    while True:
+        key = reader.decode()
+        if not isinstance(key, str):
+            raise ValueError("Arquivo de projeto inválido!")
+        reader.expect(':')
+        if key == 'networks':
+            break
+        reader.decode()
+        if reader.peek() != ',':
+            raise ValueError("Arquivo de projeto inválido!")
+        reader.position += 1
+    reader.expect('[')
+    
+    def networks():
+        if reader.peek() == ']':
+            return
+        while True:
+            yield reader.decode()
+            if reader.peek() != ',':
+                break
+            reader.position += 1
+        reader.expect(']')
+    
+    return networks()
@@ -0,0 +1,570 @@
+"""Geração das tabelas de roteamento
+
+RoutingTables calcula os links WAN e as rotas sem interface gráfica,
+gerando os registros sob demanda (usada pelo comando routes do exe.py).
+RoutingModel usa a mesma geração para manter a Treeview da interface.
+
+Redes IPv6 chegam com o início marcado (veja masks.IPV6_TAG) e só geram
+rotas para redes IPv6; as super-redes de cada família são calculadas à
+parte. Os links WAN continuam IPv4 e servem de saída para as duas famílias.
+"""
+from collections import namedtuple
+
+from exe import format_address, int_to_ipv4
+from masks import IPV6_TAG, PREFIX_TABLE, prefix_table
+from network_table import network_key
+from wan import WanAllocator, WanLink
+
+def format_prefix(start, prefix):
+    """Formata um prefixo como na tabela de roteamento (IP/máscara, ou
+    IP/comprimento no IPv6)"""
+    if start < IPV6_TAG:
+        return f"{int_to_ipv4(start)}/{PREFIX_TABLE[prefix].mask}"
+    return f"{format_address(start)}/{prefix}"
+
+def range_to_prefixes(start, end):
+    """Divide o intervalo [start, end] no menor conjunto de prefixos alinhados
+    (os dois extremos da mesma família)"""
+    tag = start & IPV6_TAG
+    bits = 128 if tag else 32
+    start, end = start ^ tag, end ^ tag
+    prefixes = []
+    while start <= end:
+        # Maior bloco alinhado em start que ainda cabe no intervalo
+        size = start & -start if start else 1 << bits
+        while size > end - start + 1:
+            size >>= 1
+        prefixes.append((start | tag, bits + 1 - size.bit_length()))
+        start += size
+    return prefixes
+
+def summarize_prefixes(prefixes):
+    """Agrega prefixos (início, comprimento) no menor conjunto de super-redes
+
+    O resultado cobre exatamente os mesmos endereços da entrada: redes
+    duplicadas ou contidas em outras são absorvidas e blocos contíguos são
+    unidos sempre que formam um prefixo alinhado. Custo O(N log N). Blocos
+    IPv4 e IPv6 nunca se juntam: os IPv6 ficam depois, com o início marcado.
+    """
+    ranges = sorted((start, start + prefix_table(start)[prefix].total_ips - 1) for start, prefix in prefixes)
+    summary = []
+    current_start = current_end = None
+    for start, end in ranges:
+        if current_end is not None and start <= current_end + 1:
+            current_end = max(current_end, end)
+            continue
+        if current_end is not None:
+            summary.extend(range_to_prefixes(current_start, current_end))
+        current_start, current_end = start, end
+    if current_end is not None:
+        summary.extend(range_to_prefixes(current_start, current_end))
+    return summary
+
+def summarize_networks(networks):
+    """Agrega uma lista de redes no formato da calculadora"""
+    return summarize_prefixes(network_key(network) for network in networks)
+
+def full_route_count(router_sizes, inbound=False, outbound=False):
+    """Número de rotas da tabela completa (sem sumarização)
+
+    router_sizes é a quantidade de redes de cada roteador.
+    """
+    total = sum(router_sizes)
+    count = sum(size * (size - 1) for size in router_sizes if size > 1)
+    if len(router_sizes) > 1:
+        cross = sum(size * (total - size) for size in router_sizes)
+        count += cross * (int(inbound) + int(outbound))
+    return count
+
+# Rede de uma tabela de roteamento: chave estável, nome do host, rede no
+# formato IP/máscara, gateway, o bloco (início, prefixo) e a família (4 ou 6)
+RouteNetwork = namedtuple('RouteNetwork', 'key router host network gateway start prefix version')
+
+# Registros gerados pelas tabelas: link WAN (WanLink, de wan.py) e rota de
+# uma seção (INT, IN ou OUT) de um roteador
+Route = namedtuple('Route', 'table router description source destination gateway')
+
+def route_network(key, router, host, start, prefix):
+    """Cria a RouteNetwork de uma rede a partir do bloco em inteiros"""
+    return RouteNetwork(key, router, host, format_prefix(start, prefix),
+                        format_address(start + 1), start, prefix, 6 if start >= IPV6_TAG else 4)
+
+def item_version(item):
+    """Família de um item das seções: rede (RouteNetwork) ou super-rede
+    (início, prefixo)"""
+    if isinstance(item, RouteNetwork):
+        return item.version
+    return 6 if item[0] >= IPV6_TAG else 4
+
+class RoutingTables:
+    """Tabelas de roteamento calculadas sem interface gráfica
+
+    Recebe as redes como (chave, roteador, host, início, prefixo) e gera os
+    links WAN e as rotas sob demanda, seção por seção: nem a tabela completa
+    (que cresce com o quadrado do número de redes) nem a sumarizada ficam
+    inteiras na memória. count_routes informa o tamanho antes de gerar.
+
+    Os links WAN vêm de um WanAllocator (wan), que mantém o link de cada
+    roteador entre as reconstruções. Eles são sempre IPv4: as rotas de saída
+    de redes IPv6 também usam o provedor do link como gateway.
+    """
+    
+    def __init__(self, networks=(), inbound=False, outbound=False, summarize=False, wan=None):
+        self.inbound = self.outbound = self.summarize = False
+        # routers[nome] = {chave: RouteNetwork}, na ordem de inserção
+        self.routers = {}
+        self.router_of = {}
+        self.router_order = []
+        self.router_ids = {}
+        # Quantidade de redes de cada família
+        self.family_counts = {4: 0, 6: 0}
+        self.wan = wan if wan is not None else WanAllocator()
+        self.wan_gateways = {}
+        # Super-redes de cada roteador
+        self.local_summaries = {}
+        self.set_options(inbound, outbound, summarize)
+        if networks:
+            self.load(networks)
+    
+    def set_options(self, inbound, outbound, summarize):
+        """Define quais tabelas são geradas (vale a partir do próximo
+        load ou rebuild)"""
+        self.inbound, self.outbound, self.summarize = bool(inbound), bool(outbound), bool(summarize)
+    
+    def load(self, networks):
+        """Substitui as redes por (chave, roteador, host, início, prefixo)"""
+        self.routers, self.router_of = {}, {}
+        self.family_counts = {4: 0, 6: 0}
+        for key, router, host, start, prefix in networks:
+            network = route_network(key, router, host, start, prefix)
+            self.routers.setdefault(router, {})[key] = network
+            self.router_of[key] = router
+            self.family_counts[network.version] += 1
+        self.rebuild()
+    
+    def rebuild(self):
+        """Recalcula a ordem dos roteadores, os links WAN e as super-redes"""
+        self.router_order = sorted(self.routers)
+        self.router_ids = {router: index for index, router in enumerate(self.router_order)}
+        # Roteadores novos ganham links na ordem dos nomes; os demais mantêm o seu
+        self.wan.sync(self.router_order)
+        self.wan_gateways = {router: self.wan.gateway(router) for router in self.router_order}
+        self.local_summaries = {router: summarize_prefixes((network.start, network.prefix) for network in networks.values())
+                                for router, networks in self.routers.items()}
+    
+    @property
+    def mixed(self):
+        """Se há redes IPv4 e IPv6 (as rotas só ligam redes da mesma família)"""
+        return self.family_counts[4] > 0 and self.family_counts[6] > 0
+    
+    def router_sizes(self, version=None):
+        """Quantidade de redes de cada roteador (só as da família version, se
+        informada), na ordem dos roteadores"""
+        if version is None:
+            return [len(self.routers[router]) for router in self.router_order]
+        return [sum(1 for network in self.routers[router].values() if network.version == version)
+                for router in self.router_order]
+    
+    def full_count(self):
+        """Número de rotas da tabela completa para as opções atuais"""
+        if self.mixed:
+            return sum(full_route_count(self.router_sizes(version), self.inbound, self.outbound) for version in (4, 6))
+        return full_route_count(self.router_sizes(), self.inbound, self.outbound)
+    
+    def product_count(self, outer_items, inner_items):
+        """Número de rotas de uma seção sumarizada (externa, interna)"""
+        if not self.mixed:
+            return len(outer_items) * len(inner_items)
+        outer_ipv6 = sum(1 for item in outer_items if item_version(item) == 6)
+        inner_ipv6 = sum(1 for item in inner_items if item_version(item) == 6)
+        return ((len(outer_items) - outer_ipv6) * (len(inner_items) - inner_ipv6)
+                + outer_ipv6 * inner_ipv6)
+    
+    def count_routes(self):
+        """Número de rotas que routes() vai gerar, sem gerá-las"""
+        if not self.summarize:
+            return self.full_count()
+        count = 0
+        for router in self.router_order:
+            for kind, _ in self.section_titles():
+                count += self.product_count(*self.summarized_section(kind, router))
+        return count
+    
+    def has_cross_tables(self):
+        return len(self.router_order) > 1
+    
+    def section(self, kind, router):
+        """iid da seção (INT, IN ou OUT) de um roteador"""
+        return f"{kind}:{self.router_ids[router]}"
+    
+    def section_titles(self):
+        """Seções geradas para cada roteador: (tipo, título)"""
+        titles = [('INT', "Tabela Interna")]
+        if self.has_cross_tables():
+            if self.inbound:
+                titles.append(('IN', "Tabela de Entrada (WAN->LAN)"))
+            if self.outbound:
+                titles.append(('OUT', "Tabela de Saída (LAN->WAN)"))
+        return titles
+    
+    def external_networks(self, router):
+        """Redes dos outros roteadores, na ordem dos roteadores"""
+        for ext_router in self.router_order:
+            if ext_router != router:
+                for network in self.routers[ext_router].values():
+                    yield network
+    
+    # --- Geração ---
+    
+    def wan_links(self):
+        """Gera o link WAN (/30 ou /31 com o provedor) de cada roteador"""
+        for router in self.router_order:
+            yield self.wan.link(router)
+    
+    def section_rows(self, kind, router):
+        """Gera (iid, valores) das rotas de uma seção, na ordem de exibição"""
+        if self.summarize:
+            return self.summarized_rows(kind, router, *self.summarized_section(kind, router))
+        return self.full_rows(kind, router)
+    
+    def routes(self):
+        """Gera todas as rotas, roteador por roteador e seção por seção"""
+        for router in self.router_order:
+            for kind, _ in self.section_titles():
+                for _, (description, source, destination, gateway) in self.section_rows(kind, router):
+                    yield Route(kind, router, description.strip(), source, destination, gateway)
+    
+    # --- Tabela completa ---
+    
+    @staticmethod
+    def internal_route(src, dst):
+        return f"INT|{src.key}|{dst.key}", (f"  (INT) {src.host} -> {dst.host}", src.network, dst.network, dst.gateway)
+    
+    @staticmethod
+    def inbound_route(src, dst):
+        return f"IN|{src.key}|{dst.key}", (f"  (IN) De {src.host} ({src.router}) Para {dst.host}", src.network, dst.network, dst.gateway)
+    
+    def outbound_route(self, src, dst):
+        return f"OUT|{src.key}|{dst.key}", (f"  (OUT) De {src.host} Para {dst.host} ({dst.router})", src.network, dst.network,
+                                            self.wan_gateways[src.router])
+    
+    def full_rows(self, kind, router):
+        """Gera as rotas de uma seção da tabela completa, na ordem de exibição"""
+        networks = self.routers[router]
+        if kind == 'INT':
+            route = self.internal_route
+            pairs = ((src, dst) for src in networks.values() for dst in networks.values() if src is not dst)
+        elif kind == 'IN':
+            route = self.inbound_route
+            pairs = ((src, dst) for src in self.external_networks(router) for dst in networks.values())
+        else:
+            route = self.outbound_route
+            pairs = ((src, dst) for src in networks.values() for dst in self.external_networks(router))
+        if self.mixed:
+            pairs = ((src, dst) for src, dst in pairs if src.version == dst.version)
+        return (route(src, dst) for src, dst in pairs)
+    
+    # --- Tabela sumarizada ---
+    
+    def summarized_section(self, kind, router):
+        """Listas (externa, interna) de uma seção sumarizada
+        
+        As rotas da seção são o produto das duas listas, na ordem em que a
+        tabela as exibe: redes de destino por super-redes (interna e de
+        entrada) ou super-redes locais por externas (saída).
+        """
+        networks = list(self.routers[router].values())
+        local_summary = self.local_summaries[router]
+        if kind == 'INT':
+            return networks, (local_summary if len(networks) > 1 else [])
+        
+        # As super-redes dos outros roteadores já resumem suas redes
+        external_summary = summarize_prefixes(key for ext_router, summary in self.local_summaries.items()
+                                              if ext_router != router for key in summary)
+        if kind == 'IN':
+            return networks, external_summary
+        return local_summary, external_summary
+    
+    def summarized_route(self, kind, router, outer, inner):
+        """iid e valores da rota sumarizada (externa, interna) de uma seção"""
+        start, prefix = inner
+        if kind == 'INT':
+            return (f"S|INT|{outer.key}|{start}/{prefix}",
+                    (f"  (INT) De {router} Para {outer.host} (sumarizada)", format_prefix(start, prefix), outer.network, outer.gateway))
+        if kind == 'IN':
+            return (f"S|IN|{outer.key}|{start}/{prefix}",
+                    (f"  (IN) De Redes Externas Para {outer.host} (sumarizada)", format_prefix(start, prefix), outer.network, outer.gateway))
+        src_start, src_prefix = outer
+        return (f"S|OUT|{self.router_ids[router]}|{src_start}/{src_prefix}|{start}/{prefix}",
+                (f"  (OUT) De {router} Para Redes Externas (sumarizada)", format_prefix(src_start, src_prefix),
+                 format_prefix(start, prefix), self.wan_gateways[router]))
+    
+    def summarized_rows(self, kind, router, outer_items, inner_items):
+        """Gera as rotas de uma seção sumarizada (produto das listas, só
+        entre itens da mesma família)"""
+        if self.mixed:
+            return (self.summarized_route(kind, router, outer, inner) for outer in outer_items
+                    for inner in inner_items if item_version(outer) == item_version(inner))
+        return (self.summarized_route(kind, router, outer, inner) for outer in outer_items for inner in inner_items)
+
+class RoutingModel(RoutingTables):
+    """Tabelas de roteamento mantidas de forma incremental sobre uma Treeview
+
+    Cada roteador tem uma seção (linha de cabeçalho) por tabela (interna,
+    entrada e saída) e as rotas são filhas da seção, com iids derivados das
+    chaves das redes. Adicionar ou remover uma rede na tabela completa mexe
+    só nas rotas que a mencionam, nas posições em que a geração completa as
+    colocaria. Na tabela sumarizada as super-redes mudam junto com a rede,
+    então as seções são recalculadas e só as linhas diferentes são
+    aplicadas à Treeview. Mudar o conjunto de roteadores (que desloca as
+    seções e as cores) refaz tudo; os links WAN dos demais roteadores não
+    mudam. Com redes IPv4 e IPv6 juntas as rotas não seguem mais o produto
+    completo das seções, então cada alteração também refaz tudo.
+    """
+    
+    def __init__(self, tree, wan_tree=None, colors=('',), wan=None):
+        self.tree = tree
+        self.wan_tree = wan_tree
+        self.colors = colors
+        # Listas (externa, interna) de cada seção sumarizada exibida
+        self.section_products = {}
+        self.route_count = 0
+        super().__init__(wan=wan)
+    
+    def clear(self):
+        """Remove todas as redes e rotas"""
+        self.load(())
+    
+    # --- Reconstrução completa ---
+    
+    def rebuild(self):
+        """Refaz os links WAN e todas as seções a partir das redes atuais"""
+        super().rebuild()
+        tree = self.tree
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+        if self.wan_tree is not None:
+            children = self.wan_tree.get_children()
+            if children:
+                self.wan_tree.delete(*children)
+            for link in self.wan_links():
+                self.wan_tree.insert("", "end", values=tuple(link))
+        
+        self.section_products = {}
+        for index, router in enumerate(self.router_order):
+            tree.tag_configure(router, background=self.colors[index % len(self.colors)])
+        tree.tag_configure('header', font=('Arial', 10, 'bold'), background='#ddd')
+        
+        for router in self.router_order:
+            for kind, title in self.section_titles():
+                section = tree.insert("", "end", iid=self.section(kind, router), open=True,
+                                      values=(f"--- {title}: {router} ---", "", "", ""), tags=('header',))
+                if self.summarize:
+                    products = self.section_products[section] = self.summarized_section(kind, router)
+                    rows = self.summarized_rows(kind, router, *products)
+                else:
+                    rows = self.full_rows(kind, router)
+                for iid, values in rows:
+                    tree.insert(section, "end", iid=iid, values=values, tags=(router,))
+        
+        if self.summarize:
+            self.route_count = self.summarized_count()
+        else:
+            self.route_count = self.full_count()
+    
+    # --- Tabela sumarizada ---
+    
+    def summarized_count(self):
+        return sum(self.product_count(outer, inner) for outer, inner in self.section_products.values())
+    
+    def refresh_summaries(self, changed_routers):
+        """Atualiza as super-redes dos roteadores alterados e aplica à
+        Treeview só as rotas sumarizadas que entraram ou saíram"""
+        for router in changed_routers:
+            self.local_summaries[router] = summarize_prefixes(
+                (network.start, network.prefix) for network in self.routers[router].values())
+        for router in self.router_order:
+            for kind, _ in self.section_titles():
+                self.apply_product_diff(kind, router, *self.summarized_section(kind, router))
+        self.route_count = self.summarized_count()
+    
+    def apply_product_diff(self, kind, router, outer_items, inner_items):
+        """Leva uma seção sumarizada às novas listas (externa, interna)
+        
+        Itens mantidos conservam a ordem relativa (redes na ordem de inserção
+        e super-redes ordenadas), então basta remover as rotas dos itens que
+        saíram e inserir as dos que entraram nas posições do produto.
+        """
+        section = self.section(kind, router)
+        old_outer, old_inner = self.section_products[section]
+        if old_outer == outer_items and old_inner == inner_items:
+            return
+        tree = self.tree
+        self.section_products[section] = (outer_items, inner_items)
+        
+        def item_key(item):
+            return item.key if isinstance(item, RouteNetwork) else item
+        
+        outer_keys = {item_key(outer) for outer in outer_items}
+        inner_set = set(inner_items)
+        stale = []
+        for outer in old_outer:
+            if item_key(outer) in outer_keys:
+                stale.extend(self.summarized_route(kind, router, outer, inner)[0] for inner in old_inner if inner not in inner_set)
+            else:
+                stale.extend(self.summarized_route(kind, router, outer, inner)[0] for inner in old_inner)
+        if stale:
+            tree.delete(*stale)
+        
+        old_outer_keys = {item_key(outer) for outer in old_outer}
+        old_inner_set = set(old_inner)
+        added_inner = [position for position, inner in enumerate(inner_items) if inner not in old_inner_set]
+        width = len(inner_items)
+        for row, outer in enumerate(outer_items):
+            positions = added_inner if item_key(outer) in old_outer_keys else range(width)
+            for position in positions:
+                iid, values = self.summarized_route(kind, router, outer, inner_items[position])
+                tree.insert(section, row * width + position, iid=iid, values=values, tags=(router,))
+    
+    # --- Alterações incrementais ---
+    
+    def add_network(self, key, router, host, start, prefix):
+        """Adiciona uma rede e as rotas que a mencionam"""
+        network = route_network(key, router, host, start, prefix)
+        self.family_counts[network.version] += 1
+        if router not in self.routers or self.mixed:
+            self.routers.setdefault(router, {})[key] = network
+            self.router_of[key] = router
+            self.rebuild()
+            return
+        
+        networks = self.routers[router]
+        if self.summarize:
+            networks[key] = network
+            self.router_of[key] = router
+            self.refresh_summaries((router,))
+            return
+        
+        tree = self.tree
+        count = len(networks)
+        old_networks = list(networks.values())
+        
+        # Interna: (origem, nova) no fim do bloco de cada origem e o bloco
+        # da nova rede no fim da seção
+        section = self.section('INT', router)
+        for position, src in enumerate(old_networks):
+            iid, values = self.internal_route(src, network)
+            tree.insert(section, position * count + count - 1, iid=iid, values=values, tags=(router,))
+        for dst in old_networks:
+            iid, values = self.internal_route(network, dst)
+            tree.insert(section, "end", iid=iid, values=values, tags=(router,))
+        
+        networks[key] = network
+        self.router_of[key] = router
+        
+        if self.has_cross_tables():
+            if self.inbound:
+                self.add_inbound_routes(network, count)
+            if self.outbound:
+                self.add_outbound_routes(network, count)
+        self.route_count = self.full_count()
+    
+    def add_inbound_routes(self, network, count):
+        """Rotas de entrada da nova rede (count é o tamanho anterior do
+        roteador dela)"""
+        tree, router = self.tree, network.router
+        
+        # No próprio roteador a nova rede é destino no fim de cada bloco
+        section = self.section('IN', router)
+        for position, src in enumerate(self.external_networks(router)):
+            iid, values = self.inbound_route(src, network)
+            tree.insert(section, position * (count + 1) + count, iid=iid, values=values, tags=(router,))
+        
+        # Nos demais ela é origem, logo após as redes que a precedem
+        for other in self.router_order:
+            if other == router:
+                continue
+            destinations = self.routers[other]
+            before = sum(len(self.routers[ext]) for ext in self.router_order if ext != other and ext < router) + count
+            section = self.section('IN', other)
+            for offset, dst in enumerate(destinations.values()):
+                iid, values = self.inbound_route(network, dst)
+                tree.insert(section, before * len(destinations) + offset, iid=iid, values=values, tags=(other,))
+    
+    def add_outbound_routes(self, network, count):
+        """Rotas de saída da nova rede (count é o tamanho anterior do
+        roteador dela)"""
+        tree, router = self.tree, network.router
+        
+        section = self.section('OUT', router)
+        for dst in self.external_networks(router):
+            iid, values = self.outbound_route(network, dst)
+            tree.insert(section, "end", iid=iid, values=values, tags=(router,))
+        
+        total = sum(self.router_sizes())
+        for other in self.router_order:
+            if other == router:
+                continue
+            sources = self.routers[other]
+            external = total - len(sources)
+            offset = sum(len(self.routers[ext]) for ext in self.router_order if ext != other and ext < router) + count
+            section = self.section('OUT', other)
+            for position, src in enumerate(sources.values()):
+                iid, values = self.outbound_route(src, network)
+                tree.insert(section, position * external + offset, iid=iid, values=values, tags=(other,))
+    
+    def route_iids(self, network):
+        """iids de todas as rotas da tabela completa que mencionam a rede"""
+        router = network.router
+        iids = []
+        for other in self.routers[router].values():
+            if other is not network:
+                iids.append(self.internal_route(other, network)[0])
+                iids.append(self.internal_route(network, other)[0])
+        if self.has_cross_tables():
+            if self.inbound:
+                iids.extend(self.inbound_route(src, network)[0] for src in self.external_networks(router))
+                for other in self.router_order:
+                    if other != router:
+                        iids.extend(self.inbound_route(network, dst)[0] for dst in self.routers[other].values())
+            if self.outbound:
+                iids.extend(self.outbound_route(network, dst)[0] for dst in self.external_networks(router))
+                for other in self.router_order:
+                    if other != router:
+                        iids.extend(self.outbound_route(src, network)[0] for src in self.routers[other].values())
+        return iids
+    
+    def remove_networks(self, keys):
+        """Remove redes e as rotas que as mencionam"""
+        # Posições e iids das rotas só são previsíveis com uma família
+        rebuild = self.mixed
+        changed = set()
+        for key in keys:
+            router = self.router_of.get(key)
+            if router is None:
+                continue
+            networks = self.routers[router]
+            if not (rebuild or self.summarize):
+                iids = self.route_iids(networks[key])
+                if iids:
+                    self.tree.delete(*iids)
+            self.family_counts[networks[key].version] -= 1
+            del self.router_of[key]
+            del networks[key]
+            if not networks:
+                # Um roteador a menos desloca seções e cores: refaz tudo
+                del self.routers[router]
+                rebuild = True
+            changed.add(router)
+        
+        if rebuild and changed:
+            self.rebuild()
+        elif changed and self.summarize:
+            self.refresh_summaries(changed)
+        elif changed:
+            self.route_count = self.full_count()
+    
+    def remove_network(self, key):
+        """Remove uma rede e as rotas que a mencionam"""
+        self.remove_networks((key,))
@@ -0,0 +1,450 @@
+"""Serviço HTTP/JSON local da calculadora
+
+`python exe.py serve` mantém um processo aberto que atende scripts de
+automação por HTTP, sem pagar a partida do interpretador nem as perguntas do
+modo interativo a cada chamada. O servidor usa só a biblioteca padrão
+(asyncio); as conexões são mantidas abertas entre requisições (keep-alive,
+inclusive com requisições enviadas em sequência sem esperar as respostas).
+
+Rotas (corpo e resposta em JSON):
+
+    GET  /health      estado do serviço
+    GET  /metrics     requisições, erros, itens e latência de cada rota
+    POST /network     uma rede, com os campos do modo em lote
+    POST /batch       {"networks": [...]}: várias redes numa só requisição
+    GET  /inventory   tamanho do inventário carregado
+    PUT  /inventory   {"networks": [...]}: troca o inventário
+    POST /lookup      {"addresses": [...]}: maior prefixo correspondente
+    POST /routes      tabelas de roteamento do inventário (ou de "networks")
+
+/network e /batch aceitam "fields" com a lista de campos desejados: os
+campos de texto e binários só são montados quando pedidos. Nas rotas em lote
+os erros de cada item vêm em "errors" ({"index", "error"}) e a posição
+correspondente do resultado fica null, sem interromper os demais.
+
+Os cálculos rodam no laço de eventos, já que levam microssegundos. Corpos
+grandes e a geração de rotas (que cresce com o quadrado do inventário) vão
+para uma thread, para que as requisições pequenas continuem sendo atendidas.
+"""
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+from exe import (BATCH_OUTPUT_FIELDS, ROUTE_OUTPUT_FIELDS, WAN_OUTPUT_FIELDS, NetworkCalculator, inventory_block,
+                 iter_inventory_blocks, parse_address, process_batch_record)
+from prefix_index import PrefixIndex, format_match
+from profiling import PERCENTILES, percentile
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Limites por requisição
+MAX_BODY_SIZE = 64 * 1024 * 1024
+MAX_HEADERS = 100
+MAX_ROUTES = 1000000
+
+# Segundos que uma conexão ociosa fica aberta esperando a próxima requisição
+IDLE_TIMEOUT = 60
+
+# Corpos maiores que isto são processados numa thread
+OFFLOAD_BODY_SIZE = 256 * 1024
+
+# Latências mais recentes guardadas por rota para os percentis
+LATENCY_WINDOW = 10000
+
+STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+    501: 'Not Implemented',
+}
+
+class HttpError(Exception):
+    """Erro devolvido ao cliente com o status HTTP informado"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def encode_json(payload):
+    """Corpo JSON compacto em UTF-8"""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def build_response(status, body, keep_alive=True):
+    """Resposta HTTP/1.1 completa (cabeçalho e corpo JSON já codificado)"""
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('ascii') + body
+
+async def read_request(reader, writer, max_body=MAX_BODY_SIZE):
+    """Lê uma requisição HTTP/1.x da conexão
+
+    Retorna (método, caminho, corpo, keep-alive), ou None se o cliente
+    fechou a conexão. Requisições malformadas geram HttpError.
+    """
+    try:
+        line = await reader.readline()
+        # Linhas em branco entre requisições são toleradas (RFC 9112)
+        while line in (b'\r\n', b'\n'):
+            line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            raise HttpError(400, "Linha de requisição inválida")
+        method, target, version = parts
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HttpError(431, "Cabeçalhos demais")
+            name, separator, value = line.decode('latin-1').partition(':')
+            if not separator:
+                raise HttpError(400, "Cabeçalho inválido")
+            headers[name.strip().lower()] = value.strip()
+    except ValueError:
+        # Linha maior que o limite do StreamReader
+        raise HttpError(431, "Linha de cabeçalho grande demais") from None
+    
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HttpError(501, "Transfer-Encoding chunked não suportado; envie Content-Length")
+    length = headers.get('content-length', '0')
+    if not length.isdigit():
+        raise HttpError(400, f"Content-Length inválido: {length}")
+    length = int(length)
+    if length > max_body:
+        raise HttpError(413, f"Corpo maior que o limite de {max_body} bytes")
+    if length and headers.get('expect', '').lower() == '100-continue':
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+    body = await reader.readexactly(length) if length else b''
+    
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        keep_alive = connection == 'keep-alive'
+    else:
+        keep_alive = connection != 'close'
+    return method.upper(), target.partition('?')[0], body, keep_alive
+
+def output_fields(fields):
+    """Campos pedidos em "fields" (todos, se não informado)"""
+    if fields is None:
+        return BATCH_OUTPUT_FIELDS
+    if not isinstance(fields, list):
+        raise ValueError('"fields" deve ser uma lista de nomes de campos')
+    unknown = [str(field) for field in fields if field not in BATCH_OUTPUT_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}")
+    return fields
+
+def parse_inventory(records):
+    """Converte registros de inventário em blocos (posição, roteador, host,
+    início, prefixo), como iter_inventory_blocks; retorna (blocos, erros)"""
+    if not isinstance(records, list):
+        raise ValueError('"networks" deve ser uma lista de objetos')
+    blocks, errors = [], []
+    for position, record in enumerate(records):
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("cada rede deve ser um objeto JSON")
+            blocks.append((position, *inventory_block(record)))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append({'index': position, 'error': str(e)})
+    return blocks, errors
+
+def build_inventory(blocks):
+    """Inventário do serviço: (blocos, PrefixIndex dos blocos)"""
+    index = PrefixIndex()
+    for _, router, host_name, start, prefix in blocks:
+        index.insert(start, prefix, (router, host_name))
+    return blocks, index
+
+def request_object(data):
+    """Confere que o corpo decodificado é um objeto JSON"""
+    if not isinstance(data, dict):
+        raise ValueError("O corpo da requisição deve ser um objeto JSON")
+    return data
+
+class EndpointMetrics:
+    """Contagens e latências de uma rota do serviço"""
+    
+    __slots__ = ('count', 'errors', 'items', 'total', 'max', 'recent')
+    
+    def __init__(self):
+        self.count = self.errors = self.items = 0
+        self.total = self.max = 0.0
+        self.recent = deque(maxlen=LATENCY_WINDOW)
+    
+    def record(self, seconds, items, error):
+        self.count += 1
+        self.items += items
+        if error:
+            self.errors += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+    
+    def to_dict(self):
+        """Estatísticas em segundos; os percentis usam as últimas
+        LATENCY_WINDOW requisições"""
+        ordered = sorted(self.recent)
+        row = {'count': self.count, 'errors': self.errors, 'items': self.items, 'total': self.total,
+               'mean': self.total / self.count if self.count else 0.0}
+        for percent in PERCENTILES:
+            row[f'p{percent}'] = percentile(ordered, percent)
+        row['max'] = self.max
+        return row
+
+class CalculatorService:
+    """Estado do serviço: calculadora, inventário carregado e métricas"""
+    
+    def __init__(self, inventory=(), max_routes=MAX_ROUTES, max_body=MAX_BODY_SIZE, idle_timeout=IDLE_TIMEOUT):
+        self.calculator = NetworkCalculator()
+        self.max_routes = max_routes
+        self.max_body = max_body
+        self.idle_timeout = idle_timeout
+        self.started = time.perf_counter()
+        self.connections = self.open_connections = 0
+        self.endpoints = {
+            '/health': {'GET': self.health},
+            '/metrics': {'GET': self.metrics_report},
+            '/network': {'POST': self.network},
+            '/batch': {'POST': self.batch},
+            '/inventory': {'GET': self.inventory_summary, 'PUT': self.load_inventory},
+            '/lookup': {'POST': self.lookup},
+            '/routes': {'POST': self.routes},
+        }
+        # Rotas sempre processadas numa thread
+        self.offloaded = {'/routes'}
+        # Rotas desconhecidas são contadas juntas, em "outras"
+        self.metrics = {path: EndpointMetrics() for path in self.endpoints}
+        self.metrics['outras'] = EndpointMetrics()
+        # Inventário (blocos como em iter_inventory_blocks) e seu índice,
+        # trocados juntos
+        self.inventory = build_inventory(list(inventory))
+    # --- Conexões ---
+    
+    async def handle_connection(self, reader, writer):
+        """Atende as requisições de uma conexão até o cliente fechá-la,
+        pedir Connection: close ou ficar ocioso por idle_timeout"""
+        self.connections += 1
+        self.open_connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader, writer, self.max_body), self.idle_timeout)
+                except HttpError as e:
+                    # Depois de uma requisição malformada a conexão não é confiável
+                    self.metrics['outras'].record(0.0, 0, True)
+                    writer.write(build_response(e.status, encode_json({'error': str(e)}), keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, response = await self.dispatch(method, path, body)
+                writer.write(build_response(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def dispatch(self, method, path, body):
+        """Executa a rota pedida; retorna (status, corpo JSON codificado)
+        e registra a latência (da requisição lida à resposta pronta)"""
+        start = time.perf_counter()
+        items = 0
+        methods = self.endpoints.get(path)
+        handler = methods.get(method) if methods is not None else None
+        try:
+            if methods is None:
+                raise HttpError(404, f"Rota não encontrada: {path}")
+            if handler is None:
+                raise HttpError(405, f"Método {method} não aceito em {path} (use {', '.join(methods)})")
+            data = json.loads(body) if body else {}
+            if path in self.offloaded or len(body) > OFFLOAD_BODY_SIZE:
+                payload, items = await asyncio.get_running_loop().run_in_executor(None, handler, data)
+            else:
+                payload, items = handler(data)
+            status, response = 200, encode_json(payload)
+        except HttpError as e:
+            status, response = e.status, encode_json({'error': str(e)})
+        except (ValueError, TypeError, AttributeError) as e:
+            # Inclui JSON inválido (json.JSONDecodeError é um ValueError)
+            status, response = 400, encode_json({'error': str(e)})
+        except Exception as e:
+            import traceback
+            
+            traceback.print_exc(file=sys.stderr)
+            status, response = 500, encode_json({'error': f"Erro interno: {e}"})
+        
+        metrics = self.metrics[path] if methods is not None else self.metrics['outras']
+        metrics.record(time.perf_counter() - start, items, status != 200)
+        return status, response
+    
+    # --- Rotas ---
+    # Cada rota recebe o corpo já decodificado e retorna (resposta, itens)
+    
+    def health(self, data):
+        return {'status': 'ok', 'networks': len(self.inventory[0])}, 0
+    
+    def metrics_report(self, data):
+        return {
+            'uptime': time.perf_counter() - self.started,
+            'connections': {'open': self.open_connections, 'total': self.connections},
+            'requests': sum(metrics.count for metrics in self.metrics.values()),
+            'endpoints': {path: metrics.to_dict() for path, metrics in self.metrics.items() if metrics.count},
+        }, 0
+    
+    def network(self, data):
+        """Calcula uma rede (campos do modo em lote: Nome Host, IP, Máscara,
+        IP Rede e Roteador, ou os nomes alternativos)"""
+        data = request_object(data)
+        fields = output_fields(data.get('fields'))
+        result = process_batch_record(self.calculator, data)
+        return {'result': {field: result[field] for field in fields}}, 1
+    
+    def batch(self, data):
+        """Calcula várias redes; aceita {"networks": [...]} ou só a lista"""
+        if isinstance(data, list):
+            records, fields = data, BATCH_OUTPUT_FIELDS
+        else:
+            records = request_object(data).get('networks')
+            fields = output_fields(data.get('fields'))
+        if not isinstance(records, list):
+            raise ValueError('"networks" deve ser uma lista de objetos')
+        
+        calculator = self.calculator
+        results, errors = [], []
+        for position, record in enumerate(records):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError("cada rede deve ser um objeto JSON")
+                result = process_batch_record(calculator, record)
+            except (ValueError, TypeError, AttributeError) as e:
+                results.append(None)
+                errors.append({'index': position, 'error': str(e)})
+                continue
+            results.append({field: result[field] for field in fields})
+        return {'results': results, 'errors': errors}, len(records)
+    
+    def inventory_summary(self, data):
+        blocks = self.inventory[0]
+        return {'networks': len(blocks), 'routers': len({block[1] for block in blocks})}, 0
+    
+    def load_inventory(self, data):
+        """Substitui o inventário usado por /lookup e /routes"""
+        blocks, errors = parse_inventory(request_object(data).get('networks'))
+        self.inventory = build_inventory(blocks)
+        summary, _ = self.inventory_summary(None)
+        summary['errors'] = errors
+        return summary, len(blocks) + len(errors)
+    
+    def lookup(self, data):
+        """Rede mais específica do inventário para cada endereço"""
+        addresses = request_object(data).get('addresses')
+        if not isinstance(addresses, list):
+            raise ValueError('"addresses" deve ser uma lista de endereços')
+        index = self.inventory[1]
+        
+        matches = [None] * len(addresses)
+        valid, positions, errors = [], [], []
+        for position, address in enumerate(addresses):
+            address = str(address).strip()
+            try:
+                parse_address(address)
+            except ValueError as e:
+                errors.append({'index': position, 'error': str(e)})
+                continue
+            valid.append(address)
+            positions.append(position)
+        
+        for position, address, match in zip(positions, valid, index.lookup_many(valid)):
+            if match is None:
+                matches[position] = {'address': address, 'network': None, 'router': None, 'host': None}
+            else:
+                router, host_name = match[2]
+                matches[position] = {'address': address, 'network': format_match(match),
+                                     'router': router, 'host': host_name}
+        return {'matches': matches, 'errors': errors}, len(addresses)
+    
+    def routes(self, data):
+        """Links WAN e rotas do inventário carregado (ou das redes em
+        "networks"); com "count" só informa quantas rotas seriam geradas"""
+        from routing import RoutingTables
+        from wan import DEFAULT_LINK_PREFIX, DEFAULT_WAN_POOL, WanAllocator
+        
+        data = request_object(data)
+        errors = []
+        if 'networks' in data:
+            networks, errors = parse_inventory(data['networks'])
+        else:
+            networks = self.inventory[0]
+        wan = WanAllocator(data.get('wan_pool', DEFAULT_WAN_POOL), data.get('wan_prefix', DEFAULT_LINK_PREFIX))
+        tables = RoutingTables(networks, bool(data.get('inbound')), bool(data.get('outbound')),
+                               bool(data.get('summarize')), wan)
+        
+        count = tables.count_routes()
+        payload = {'count': count, 'full_count': tables.full_count(), 'routers': len(tables.router_order),
+                   'errors': errors}
+        if data.get('count'):
+            return payload, len(networks)
+        if count > self.max_routes:
+            raise HttpError(413, f"{count} rotas passam do limite de {self.max_routes}; "
+                                 f"use \"count\" para só contá-las")
+        payload['wan_links'] = [dict(zip(WAN_OUTPUT_FIELDS, link)) for link in tables.wan_links()]
+        payload['routes'] = [dict(zip(ROUTE_OUTPUT_FIELDS, route)) for route in tables.routes()]
+        return payload, len(networks)
+
+def load_inventory_file(filename, input_format=None):
+    """Blocos de um inventário em arquivo (CSV ou JSON Lines), para o
+    inventário inicial do serviço; linhas inválidas vão para stderr"""
+    from exe import detect_format
+    
+    with open(filename, 'r', newline='', encoding='utf-8') as stream:
+        return list(iter_inventory_blocks(stream, input_format or detect_format(filename), sys.stderr))
+
+async def run_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Atende conexões até o processo ser interrompido"""
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    for sock in server.sockets:
+        address, bound_port = sock.getsockname()[:2]
+        print(f"Serviço da calculadora em http://{address}:{bound_port} "
+              f"({len(service.inventory[0])} redes no inventário)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, inventory=(), max_routes=MAX_ROUTES):
+    """Executa o serviço em primeiro plano (Ctrl+C encerra)"""
+    from profiling import PROFILER
+    
+    # Antes de criar o serviço, que guarda os métodos de cada rota. Com
+    # `python exe.py serve` o exe.py roda como __main__ e a calculadora
+    # importada aqui é outra classe, instrumentada também
+    PROFILER.instrument(CalculatorService, ('network', 'batch', 'load_inventory', 'lookup', 'routes'))
+    PROFILER.instrument(NetworkCalculator)
+    service = CalculatorService(inventory, max_routes)
+    try:
+        asyncio.run(run_server(service, host, port))
+    except KeyboardInterrupt:
+        print("Serviço encerrado", file=sys.stderr)
+    return 0
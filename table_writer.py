@@ -0,0 +1,126 @@
+"""Exportação das redes em tabela de largura fixa (TXT) ou CSV
+
+As larguras das colunas vêm do tamanho máximo conhecido de cada campo (IPs
+com até 15 caracteres, ou 39 com redes IPv6; binários com 35, ou 135;
+contagens com os dígitos do maior valor entre os prefixos presentes), então
+a tabela é escrita numa única passada, linha a linha, sem guardar as linhas
+na memória. Nomes livres (host e roteador) recebem a largura informada por
+quem chama. Valores mais longos que a coluna não são cortados.
+
+Arquivos terminados em .gz são gravados compactados com gzip.
+"""
+import csv
+import gzip
+import io
+from itertools import starmap
+
+from masks import PREFIX_TABLE
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Largura máxima de cada campo de tamanho conhecido
+_IP_WIDTH = len('255.255.255.255')
+_BINARY_WIDTH = len('11111111.11111111.11111111.11111111')
+FIELD_WIDTHS = {
+    'IP': _IP_WIDTH,
+    'Máscara': _IP_WIDTH,
+    'IP Rede': _IP_WIDTH,
+    'Gateway': _IP_WIDTH,
+    'Broadcast': _IP_WIDTH,
+    'IP Binario': _BINARY_WIDTH,
+    'Mascara Binaria': _BINARY_WIDTH,
+    'Binario de Rede': _BINARY_WIDTH,
+    'Intervalo de Subredes': 2 * _IP_WIDTH + len(' - '),
+}
+
+# Larguras quando há redes IPv6
+_IP6_WIDTH = len('ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff')
+_BINARY6_WIDTH = 8 * 16 + 7
+FIELD6_WIDTHS = {
+    'IP': _IP6_WIDTH,
+    'Máscara': _IP6_WIDTH,
+    'IP Rede': _IP6_WIDTH,
+    'Gateway': _IP6_WIDTH,
+    'Broadcast': _IP6_WIDTH,
+    'IP Binario': _BINARY6_WIDTH,
+    'Mascara Binaria': _BINARY6_WIDTH,
+    'Binario de Rede': _BINARY6_WIDTH,
+    'Intervalo de Subredes': 2 * _IP6_WIDTH + len(' - '),
+}
+
+# Campos numéricos que dependem só do prefixo
+PREFIX_FIELDS = {
+    'Numero de Sub-Redes': 'subnet_count',
+    'Total de IPs': 'total_ips',
+    'Hosts Utilizaveis': 'usable_hosts',
+}
+
+def open_output(filename, newline=None):
+    """Abre um arquivo de texto para escrita com buffer grande (gzip se .gz)"""
+    if filename.lower().endswith('.gz'):
+        raw = gzip.open(filename, 'wb', compresslevel=6)
+        return io.TextIOWrapper(io.BufferedWriter(raw, WRITE_BUFFER_SIZE), encoding='utf-8', newline=newline)
+    return open(filename, 'w', encoding='utf-8', newline=newline, buffering=WRITE_BUFFER_SIZE)
+
+def column_widths(fields, prefixes=None, text_widths=None, prefixes6=()):
+    """Largura de cada coluna sem olhar as linhas
+
+    prefixes limita as contagens aos prefixos presentes (todos, se None);
+    text_widths dá a largura dos campos livres, como {'Nome Host': 20}.
+    prefixes6 são os prefixos das redes IPv6 presentes, se houver.
+    """
+    infos = [PREFIX_TABLE[prefix] for prefix in (range(33) if prefixes is None else prefixes)]
+    field_widths = FIELD_WIDTHS
+    if prefixes6:
+        from ipv6 import PREFIX6_TABLE
+        
+        infos.extend(PREFIX6_TABLE[prefix] for prefix in prefixes6)
+        field_widths = FIELD6_WIDTHS
+    infos = infos or [PREFIX_TABLE[0]]
+    text_widths = text_widths or {}
+    widths = []
+    for field in fields:
+        if field in field_widths:
+            width = field_widths[field]
+        elif field in PREFIX_FIELDS:
+            attribute = PREFIX_FIELDS[field]
+            width = max(len(str(getattr(info, attribute))) for info in infos)
+        else:
+            width = text_widths.get(field, 0)
+        widths.append(max(width, len(field)))
+    return widths
+
+class FixedWidthWriter:
+    """Escreve linhas alinhadas em colunas separadas por " | " numa só passada"""
+    
+    def __init__(self, stream, fields, widths, separator=" | "):
+        self.stream = stream
+        self.fields = list(fields)
+        self.line_format = separator.join(f"{{:<{width}}}" for width in widths) + "\n"
+    
+    def write_header(self):
+        """Escreve o cabeçalho e a linha de traços"""
+        header_line = self.line_format.format(*self.fields)
+        self.stream.write(header_line)
+        self.stream.write("-" * (len(header_line) - 1) + "\n")
+    
+    def write_rows(self, rows):
+        """Escreve as linhas (sequências de valores na ordem dos campos)"""
+        self.stream.writelines(starmap(self.line_format.format, rows))
+
+def write_fixed_width(stream, fields, rows, prefixes=None, text_widths=None, prefixes6=()):
+    """Escreve a tabela completa (cabeçalho e linhas) em largura fixa"""
+    writer = FixedWidthWriter(stream, fields, column_widths(fields, prefixes, text_widths, prefixes6))
+    writer.write_header()
+    writer.write_rows(rows)
+
+def write_csv(stream, fields, rows):
+    """Escreve a tabela em CSV; o arquivo deve ter sido aberto com newline=''"""
+    writer = csv.writer(stream)
+    writer.writerow(fields)
+    writer.writerows(rows)
+
+def mapping_rows(networks, fields):
+    """Converte dicionários de rede em sequências de valores, na ordem dos campos"""
+    for network in networks:
+        yield [network.get(field, '') for field in fields]
@@ -0,0 +1,121 @@
+"""Alocação VLSM de sub-redes dentro de um bloco pai
+
+O espaço livre é mantido como no alocador buddy: uma lista livre por
+comprimento de prefixo. Alocar divide o menor bloco livre que atende ao
+pedido e liberar junta o bloco com seu "irmão" sempre que ambos estão
+livres, então as duas operações custam no máximo 32 passos, sem varrer o
+espaço de endereços.
+"""
+import heapq
+
+from exe import int_to_ipv4, ipv4_to_int
+from masks import PREFIX_TABLE, lookup_mask
+
+def parse_block(block):
+    """Converte "10.0.0.0/8" (ou com máscara em pontos) em (início, prefixo)"""
+    if '/' not in block:
+        raise ValueError(f"Bloco inválido (use IP/prefixo): {block}")
+    ip, mask = block.split('/', 1)
+    prefix = lookup_mask(mask).prefix
+    return ipv4_to_int(ip.strip()) & PREFIX_TABLE[prefix].mask_int, prefix
+
+def prefix_for_hosts(hosts):
+    """Maior prefixo (menor rede) com pelo menos hosts endereços utilizáveis"""
+    hosts = int(hosts)
+    if hosts < 1:
+        raise ValueError(f"Número de hosts inválido: {hosts}")
+    # Rede e broadcast ocupam dois endereços do bloco
+    bits = (hosts + 1).bit_length()
+    if bits > 32:
+        raise ValueError(f"Nenhuma rede IPv4 comporta {hosts} hosts")
+    return 32 - bits
+
+class VLSMAllocator:
+    """Alocador de sub-redes com listas livres por prefixo (estilo buddy)"""
+    
+    def __init__(self, parent):
+        self.start, self.prefix = parse_block(parent) if isinstance(parent, str) else parent
+        # free[p] guarda os inícios dos blocos /p livres; heaps[p] entrega o de
+        # menor endereço (entradas já usadas são descartadas ao sair do heap)
+        self.free = [set() for _ in range(33)]
+        self.heaps = [[] for _ in range(33)]
+        self._add_free(self.start, self.prefix)
+    
+    def _add_free(self, start, prefix):
+        self.free[prefix].add(start)
+        heapq.heappush(self.heaps[prefix], start)
+    
+    def _pop_free(self, prefix):
+        heap, free = self.heaps[prefix], self.free[prefix]
+        while heap:
+            start = heapq.heappop(heap)
+            if start in free:
+                free.remove(start)
+                return start
+        return None
+    
+    def free_addresses(self):
+        """Total de endereços ainda livres no bloco pai"""
+        return sum(len(starts) * PREFIX_TABLE[prefix].total_ips for prefix, starts in enumerate(self.free))
+    
+    def allocate_prefix(self, prefix):
+        """Aloca um bloco /prefix e retorna seu início"""
+        if prefix < self.prefix:
+            raise ValueError(f"Um bloco /{prefix} não cabe em /{self.prefix}")
+        
+        # Menor bloco livre que comporta o pedido
+        level = prefix
+        while level >= self.prefix and not self.free[level]:
+            level -= 1
+        if level < self.prefix:
+            raise ValueError(f"Espaço insuficiente em {int_to_ipv4(self.start)}/{self.prefix} para um bloco /{prefix}")
+        
+        start = self._pop_free(level)
+        # Divide ao meio até chegar ao tamanho pedido, liberando as metades de cima
+        while level < prefix:
+            level += 1
+            self._add_free(start + PREFIX_TABLE[level].total_ips, level)
+        return start
+    
+    def allocate(self, hosts):
+        """Aloca a menor sub-rede com pelo menos hosts endereços utilizáveis"""
+        prefix = prefix_for_hosts(hosts)
+        return self.allocate_prefix(prefix), prefix
+    
+    def release(self, start, prefix):
+        """Devolve um bloco, juntando-o ao irmão enquanto ambos estiverem livres"""
+        while prefix > self.prefix:
+            buddy = start ^ PREFIX_TABLE[prefix].total_ips
+            if buddy not in self.free[prefix]:
+                break
+            self.free[prefix].remove(buddy)
+            start = min(start, buddy)
+            prefix -= 1
+        self._add_free(start, prefix)
+    
+    def allocate_many(self, requirements):
+        """Aloca uma lista de (nome, hosts) da maior para a menor rede
+
+        Retorna [(nome, hosts, início, prefixo)] na ordem de alocação.
+        """
+        ordered = sorted(requirements, key=lambda requirement: int(requirement[1]), reverse=True)
+        return [(name, hosts) + self.allocate(hosts) for name, hosts in ordered]
+
+def allocate_networks(calculator, parent, requirements):
+    """Aloca as redes pedidas e calcula cada uma com o NetworkCalculator
+
+    requirements é uma lista de (nome, hosts, roteador). Retorna os
+    resultados de process_network_entry, com 'Roteador' preenchido.
+    """
+    allocator = VLSMAllocator(parent)
+    # Aloca pelo índice do pedido, já que nomes podem se repetir
+    allocations = allocator.allocate_many([(index, hosts) for index, (_, hosts, _) in enumerate(requirements)])
+    
+    results = []
+    for index, _, start, prefix in allocations:
+        name, _, router = requirements[index]
+        network_ip = int_to_ipv4(start)
+        result = calculator.process_network_entry(name, network_ip, PREFIX_TABLE[prefix].mask, network_ip)
+        result['Roteador'] = router
+        results.append(result)
+    return results
@@ -0,0 +1,143 @@
+"""Alocação dos links WAN entre cada roteador e o provedor
+
+Cada roteador recebe um bloco /30 ou /31 de um pool configurável e fica com
+ele enquanto existir: roteadores novos ocupam o primeiro bloco livre e os
+removidos devolvem o seu, sem renumerar os demais. Consultar o link de um
+roteador custa O(1) (um dicionário); alocar ou devolver custa O(log n) (um
+heap com os blocos devolvidos, de onde sai sempre o menor, e o próximo bloco
+nunca usado).
+
+No /30 o provedor usa o primeiro endereço útil e o roteador o segundo; no
+/31 (RFC 3021, enlace ponto a ponto sem rede nem broadcast) o provedor usa
+o primeiro endereço do bloco e o roteador o segundo.
+"""
+import heapq
+from collections import namedtuple
+
+from exe import int_to_ipv4, ipv4_to_int
+from masks import PREFIX_TABLE
+
+DEFAULT_WAN_POOL = '100.0.0.0/16'
+DEFAULT_LINK_PREFIX = 30
+LINK_PREFIXES = (30, 31)
+
+# Link WAN de um roteador com o provedor
+WanLink = namedtuple('WanLink', 'router network router_ip gateway')
+
+def parse_pool(pool):
+    """Converte um pool no formato IP/prefixo em (início, prefixo)"""
+    address, separator, length = str(pool).strip().partition('/')
+    if not separator or not length.isdigit() or not 0 <= int(length) <= 32:
+        raise ValueError(f"Pool WAN inválido: {pool} (use IP/prefixo, como {DEFAULT_WAN_POOL})")
+    prefix = int(length)
+    return ipv4_to_int(address) & PREFIX_TABLE[prefix].mask_int, prefix
+
+class WanAllocator:
+    """Links WAN de cada roteador, alocados de um pool e mantidos entre edições"""
+    
+    def __init__(self, pool=DEFAULT_WAN_POOL, link_prefix=DEFAULT_LINK_PREFIX):
+        link_prefix = int(link_prefix)
+        if link_prefix not in LINK_PREFIXES:
+            raise ValueError(f"Prefixo de link WAN inválido: /{link_prefix} (use /30 ou /31)")
+        self.pool_start, pool_prefix = parse_pool(pool)
+        if pool_prefix > link_prefix:
+            raise ValueError(f"Pool WAN /{pool_prefix} menor que um link /{link_prefix}")
+        self.pool = f"{int_to_ipv4(self.pool_start)}/{pool_prefix}"
+        self.link_prefix = link_prefix
+        self.link_size = PREFIX_TABLE[link_prefix].total_ips
+        self.capacity = PREFIX_TABLE[pool_prefix].total_ips // self.link_size
+        # slots[roteador] = posição do link no pool
+        self.slots = {}
+        # Heap das posições devolvidas (a menor é reutilizada primeiro) e a
+        # próxima nunca usada
+        self.free = []
+        self.next_slot = 0
+    
+    def __len__(self):
+        return len(self.slots)
+    
+    def __contains__(self, router):
+        return router in self.slots
+    
+    def allocate(self, router):
+        """Retorna a posição do link do roteador, alocando um se preciso"""
+        slot = self.slots.get(router)
+        if slot is not None:
+            return slot
+        if self.free:
+            slot = heapq.heappop(self.free)
+        elif self.next_slot < self.capacity:
+            slot = self.next_slot
+            self.next_slot += 1
+        else:
+            raise ValueError(f"Pool WAN {self.pool} esgotado: cabem {self.capacity} links /{self.link_prefix}")
+        self.slots[router] = slot
+        return slot
+    
+    def release(self, router):
+        """Devolve o link do roteador ao pool"""
+        slot = self.slots.pop(router, None)
+        if slot is None:
+            return
+        if self.slots:
+            heapq.heappush(self.free, slot)
+        else:
+            # Sem roteadores, o pool volta ao início
+            self.free = []
+            self.next_slot = 0
+    
+    def sync(self, routers):
+        """Ajusta os links ao conjunto de roteadores: libera os que saíram e
+        aloca os novos na ordem recebida"""
+        routers = list(routers)
+        present = set(routers)
+        for router in [router for router in self.slots if router not in present]:
+            self.release(router)
+        for router in routers:
+            self.allocate(router)
+    
+    def start(self, router):
+        """Primeiro endereço do link do roteador (inteiro)"""
+        return self.pool_start + self.slots[router] * self.link_size
+    
+    def gateway(self, router):
+        """Endereço do provedor no link do roteador"""
+        start = self.start(router)
+        return int_to_ipv4(start if self.link_prefix == 31 else start + 1)
+    
+    def link(self, router):
+        """WanLink do roteador (que já deve ter um link alocado)"""
+        start = self.start(router)
+        isp = start if self.link_prefix == 31 else start + 1
+        return WanLink(router, f"{int_to_ipv4(start)}/{self.link_prefix}", int_to_ipv4(isp + 1), int_to_ipv4(isp))
+    
+    def to_dict(self):
+        """Configuração e links em um dicionário serializável em JSON"""
+        return {
+            'pool': self.pool,
+            'prefix': self.link_prefix,
+            'links': {router: int_to_ipv4(self.start(router)) for router in self.slots},
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Recria o alocador gravado por to_dict
+
+        Gera ValueError se algum link estiver fora do pool, desalinhado ou
+        repetido.
+        """
+        allocator = cls(data.get('pool', DEFAULT_WAN_POOL), data.get('prefix', DEFAULT_LINK_PREFIX))
+        used = set()
+        for router, address in (data.get('links') or {}).items():
+            offset = ipv4_to_int(address) - allocator.pool_start
+            slot, misaligned = divmod(offset, allocator.link_size)
+            if misaligned or not 0 <= slot < allocator.capacity:
+                raise ValueError(f"Link WAN {address} do roteador {router} não é um link /{allocator.link_prefix} do pool {allocator.pool}")
+            if slot in used:
+                raise ValueError(f"Link WAN {address} atribuído a mais de um roteador")
+            used.add(slot)
+            allocator.slots[str(router)] = slot
+        allocator.next_slot = max(used) + 1 if used else 0
+        # Lacunas abaixo do último link; em ordem crescente, a lista já é um heap
+        allocator.free = [slot for slot in range(allocator.next_slot) if slot not in used]
+        return allocator